@@ -0,0 +1,7 @@
+"""Facebook Ingestor application package."""
+
+import time
+
+# Reference point for startup profiling. The package is imported before
+# any CLI dependency, so this is as close to process start as it gets.
+IMPORTED_AT = time.perf_counter()
@@ -0,0 +1,161 @@
+"""Programmatic API streaming scrape results to the caller.
+
+Example:
+    >>> async for result in ingest(urls, RunConfig(browsers=4)):
+    ...     handle(result.page_key, result.payload)
+"""
+
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Iterable, Optional, Union
+
+from app.orchestrator import RunConfig, run_parallel
+from app.records import PageRecord
+from app.sinks import ResultSink
+
+
+@dataclass(frozen=True)
+class ScrapeResult:
+    """One successfully scraped page."""
+
+    url: str
+    page_key: str
+    display_name: Optional[str]
+    payload: dict = field(repr=False)
+    scraped_at: float
+
+
+class _Done:
+    """Marker put on the result queue once the run is over."""
+
+
+_DONE = _Done()
+
+
+class QueueSink:
+    """Sink handing results to a bounded asyncio queue.
+
+    Writing blocks while the queue is full, so a slow consumer throttles
+    the browser workers instead of letting results pile up in memory.
+    Once the consumer is gone, see `abandon`, results are dropped.
+    """
+
+    def __init__(self, maxsize: int = 100, tee: Optional[ResultSink] = None):
+        """Create the sink.
+
+        Args:
+            maxsize (int): Maximum number of results buffered before
+                workers block.
+            tee (Optional[ResultSink]): Additional sink receiving every
+                payload, e.g. to also persist the results.
+        """
+        self.queue: asyncio.Queue[Union[ScrapeResult, _Done]] = asyncio.Queue(maxsize)
+        self.tee = tee
+        self.abandoned = False
+
+    async def write(self, record: PageRecord) -> None:
+        """Enqueue the result, waiting for room in the buffer."""
+
+        if self.tee is not None:
+            await self.tee.write(record)
+        if self.abandoned:
+            return
+
+        await self.queue.put(
+            ScrapeResult(
+                url=record.url,
+                page_key=record.page_key,
+                display_name=record.display_name,
+                payload=record.to_payload(),
+                scraped_at=record.scraped_at,
+            )
+        )
+
+    async def checkpoint(self) -> bool:
+        """Flush the tee sink; delivered results are not persisted."""
+
+        return await self.tee.checkpoint() if self.tee is not None else True
+
+    async def close(self) -> None:
+        """Close the tee sink and signal the end of the stream."""
+
+        if self.tee is not None:
+            await self.tee.close()
+        if not self.abandoned:
+            await self.queue.put(_DONE)
+
+    def abandon(self) -> None:
+        """Stop delivering results once nobody reads the queue anymore.
+
+        The buffered results are discarded, so that neither a worker nor
+        `close` can block on a full queue.
+        """
+        self.abandoned = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+async def _next_item(sink: QueueSink, task: asyncio.Task) -> Union[ScrapeResult, _Done]:
+    """Wait for the next result of the run, or for the run to end.
+
+    A run failing before it closes its sink never signals the end of
+    the stream: once its task is over, the results still buffered are
+    returned, then the end marker.
+    """
+    if not task.done():
+        get = asyncio.ensure_future(sink.queue.get())
+        try:
+            await asyncio.wait((get, task), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # No-op once the result arrived; a cancelled get leaves it queued.
+            get.cancel()
+        if get.done() and not get.cancelled():
+            return get.result()
+    return _DONE if sink.queue.empty() else sink.queue.get_nowait()
+
+
+async def ingest(
+    urls: Iterable[str],
+    config: Optional[RunConfig] = None,
+    *,
+    buffer_size: int = 100,
+    tee: Optional[ResultSink] = None,
+) -> AsyncIterator[ScrapeResult]:
+    """Scrape `urls` and yield each result as soon as it is available.
+
+    The scrape runs in a background task on top of `run_parallel`. At
+    most `buffer_size` results are held in memory: when the consumer
+    falls behind, the workers wait before writing further results.
+    Pages that fail are logged and counted, but not yielded. Leaving
+    the loop early cancels the run and stops the browsers.
+
+    Args:
+        urls (Iterable[str]): Target URLs.
+        config (Optional[RunConfig]): Settings of the run.
+        buffer_size (int): Maximum number of buffered results.
+        tee (Optional[ResultSink]): Sink that additionally receives
+            every payload; nothing is written to disk without one.
+
+    Yields:
+        ScrapeResult: The scraped pages, in completion order.
+
+    Raises:
+        Exception: Errors aborting the run, such as a browser failing to
+        start, are re-raised once the buffered results were yielded.
+    """
+    sink = QueueSink(buffer_size, tee)
+    task = asyncio.create_task(
+        run_parallel(list(urls), config or RunConfig(), sink=sink)
+    )
+
+    try:
+        while not isinstance(item := await _next_item(sink, task), _Done):
+            yield item
+        await task
+    finally:
+        if not task.done():
+            sink.abandon()
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
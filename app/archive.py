@@ -0,0 +1,342 @@
+"""Compressed, append-only archive of the raw data pages are extracted from.
+
+Every captured page is stored as one zlib-compressed frame appended to a
+segment file, and indexed by page key in a SQLite database next to the
+segments. Each process writing to the archive appends to a segment of
+its own, so concurrent runs and shard processes never interleave their
+frames; the shared index serializes the metadata through SQLite.
+
+The archived bodies are in the format `extract_about_from_body` reads,
+so `reextract` can replay them through the extraction logic in a process
+pool without any browser.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import BinaryIO, Iterator, Optional
+
+from app.extraction import extract_about_from_body
+from app.observability import get_logger
+from app.records import PageRecord
+from app.reporting import ScrapeReport
+from app.result_store import connect
+from app.sinks import ResultSink
+from app.utils import page_key
+
+logger = get_logger(__name__)
+
+INDEX_NAME = "index.sqlite"
+
+# Frame header: magic bytes and length of the compressed body.
+_FRAME = struct.Struct(">4sI")
+_MAGIC = b"FBC1"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    id INTEGER PRIMARY KEY,
+    page_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT,
+    captured_at REAL NOT NULL,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS captures_page_key ON captures (page_key, id);
+"""
+
+_COLUMNS = "url, page_key, title, captured_at, segment, offset, length"
+
+
+@dataclass(frozen=True)
+class ArchivedPage:
+    """Index entry locating one capture in the archive."""
+
+    url: str
+    page_key: str
+    title: Optional[str]
+    captured_at: float
+    segment: str
+    offset: int
+    length: int
+
+
+def encode_frame(body: str, level: int = 6) -> bytes:
+    """Compress a body into a self-delimiting archive frame."""
+
+    data = zlib.compress(body.encode("utf-8"), level)
+    return _FRAME.pack(_MAGIC, len(data)) + data
+
+
+def decode_frame(frame: bytes) -> str:
+    """Return the body of a frame written by `encode_frame`.
+
+    Raises:
+        ValueError: If the frame is truncated or corrupt.
+    """
+    if len(frame) < _FRAME.size:
+        raise ValueError("Truncated capture frame")
+    magic, size = _FRAME.unpack_from(frame)
+    if magic != _MAGIC or len(frame) != _FRAME.size + size:
+        raise ValueError("Corrupt capture frame")
+    try:
+        return zlib.decompress(frame[_FRAME.size :]).decode("utf-8")
+    except zlib.error as e:
+        raise ValueError(f"Corrupt capture frame: {e}") from e
+
+
+class CaptureArchive:
+    """Append captured page bodies to the archive in `directory`.
+
+    Frames are written to this process's segment as they come in, while
+    index rows are buffered and committed in batches, after the segment
+    has been flushed, so the index never points past the written data.
+    The segment is only created with the first capture, so an archive
+    opened for reading leaves no trace.
+    """
+
+    def __init__(self, directory: str, batch_size: int = 100, level: int = 6):
+        """Open (and create if needed) the archive.
+
+        Args:
+            directory (str): Directory holding the segments and index.
+            batch_size (int): Number of buffered index rows that
+                triggers a commit.
+            level (int): zlib compression level.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.batch_size = batch_size
+        self.level = level
+        self.segment = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.bin"
+        self._file: Optional[BinaryIO] = None
+        self._pending: list[tuple] = []
+        self._conn = connect(os.path.join(directory, INDEX_NAME), _SCHEMA)
+
+    def __len__(self) -> int:
+        row = self._conn.execute("SELECT COUNT(*) FROM captures").fetchone()
+        return int(row[0]) + len(self._pending)
+
+    async def add(self, url: str, title: Optional[str], body: str):
+        """Archive the raw body a page was extracted from.
+
+        The body is compressed in a thread, since zlib releases the GIL,
+        and appended to the segment back on the event loop.
+
+        Args:
+            url (str): The page URL.
+            title (Optional[str]): The page title.
+            body (str): Raw HTML or JSON holding the About sections.
+        """
+        frame = await asyncio.to_thread(encode_frame, body, self.level)
+        self.append(url, title, frame)
+
+    def append(self, url: str, title: Optional[str], frame: bytes):
+        """Append an encoded frame, flushing the index when the batch is full."""
+
+        if self._file is None:
+            self._file = open(  # pylint: disable=consider-using-with
+                os.path.join(self.directory, self.segment), "ab"
+            )
+        offset = self._file.tell()
+        self._file.write(frame)
+        self._pending.append(
+            (page_key(url), url, title, time.time(), self.segment, offset, len(frame))
+        )
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Flush the segment, then commit the buffered index rows."""
+
+        if not self._pending:
+            return
+
+        assert self._file is not None  # nosec B101
+        self._file.flush()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO captures "
+                "(page_key, url, title, captured_at, segment, offset, length) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._pending,
+            )
+        logger.info("Archived %d captures into %s", len(self._pending), self.segment)
+        self._pending.clear()
+
+    def close(self):
+        """Commit buffered captures and close the segment and index."""
+
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+        self._conn.close()
+
+    def entries(self, latest: bool = True) -> Iterator[ArchivedPage]:
+        """Iterate over the committed captures in archive order.
+
+        Args:
+            latest (bool): Only yield the most recent capture of each
+                page key.
+
+        Yields:
+            ArchivedPage: The index entries.
+        """
+        if latest:
+            # SQLite takes the bare columns from the row holding MAX(id).
+            query = (
+                f"SELECT {_COLUMNS}, MAX(id) FROM captures "
+                "GROUP BY page_key ORDER BY MAX(id)"
+            )
+        else:
+            query = f"SELECT {_COLUMNS}, id FROM captures ORDER BY id"
+        for row in self._conn.execute(query):
+            yield ArchivedPage(*row[:-1])
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the most recent archived body of a page key, if any."""
+
+        row = self._conn.execute(
+            f"SELECT {_COLUMNS} FROM captures WHERE page_key = ? "
+            "ORDER BY id DESC LIMIT 1",
+            (key,),
+        ).fetchone()
+        return read_bodies(self.directory, [ArchivedPage(*row)])[0] if row else None
+
+
+def read_bodies(directory: str, entries: list[ArchivedPage]) -> list[str]:
+    """Read and decompress the bodies of archive entries.
+
+    Args:
+        directory (str): Archive directory.
+        entries (list[ArchivedPage]): Entries to read.
+
+    Returns:
+        list[str]: The bodies, in the order of `entries`.
+
+    Raises:
+        ValueError: If a frame is corrupt.
+    """
+    bodies = []
+    files: dict[str, BinaryIO] = {}
+    try:
+        for entry in entries:
+            if entry.segment not in files:
+                files[entry.segment] = open(  # pylint: disable=consider-using-with
+                    os.path.join(directory, entry.segment), "rb"
+                )
+            segment = files[entry.segment]
+            segment.seek(entry.offset)
+            bodies.append(decode_frame(segment.read(entry.length)))
+    finally:
+        for f in files.values():
+            f.close()
+    return bodies
+
+
+def _extract_batch(
+    directory: str, entries: list[ArchivedPage]
+) -> list[tuple[Optional[dict], str]]:
+    """Extract the payloads of a batch of captures, in a pool process.
+
+    Returns:
+        list[tuple[Optional[dict], str]]: For each entry, its payload,
+        or None and the failure class.
+    """
+    results: list[tuple[Optional[dict], str]] = []
+    for entry in entries:
+        try:
+            body = read_bodies(directory, [entry])[0]
+        except (OSError, ValueError):
+            results.append((None, "corrupt_capture"))
+            continue
+        payload = extract_about_from_body(body)
+        results.append((payload, "" if payload is not None else "not_found"))
+    return results
+
+
+async def _write_batch(
+    entries: list[ArchivedPage],
+    results: list[tuple[Optional[dict], str]],
+    sink: ResultSink,
+    report: ScrapeReport,
+):
+    """Hand the re-extracted payloads of a batch to the sink."""
+    for entry, (payload, reason) in zip(entries, results):
+        if payload is None:
+            logger.warning("No About payload in capture of %s", entry.url)
+            await report.record_failed(reason)
+            continue
+        await sink.write(
+            PageRecord.from_payload(entry.url, payload, entry.title, entry.captured_at)
+        )
+        await report.record_saved()
+
+
+async def reextract(
+    archive: CaptureArchive,
+    sink: ResultSink,
+    workers: int = 0,
+    latest: bool = True,
+    batch_size: int = 200,
+) -> ScrapeReport:
+    """Replay the archive through the extraction logic without browsers.
+
+    Batches of index entries are sent to a pool of processes which read,
+    decompress and parse the captures themselves, so only the small
+    payloads travel back. At most two batches per process are in flight,
+    keeping memory bounded whatever the size of the archive. Records
+    keep the original capture time as their scrape time.
+
+    Args:
+        archive (CaptureArchive): The archive to replay.
+        sink (ResultSink): Output backend, closed once done.
+        workers (int): Extraction processes; 0 uses all cores.
+        latest (bool): Only replay the most recent capture per page.
+        batch_size (int): Captures per pool task.
+
+    Returns:
+        ScrapeReport: Saved pages and failures by class.
+    """
+    report = ScrapeReport()
+    workers = workers or os.cpu_count() or 1
+    loop = asyncio.get_running_loop()
+    entries = archive.entries(latest)
+    pending: dict[asyncio.Future, list[ArchivedPage]] = {}
+
+    logger.info("Re-extracting %s with %d processes", archive.directory, workers)
+    with ProcessPoolExecutor(
+        workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        try:
+            while True:
+                while len(pending) < 2 * workers:
+                    batch = list(islice(entries, batch_size))
+                    if not batch:
+                        break
+                    future = loop.run_in_executor(
+                        executor, _extract_batch, archive.directory, batch
+                    )
+                    pending[future] = batch
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    await _write_batch(
+                        pending.pop(future), future.result(), sink, report
+                    )
+        finally:
+            await sink.close()
+
+    report.log_summary()
+    return report
@@ -2,38 +2,39 @@
 
 from nodriver import Config, Tab, cdp
 
+from app.launch import launch_flags
 from app.observability import get_logger
 
 logger = get_logger(__name__)
 
 
-def build_browser_config(profile_suffix: str | None = None) -> Config:
+def build_browser_config(
+    profile_suffix: str | None = None, launch_profile: str = "default"
+) -> Config:
     """Build a standard browser configuration for Nodriver.
 
-    This function creates a `Config` object with a predefined set of
-    Chromium arguments optimized for headless scraping. An optional
+    This function creates a `Config` object with the Chromium arguments
+    of a launch profile, see `app.launch.LAUNCH_PROFILES`. An optional
     profile suffix can be provided to isolate browser profiles when
     running multiple concurrent workers.
 
     Args:
         profile_suffix (str | None): Optional suffix used to create a
             unique user data directory for the browser profile.
+        launch_profile (str): Name of the launch profile.
 
     Returns:
         Config: A Nodriver browser configuration instance.
+
+    Raises:
+        ValueError: If the launch profile is unknown.
     """
+    flags = launch_flags(launch_profile)
     suffix = f"-{profile_suffix}" if profile_suffix else ""
     return Config(
         headless=True,
         user_data_dir=f"./chrome-profile-fb{suffix}",
-        args=[
-            "--disable-background-networking",
-            "--disable-background-timer-throttling",
-            "--disable-backgrounding-occluded-windows",
-            "--disable-renderer-backgrounding",
-            "--disable-sync",
-            "--disable-extensions",
-        ],
+        browser_args=flags,
     )
 
 
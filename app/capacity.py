@@ -0,0 +1,457 @@
+"""Capacity planning of the number of browser workers from host limits.
+
+The CPUs and memory a run may use are read from the host, narrowed by
+the cgroup (v1 or v2) limits of the process when it runs in a container.
+The cost of a browser is measured on the first pages of the run: the
+resident memory of the browser processes, split into a per-browser base
+and a per-tab share taken by the renderers, and the CPU time of the
+whole process tree per open tab. `plan_capacity` then picks the number
+of workers and tabs per worker that keeps both within the budget left
+after a safety headroom.
+"""
+
+import asyncio
+import os
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import psutil
+
+from app.observability import get_logger
+from app.performance import Timer
+from app.reporting import ScrapeReport
+
+logger = get_logger(__name__)
+
+# Workers launched to measure the cost of a browser in `auto` mode.
+CALIBRATION_BROWSERS = 2
+
+# Most tabs per worker a plan uses; beyond it the pipeline of a worker
+# gains little, see `app.pipeline`.
+MAX_TABS = 3
+
+# cgroup v1 reports an unlimited memory limit as a huge page-aligned value.
+_UNLIMITED = 2**60
+
+_MIB = 2**20
+
+
+@dataclass(frozen=True)
+class HostResources:
+    """CPUs and memory available to the run, and where the limits come from."""
+
+    cpus: float
+    memory_bytes: int
+    cpu_source: str = "host"
+    memory_source: str = "host"
+
+
+@dataclass(frozen=True)
+class BrowserCost:
+    """Measured or estimated resource use of the browsers of a run.
+
+    Attributes:
+        base_rss (int): Bytes of a browser without its renderers.
+        tab_rss (int): Bytes of renderer memory per open tab.
+        cpu_per_tab (float): CPU cores used per open tab while scraping,
+            including the Python side of the run.
+        python_rss (int): Bytes of the orchestrator process itself.
+    """
+
+    base_rss: int
+    tab_rss: int
+    cpu_per_tab: float
+    python_rss: int = 0
+
+
+# Typical cost of a headless Chromium on Facebook pages, used without
+# calibration.
+DEFAULT_COST = BrowserCost(
+    base_rss=200 * _MIB, tab_rss=150 * _MIB, cpu_per_tab=0.5, python_rss=150 * _MIB
+)
+
+
+@dataclass(frozen=True)
+class CapacityPlan:
+    """Number of workers and tabs per worker chosen for a run.
+
+    Attributes:
+        browsers (int): Number of browser workers.
+        tabs (int): Tabs per worker, i.e. the prefetch depth plus one.
+        limited_by (str): `cpu`, `memory` or `work`, whichever bound the
+            number of workers.
+        reason (str): Human-readable account of the decision.
+    """
+
+    browsers: int
+    tabs: int
+    limited_by: str
+    reason: str
+
+    def log(self):
+        """Log the plan and the reasoning behind it."""
+
+        logger.info(
+            "Capacity plan: %d browsers x %d tabs (limited by %s): %s",
+            self.browsers,
+            self.tabs,
+            self.limited_by,
+            self.reason,
+        )
+
+
+def _read(path: str) -> Optional[str]:
+    """Return the stripped content of a small file, or None if unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _read_int(path: str) -> Optional[int]:
+    value = _read(path)
+    if value is None or not value.lstrip("-").isdigit():
+        return None
+    return int(value)
+
+
+def _cgroup_paths(proc_cgroup: str) -> dict[str, str]:
+    """Map each controller of `/proc/self/cgroup` to the process's cgroup.
+
+    The unified (v2) hierarchy is keyed by the empty string.
+    """
+    paths = {}
+    for line in (_read(proc_cgroup) or "").splitlines():
+        parts = line.split(":", 2)
+        if len(parts) == 3:
+            for controller in parts[1].split(","):
+                paths[controller] = parts[2]
+    return paths
+
+
+def _ancestors(root: str, path: str) -> list[str]:
+    """Return the directories from a cgroup up to the hierarchy root.
+
+    A nested cgroup is bound by the limits of all its ancestors. Inside
+    a container the hierarchy is usually mounted at the process's own
+    cgroup, in which case only `root` exists.
+    """
+    directories = []
+    parts = [p for p in path.split("/") if p]
+    while parts:
+        directories.append(os.path.join(root, *parts))
+        parts.pop()
+    directories.append(root)
+    return [d for d in directories if os.path.isdir(d)]
+
+
+def _cgroup_v2(root: str, path: str) -> tuple[Optional[float], Optional[int]]:
+    """Return the CPU quota in cores and the available memory under cgroup v2."""
+    cpus = memory = None
+    directories = _ancestors(root, path)
+    for directory in directories:
+        quota = (_read(os.path.join(directory, "cpu.max")) or "max").split()
+        if quota[0] != "max" and len(quota) == 2:
+            cores = int(quota[0]) / int(quota[1])
+            cpus = cores if cpus is None else min(cpus, cores)
+        limit = _read_int(os.path.join(directory, "memory.max"))
+        usage = _read_int(os.path.join(directory, "memory.current"))
+        if limit is not None:
+            free = max(0, limit - (usage or 0))
+            memory = free if memory is None else min(memory, free)
+    return cpus, memory
+
+
+def _cgroup_v1(
+    root: str, paths: dict[str, str]
+) -> tuple[Optional[float], Optional[int]]:
+    """Return the CPU quota in cores and the available memory under cgroup v1."""
+    cpus = memory = None
+    for directory in _ancestors(os.path.join(root, "cpu"), paths.get("cpu", "/")):
+        quota = _read_int(os.path.join(directory, "cpu.cfs_quota_us"))
+        period = _read_int(os.path.join(directory, "cpu.cfs_period_us"))
+        if quota is not None and quota > 0 and period:
+            cpus = quota / period if cpus is None else min(cpus, quota / period)
+    for directory in _ancestors(os.path.join(root, "memory"), paths.get("memory", "/")):
+        limit = _read_int(os.path.join(directory, "memory.limit_in_bytes"))
+        usage = _read_int(os.path.join(directory, "memory.usage_in_bytes"))
+        if limit is not None and limit < _UNLIMITED:
+            free = max(0, limit - (usage or 0))
+            memory = free if memory is None else min(memory, free)
+    return cpus, memory
+
+
+def cgroup_limits(
+    root: str = "/sys/fs/cgroup", proc_cgroup: str = "/proc/self/cgroup"
+) -> tuple[Optional[float], Optional[int], str]:
+    """Read the CPU and memory limits of the process's cgroup.
+
+    Args:
+        root (str): Mount point of the cgroup hierarchies.
+        proc_cgroup (str): File listing the cgroups of the process.
+
+    Returns:
+        tuple[Optional[float], Optional[int], str]: The CPU quota in
+        cores and the memory left below the limit in bytes, each None
+        when unlimited, and `cgroup v2`, `cgroup v1` or `none`.
+    """
+    paths = _cgroup_paths(proc_cgroup)
+    if os.path.exists(os.path.join(root, "cgroup.controllers")):
+        cpus, memory = _cgroup_v2(root, paths.get("", "/"))
+        return cpus, memory, "cgroup v2"
+    if os.path.isdir(os.path.join(root, "memory")) or os.path.isdir(
+        os.path.join(root, "cpu")
+    ):
+        cpus, memory = _cgroup_v1(root, paths)
+        return cpus, memory, "cgroup v1"
+    return None, None, "none"
+
+
+def detect_resources(
+    root: str = "/sys/fs/cgroup", proc_cgroup: str = "/proc/self/cgroup"
+) -> HostResources:
+    """Return the CPUs and memory available to the run.
+
+    CPUs are those the process may be scheduled on, memory is what the
+    host reports as available; each is narrowed by the cgroup limits.
+
+    Args:
+        root (str): Mount point of the cgroup hierarchies.
+        proc_cgroup (str): File listing the cgroups of the process.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus: float = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    memory = int(psutil.virtual_memory().available)
+    resources = HostResources(cpus, memory)
+
+    quota, free, version = cgroup_limits(root, proc_cgroup)
+    if quota is not None and quota < cpus:
+        resources = HostResources(quota, memory, version, resources.memory_source)
+    if free is not None and free < memory:
+        resources = HostResources(resources.cpus, free, resources.cpu_source, version)
+    return resources
+
+
+@dataclass(frozen=True)
+class TreeSample:
+    """Resource use of the orchestrator process and its browsers at one instant."""
+
+    python_rss: int
+    browser_rss: int
+    renderer_rss: int
+    browsers: int
+    cpu_seconds: float
+
+
+def sample_tree(process: Optional[Any] = None) -> TreeSample:
+    """Measure the orchestrator process and all its child processes.
+
+    Chromium main processes are recognised by the absence of a `--type`
+    switch; renderers by `--type=renderer`. GPU, network and other
+    helper processes count towards the browser base.
+
+    Args:
+        process (Optional[Any]): The `psutil.Process` to measure,
+            defaulting to the current one.
+    """
+    process = process or psutil.Process()
+    with process.oneshot():
+        python_rss = process.memory_info().rss
+        cpu = sum(process.cpu_times()[:2])
+
+    browser_rss = renderer_rss = browsers = 0
+    for child in process.children(recursive=True):
+        with suppress(psutil.Error):
+            with child.oneshot():
+                cmdline = child.cmdline()
+                rss = child.memory_info().rss
+                cpu += sum(child.cpu_times()[:2])
+            if "--type=renderer" in cmdline:
+                renderer_rss += rss
+                continue
+            browser_rss += rss
+            if not any(arg.startswith("--type=") for arg in cmdline):
+                browsers += 1
+    return TreeSample(python_rss, browser_rss, renderer_rss, browsers, cpu)
+
+
+def measure_cost(
+    start: TreeSample, end: TreeSample, seconds: float, tabs: int
+) -> BrowserCost:
+    """Derive the cost of a browser from two samples taken while scraping.
+
+    Args:
+        start (TreeSample): Sample at the start of the window.
+        end (TreeSample): Sample at the end of the window.
+        seconds (float): Wall time between the samples.
+        tabs (int): Tabs open across all browsers during the window.
+    """
+    tabs = max(1, tabs)
+    cpu = max(0.0, end.cpu_seconds - start.cpu_seconds)
+    return BrowserCost(
+        base_rss=end.browser_rss // max(1, end.browsers),
+        tab_rss=end.renderer_rss // tabs,
+        cpu_per_tab=cpu / seconds / tabs if seconds > 0 else 0.0,
+        python_rss=end.python_rss,
+    )
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+async def calibrate(
+    report: ScrapeReport,
+    tabs: int,
+    pages: int = 10,
+    done: Optional[Callable[[], bool]] = None,
+    timeout: float = 120.0,
+    poll: float = 0.5,
+) -> Optional[BrowserCost]:
+    """Measure the cost of the running browsers over their first pages.
+
+    The window opens once the first page is done, so that browser
+    startup is not counted, and closes after `pages` more pages or
+    `timeout` seconds.
+
+    Args:
+        report (ScrapeReport): Report of the run, counting the pages.
+        tabs (int): Tabs open across the calibration browsers.
+        pages (int): Pages to measure.
+        done (Optional[Callable[[], bool]]): Returns True once the run
+            is over, ending the calibration early.
+        timeout (float): Longest calibration in seconds.
+        poll (float): Seconds between checks of the page count.
+
+    Returns:
+        Optional[BrowserCost]: The measured cost, or None if the run
+        ended before its first page was done.
+    """
+
+    def finished() -> bool:
+        return done is not None and done()
+
+    t = Timer()
+    while not report.summary()["total"]:
+        if finished() or t.lap() > timeout:
+            return None
+        await asyncio.sleep(poll)
+
+    first = report.summary()["total"]
+    start, window = sample_tree(), Timer()
+    while report.summary()["total"] < first + pages:
+        if finished() or t.lap() > timeout:
+            break
+        await asyncio.sleep(poll)
+    cost = measure_cost(start, sample_tree(), window.lap(), tabs)
+    logger.info(
+        "Calibrated over %d pages in %.1fs: browser=%d MiB, tab=%d MiB, "
+        "cpu=%.2f cores per tab",
+        report.summary()["total"] - first,
+        window.lap(),
+        cost.base_rss // _MIB,
+        cost.tab_rss // _MIB,
+        cost.cpu_per_tab,
+    )
+    return cost
+
+
+# pylint: disable-next=too-many-arguments,too-many-locals
+def plan_capacity(
+    resources: HostResources,
+    cost: BrowserCost,
+    headroom: float = 0.2,
+    max_browsers: Optional[int] = None,
+    *,
+    max_tabs: int = MAX_TABS,
+    tabs: Optional[int] = None,
+    contexts_per_browser: int = 1,
+) -> CapacityPlan:
+    """Pick the number of workers and tabs per worker that fits the host.
+
+    Every tab costs renderer memory and CPU, every worker a share of a
+    browser base: with `contexts_per_browser` above 1 several workers
+    share one browser. Of the tab counts up to `max_tabs`, the one with
+    the most tabs in flight overall wins, fewer tabs on ties; more tabs
+    per worker therefore only pay off when memory is the bound.
+
+    Args:
+        resources (HostResources): What the run may use.
+        cost (BrowserCost): Cost of a browser and of a tab.
+        headroom (float): Share of the CPUs and memory left unused.
+        max_browsers (Optional[int]): Upper bound, e.g. the number of
+            URLs.
+        max_tabs (int): Most tabs per worker.
+        tabs (Optional[int]): Tabs per worker chosen by the user; only
+            the number of workers is planned then.
+        contexts_per_browser (int): Workers sharing one browser.
+
+    Returns:
+        CapacityPlan: The plan, with at least one worker and one tab.
+    """
+    cpu_budget = resources.cpus * (1 - headroom)
+    memory_budget = resources.memory_bytes * (1 - headroom) - cost.python_rss
+    worker_base = cost.base_rss / max(1, contexts_per_browser)
+
+    candidates = []
+    counts = [tabs] if tabs else range(1, max(1, max_tabs) + 1)
+    for count in counts:
+        bounds = {
+            "memory": int(
+                max(0.0, memory_budget) // (worker_base + count * cost.tab_rss)
+            )
+        }
+        bounds["cpu"] = (
+            int(cpu_budget // (count * cost.cpu_per_tab))
+            if cost.cpu_per_tab > 0
+            else bounds["memory"]
+        )
+        if max_browsers is not None:
+            bounds["work"] = max_browsers
+        limited_by = min(bounds, key=bounds.__getitem__)
+        candidates.append((bounds[limited_by], count, limited_by, bounds))
+
+    # Most tabs in flight overall, then the fewest tabs per worker; when
+    # nothing fits, a single worker with a single tab.
+    fit, count, limited_by, bounds = max(candidates, key=lambda c: (c[0] * c[1], -c[1]))
+    browsers = max(1, fit)
+    reason = (
+        f"{resources.cpus:g} CPUs ({resources.cpu_source}), "
+        f"{resources.memory_bytes // _MIB} MiB available "
+        f"({resources.memory_source}), {headroom:.0%} headroom; "
+        f"browser {cost.base_rss // _MIB} MiB + {cost.tab_rss // _MIB} MiB "
+        f"and {cost.cpu_per_tab:.2f} cores per tab; with {count} tabs, "
+        f"CPU fits {bounds['cpu']} workers and memory {bounds['memory']}"
+    )
+    if max_browsers is not None:
+        reason += f", work {max_browsers}"
+    return CapacityPlan(browsers, count, limited_by, reason)
+
+
+def plan_pool(
+    headroom: float, contexts_per_browser: int, tabs: Optional[int] = None
+) -> CapacityPlan:
+    """Plan the warm pool of `serve --browsers auto`.
+
+    The pool has no run to calibrate on, so the plan relies on the
+    default cost estimates of a browser.
+
+    Args:
+        headroom (float): Share of the CPUs and memory left unused.
+        contexts_per_browser (int): Workers sharing one browser.
+        tabs (Optional[int]): Tabs per worker chosen by the user, or
+            None to plan them too.
+
+    Returns:
+        CapacityPlan: The logged plan; `browsers` is the pool size.
+    """
+    plan = plan_capacity(
+        detect_resources(),
+        DEFAULT_COST,
+        headroom,
+        tabs=tabs,
+        contexts_per_browser=contexts_per_browser,
+    )
+    plan.log()
+    return plan
@@ -0,0 +1,118 @@
+"""Capture of document and GraphQL responses for network-side extraction."""
+
+import asyncio
+import base64
+from typing import Optional
+
+from nodriver import Tab, cdp
+
+from app.extraction import MARKER, ExtractionPool
+from app.observability import get_logger
+
+logger = get_logger(__name__)
+
+# Resource types whose bodies may carry the About sections.
+_DOCUMENT = cdp.network.ResourceType.DOCUMENT
+_API_TYPES = (cdp.network.ResourceType.XHR, cdp.network.ResourceType.FETCH)
+
+
+def is_candidate(event: cdp.network.ResponseReceived) -> bool:
+    """Return whether a response may contain the About payload."""
+
+    if event.type_ == _DOCUMENT:
+        return True
+    return event.type_ in _API_TYPES and "graphql" in event.response.url
+
+
+class ResponseCapture:
+    """Extract the About payload from the network responses of a tab.
+
+    The main document and GraphQL responses are tracked as they are
+    received; once a tracked response has finished loading its body is
+    fetched with `Network.getResponseBody` and handed to the extraction
+    pool. The first body yielding a payload resolves the current page.
+
+    Network events keep flowing between pages, so every page gets a new
+    generation and bodies of responses received for an earlier page
+    are ignored. The body the payload came from is kept in `body` until
+    the next page starts, so that it can be archived.
+    """
+
+    def __init__(self, tab: Tab, pool: ExtractionPool, timeout: float = 5):
+        """Attach the capture to a tab; call `enable` before use.
+
+        Args:
+            tab (Tab): The tab whose responses are captured.
+            pool (ExtractionPool): Pool parsing the response bodies.
+            timeout (float): Default seconds `payload` waits.
+        """
+        self.tab = tab
+        self.pool = pool
+        self.timeout = timeout
+        self._generation = 0
+        self._tracked: dict[str, int] = {}
+        self.body: Optional[str] = None
+        self._found: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def enable(self):
+        """Register the network event handlers.
+
+        The Network domain itself is enabled by the browser setup.
+        """
+        self.tab.add_handler(cdp.network.ResponseReceived, self._on_response)
+        self.tab.add_handler(cdp.network.LoadingFinished, self._on_finished)
+
+    def start(self):
+        """Start capturing a new page, discarding the previous one."""
+
+        self._generation += 1
+        self._tracked.clear()
+        self.body = None
+        if not self._found.done():
+            self._found.cancel()
+        self._found = asyncio.get_running_loop().create_future()
+
+    def _on_response(self, event: cdp.network.ResponseReceived, _connection=None):
+        if is_candidate(event):
+            self._tracked[str(event.request_id)] = self._generation
+
+    async def _on_finished(self, event: cdp.network.LoadingFinished, _connection=None):
+        generation = self._tracked.pop(str(event.request_id), None)
+        if generation is None or self._found.done():
+            return
+
+        try:
+            body, encoded = await self.tab.send(
+                cdp.network.get_response_body(event.request_id)
+            )
+            if encoded:
+                body = base64.b64decode(body).decode("utf-8", errors="replace")
+            if MARKER not in body:
+                return
+            payload = await self.pool.extract(body)
+        except Exception as e:
+            logger.debug("Response body %s unavailable: %s", event.request_id, e)
+            return
+
+        if payload is not None and generation == self._generation:
+            if not self._found.done():
+                self.body = body
+                self._found.set_result(payload)
+
+    async def payload(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Wait for the current page's payload.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait, defaulting
+                to the capture's timeout.
+
+        Returns:
+            Optional[dict]: The extracted payload, or None if no
+            captured response contained it in time.
+        """
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(self._found), timeout or self.timeout
+            )
+        except asyncio.TimeoutError:
+            return None
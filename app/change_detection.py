@@ -0,0 +1,252 @@
+"""Content-hash change detection for scraped payloads."""
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Optional, TextIO
+
+from app.observability import get_logger
+from app.records import PageRecord
+from app.result_store import connect
+from app.sinks import ResultSink
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS payload_hashes (
+    page_key TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def normalize_payload(payload: dict) -> str:
+    """Serialize a payload canonically so equal content hashes equally.
+
+    Args:
+        payload (dict): The scraped payload.
+
+    Returns:
+        str: Compact JSON with sorted keys.
+    """
+    return json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+
+
+def payload_hash(payload: dict) -> str:
+    """Return the content hash of a payload's normalized form."""
+
+    return hashlib.sha256(normalize_payload(payload).encode("utf-8")).hexdigest()
+
+
+def field_diff(old: dict, new: dict) -> dict:
+    """Compute a compact field-level diff between two payloads.
+
+    Args:
+        old (dict): Previously stored payload.
+        new (dict): Newly scraped payload.
+
+    Returns:
+        dict: `added` and `changed` map field names to new values (the
+        latter as `[old, new]` pairs); `removed` lists dropped fields.
+        Empty sections are omitted.
+    """
+    diff: dict = {
+        "added": {k: v for k, v in new.items() if k not in old},
+        "removed": sorted(k for k in old if k not in new),
+        "changed": {k: [old[k], v] for k, v in new.items() if k in old and old[k] != v},
+    }
+    return {section: value for section, value in diff.items() if value}
+
+
+class HashIndex:
+    """Persistent map from page key to the hash of its last written payload.
+
+    The previous payload is kept alongside the hash so that a field-level
+    diff can be produced when the content changes. Updates are held in
+    memory until `commit` writes them in one short transaction, so that
+    the owner can wait until the pages they describe are persisted
+    without locking the index for other processes sharing it.
+    """
+
+    def __init__(self, path: str):
+        """Open (and create if needed) the index database.
+
+        Args:
+            path (str): Path to the SQLite database file.
+        """
+        self._pending: dict[str, tuple[str, str, str, float]] = {}
+        self._conn = connect(path, _SCHEMA)
+
+    @property
+    def uncommitted(self) -> int:
+        """Number of page keys with an update waiting for `commit`."""
+
+        return len(self._pending)
+
+    def get(self, key: str) -> Optional[tuple[str, dict]]:
+        """Return the latest hash and payload for a page key, if any."""
+
+        if key in self._pending:
+            _, digest, payload, _ = self._pending[key]
+            return digest, json.loads(payload)
+        row = self._conn.execute(
+            "SELECT hash, payload FROM payload_hashes WHERE page_key = ?", (key,)
+        ).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def put(self, key: str, digest: str, payload: dict):
+        """Record the hash of the payload just written for a page key."""
+
+        self._pending[key] = (key, digest, normalize_payload(payload), time.time())
+
+    def snapshot(self) -> dict[str, tuple[str, str, str, float]]:
+        """Return a copy of the pending updates, to `commit` later."""
+
+        return dict(self._pending)
+
+    def commit(self, updates: Optional[dict[str, tuple[str, str, str, float]]] = None):
+        """Write pending updates in one transaction.
+
+        Args:
+            updates (Optional[dict]): A `snapshot` to write instead of
+                every pending update; a key updated again since stays
+                pending with its newer hash.
+        """
+        updates = dict(self._pending) if updates is None else updates
+        if not updates:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO payload_hashes (page_key, hash, payload, updated_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (page_key) DO UPDATE SET "
+                "hash = excluded.hash, payload = excluded.payload, "
+                "updated_at = excluded.updated_at",
+                updates.values(),
+            )
+        for key, update in updates.items():
+            if self._pending.get(key) is update:
+                del self._pending[key]
+
+    def close(self, commit: bool = True):
+        """Close the database.
+
+        Args:
+            commit (bool): Write pending updates first; otherwise they
+                are discarded.
+        """
+        if commit:
+            self.commit()
+        self._conn.close()
+
+
+class ChangeDetectingSink:
+    """Sink wrapper that only forwards payloads whose content changed.
+
+    Each payload is hashed in normalized form and compared against the
+    hash index. Unchanged pages skip the wrapped sink entirely; changed
+    or new pages are written and, if a changes stream is configured, a
+    field-level diff record is appended to it as one JSON line.
+
+    A hash is only committed once the wrapped sink reports its page as
+    persisted, by a checkpoint or a successful close: after a crash, the
+    pages lost from the sink's buffers are written again by the next run
+    instead of being skipped as unchanged.
+    """
+
+    def __init__(
+        self,
+        inner: ResultSink,
+        index_path: str,
+        changes_path: Optional[str] = None,
+        batch_size: int = 100,
+    ):
+        """Wrap `inner` with change detection.
+
+        Args:
+            inner (ResultSink): The sink receiving changed payloads.
+            index_path (str): Path of the SQLite hash index.
+            changes_path (Optional[str]): JSON Lines file receiving one
+                diff record per changed page.
+            batch_size (int): Index updates after which the wrapped sink
+                is checkpointed.
+        """
+        self.inner = inner
+        self.batch_size = batch_size
+        self._checkpointing = asyncio.Lock()
+        self.changed = 0
+        self.unchanged = 0
+        self._index = HashIndex(index_path)
+        self._changes: Optional[TextIO] = (
+            # pylint: disable-next=consider-using-with
+            open(changes_path, "a", encoding="utf-8")
+            if changes_path
+            else None
+        )
+
+    async def write(self, record: PageRecord) -> None:
+        """Forward the page to the wrapped sink only if its payload changed."""
+
+        key = record.page_key
+        payload = record.to_payload()
+        digest = payload_hash(payload)
+        previous = self._index.get(key)
+
+        if previous is not None and previous[0] == digest:
+            self.unchanged += 1
+            logger.info("Payload unchanged for %s, skipping write", key)
+            return
+
+        await self.inner.write(record)
+        self._index.put(key, digest, payload)
+        self.changed += 1
+        if self._index.uncommitted >= self.batch_size:
+            await self.checkpoint()
+
+        if self._changes is not None:
+            change = {
+                "page_key": key,
+                "url": record.url,
+                "detected_at": time.time(),
+                "status": "new" if previous is None else "changed",
+                "diff": field_diff(previous[1] if previous else {}, payload),
+            }
+            self._changes.write(json.dumps(change, ensure_ascii=False) + "\n")
+
+    async def checkpoint(self) -> bool:
+        """Checkpoint the wrapped sink, then commit the hashes it persisted.
+
+        Pages written while the wrapped sink is checkpointed may not be
+        persisted yet: their hashes wait for the next checkpoint.
+        """
+        async with self._checkpointing:
+            updates = self._index.snapshot()
+            if not await self.inner.checkpoint():
+                return False
+            self._index.commit(updates)
+            return True
+
+    async def close(self) -> None:
+        """Close the wrapped sink, the index and the changes stream.
+
+        The pending hashes are rolled back if the wrapped sink fails to
+        close.
+        """
+        persisted = False
+        try:
+            await self.inner.close()
+            persisted = True
+        finally:
+            self._index.close(commit=persisted)
+            if self._changes is not None:
+                self._changes.close()
+
+        logger.info(
+            "Change detection: changed=%d, unchanged=%d",
+            self.changed,
+            self.unchanged,
+        )
@@ -0,0 +1,313 @@
+"""Columnar Parquet / Arrow IPC export of scraped payloads.
+
+`pyarrow` is an optional dependency: it is only imported when a
+columnar writer is actually created.
+"""
+
+import glob
+import json
+import os
+from typing import Any, Iterator, Optional
+
+from app.fanout import MANIFEST_NAME, Manifest
+from app.observability import get_logger
+from app.records import PageRecord
+from app.utils import as_float, page_key
+
+logger = get_logger(__name__)
+
+# `field_type` keys produced by the About extraction that get their own
+# typed column. Anything else ends up in the `extra` map column.
+KNOWN_FIELDS = (
+    "address",
+    "category",
+    "email",
+    "phone",
+    "website",
+    "price_range",
+    "rating",
+    "hours",
+    "profile_intro",
+)
+
+_RESERVED = {"display_name", "latitude", "longitude", "url"}
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+
+def _require_pyarrow():
+    """Import pyarrow or fail with an actionable message."""
+    try:
+        # pylint: disable-next=import-outside-toplevel
+        import pyarrow as pa
+    except ImportError as e:
+        raise RuntimeError(
+            "Columnar export requires the optional 'pyarrow' package "
+            "(pip install pyarrow)."
+        ) from e
+    return pa
+
+
+def build_schema():
+    """Return the stable Arrow schema of exported pages."""
+
+    pa = _require_pyarrow()
+    return pa.schema(
+        [
+            pa.field("page_key", pa.string(), nullable=False),
+            pa.field("url", pa.string()),
+            pa.field("display_name", pa.string()),
+            pa.field("latitude", pa.float64()),
+            pa.field("longitude", pa.float64()),
+            pa.field("scraped_at", pa.timestamp("ms", tz="UTC")),
+            *(pa.field(name, pa.string()) for name in KNOWN_FIELDS),
+            pa.field("extra", pa.map_(pa.string(), pa.string())),
+        ]
+    )
+
+
+def _field_columns(fields: dict) -> dict:
+    """Split extracted fields into the typed columns and the `extra` map."""
+    columns: dict[str, Any] = {}
+    for name in KNOWN_FIELDS:
+        value = fields.get(name)
+        columns[name] = None if value is None else str(value)
+    columns["extra"] = [
+        (name, str(value))
+        for name, value in fields.items()
+        if name not in _RESERVED and name not in KNOWN_FIELDS and value is not None
+    ]
+    return columns
+
+
+def to_row(key: str, url: Optional[str], payload: dict, scraped_at: float) -> dict:
+    """Flatten a payload into a row matching `build_schema`.
+
+    Args:
+        key (str): Canonical page key.
+        url (Optional[str]): Source URL, when known.
+        payload (dict): The scraped payload.
+        scraped_at (float): Unix timestamp of the scrape.
+
+    Returns:
+        dict: One value per schema column.
+    """
+    row: dict[str, Any] = {
+        "page_key": key,
+        "url": url,
+        "display_name": payload.get("display_name"),
+        "latitude": as_float(payload.get("latitude")),
+        "longitude": as_float(payload.get("longitude")),
+        "scraped_at": int(scraped_at * 1000),
+    }
+    row.update(_field_columns(payload))
+    return row
+
+
+def record_row(record: PageRecord) -> dict:
+    """Flatten a page record into a row matching `build_schema`."""
+
+    return {
+        "page_key": record.page_key,
+        "url": record.url,
+        "display_name": record.display_name,
+        "latitude": record.latitude,
+        "longitude": record.longitude,
+        "scraped_at": int(record.scraped_at * 1000),
+        **_field_columns(record.fields),
+    }
+
+
+class ColumnarWriter:
+    """Accumulate rows column by column and write them in bounded batches.
+
+    Rows are appended to per-column lists; once `batch_rows` rows are
+    buffered they are converted into one Arrow record batch and written
+    as a Parquet row group (or an Arrow IPC batch), so memory use stays
+    bounded regardless of the number of pages.
+    """
+
+    def __init__(self, path: str, fmt: str = "parquet", batch_rows: int = 10_000):
+        """Create the output file.
+
+        Args:
+            path (str): Destination file path.
+            fmt (str): One of `COLUMNAR_FORMATS`.
+            batch_rows (int): Rows buffered before a batch is written.
+
+        Raises:
+            ValueError: If `fmt` is unknown.
+        """
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format {fmt!r}")
+
+        pa = _require_pyarrow()
+        self.path = path
+        self.batch_rows = batch_rows
+        self.rows_written = 0
+        self._schema = build_schema()
+        self._columns: dict[str, list] = {name: [] for name in self._schema.names}
+        self._file = None
+
+        if fmt == "parquet":
+            # pylint: disable-next=import-outside-toplevel
+            from pyarrow import parquet
+
+            self._writer = parquet.ParquetWriter(path, self._schema, compression="zstd")
+        else:
+            # pylint: disable-next=import-outside-toplevel
+            from pyarrow import ipc
+
+            self._file = pa.OSFile(path, "wb")
+            self._writer = ipc.new_file(self._file, self._schema)
+
+    def __len__(self) -> int:
+        return len(self._columns["page_key"])
+
+    def append(self, row: dict):
+        """Buffer one row, writing a batch when the buffer is full."""
+
+        for name, values in self._columns.items():
+            values.append(row.get(name))
+        if len(self) >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered rows as one record batch."""
+
+        if not self._columns["page_key"]:
+            return
+
+        pa = _require_pyarrow()
+        batch = pa.record_batch(
+            [
+                pa.array(values, type=field.type)
+                for field, values in zip(self._schema, self._columns.values())
+            ],
+            schema=self._schema,
+        )
+        self._writer.write_batch(batch)
+        self.rows_written += batch.num_rows
+        for values in self._columns.values():
+            values.clear()
+
+    def close(self):
+        """Flush buffered rows and finalize the file."""
+
+        self.flush()
+        self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        logger.info("Wrote %d rows to %s", self.rows_written, self.path)
+
+
+class ColumnarSink:
+    """Live output sink writing scraped pages to a Parquet or Arrow file."""
+
+    def __init__(self, path: str, fmt: str = "parquet", batch_rows: int = 10_000):
+        """Open the columnar writer backing the sink."""
+
+        self._writer = ColumnarWriter(path, fmt, batch_rows)
+
+    async def write(self, record: PageRecord) -> None:
+        """Buffer the page as one row."""
+
+        self._writer.append(record_row(record))
+
+    async def checkpoint(self) -> bool:
+        """Report that no page is safe before `close`.
+
+        The file only becomes readable once `close` writes its footer.
+        """
+        return False
+
+    async def close(self) -> None:
+        """Write pending rows and finalize the file."""
+
+        self._writer.close()
+
+
+def _key_from_filename(path: str) -> str:
+    """Recover the page key from a `safe_filename`-derived JSON file name."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if stem.endswith("_about"):
+        stem = stem[: -len("_about")]
+    return stem.lower() or "index"
+
+
+def _page_files(data_dir: str) -> Iterator[tuple[str, str, float]]:
+    """Yield the page key, path and scrape time of every page file.
+
+    A fan-out layout is read through its manifest; a flat directory is
+    listed, with keys recovered from file names and modification times
+    standing in for scrape times. `convert_directory` prefers the key of
+    the `url` stored in a file over the one recovered from its name.
+    """
+    manifest_path = os.path.join(data_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        manifest = Manifest(manifest_path)
+        try:
+            for entry in manifest.entries():
+                yield (
+                    entry.page_key,
+                    os.path.join(data_dir, entry.path),
+                    entry.scraped_at,
+                )
+        finally:
+            manifest.close()
+        return
+
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        try:
+            scraped_at = os.path.getmtime(path)
+        except OSError:
+            scraped_at = 0.0
+        yield _key_from_filename(path), path, scraped_at
+
+
+def convert_directory(
+    data_dir: str,
+    out_path: str,
+    fmt: str = "parquet",
+    batch_rows: int = 10_000,
+) -> int:
+    """Convert the per-page JSON files of a directory into one columnar file.
+
+    Files that cannot be parsed are skipped with a warning. A directory
+    written by the `json-sharded` sink is read through its manifest;
+    for a flat directory, the file modification time is used as the
+    scrape time. Pages are keyed by the `url` stored in their file, so
+    rows join with the other sinks; the file name is only used for
+    files written before the URL was stored.
+
+    Args:
+        data_dir (str): Directory holding `*.json` page files, or the
+            root of a fan-out layout.
+        out_path (str): Destination file path.
+        fmt (str): One of `COLUMNAR_FORMATS`.
+        batch_rows (int): Rows buffered before a batch is written.
+
+    Returns:
+        int: Number of rows written.
+    """
+    writer = ColumnarWriter(out_path, fmt, batch_rows)
+    try:
+        for key, path, scraped_at in _page_files(data_dir):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    payload = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning("Skipping unreadable file %s: %s", path, e)
+                continue
+            if not isinstance(payload, dict):
+                logger.warning("Skipping non-object payload in %s", path)
+                continue
+            url = payload.get("url")
+            if isinstance(url, str) and url:
+                key = page_key(url)
+            else:
+                url = None
+            writer.append(to_row(key, url, payload, scraped_at))
+    finally:
+        writer.close()
+    return writer.rows_written
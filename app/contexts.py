@@ -0,0 +1,163 @@
+"""Browser processes shared by several workers through browser contexts."""
+
+import asyncio
+from typing import Optional
+
+from nodriver import Browser, Tab, cdp, start
+
+from app.browser_setup import build_browser_config
+from app.launch import LaunchScheduler
+from app.observability import get_logger
+from app.watchdog import kill_browser
+
+logger = get_logger(__name__)
+
+
+class BrowserHost:  # pylint: disable=too-many-instance-attributes
+    """One Chromium process hosting the tabs of several workers.
+
+    Every worker gets its own incognito browser context, created through
+    the CDP Target domain, so cookies, cache, storage and per-tab
+    emulation and network settings stay isolated between workers while
+    they share the browser and GPU processes. The browser is launched
+    with the first context and stopped when the last one is closed; it
+    is launched again if a context is opened afterwards.
+
+    A browser found dead or hung by a worker's watchdog is killed with
+    `discard`; its contexts are forgotten and the next `open_tab`
+    launches a new browser.
+    """
+
+    def __init__(
+        self,
+        host_id: int,
+        profile_suffix: str,
+        launch_profile: str = "default",
+        launcher: Optional[LaunchScheduler] = None,
+    ):
+        """Describe the browser; nothing is launched yet.
+
+        Args:
+            host_id (int): Identifier used for logging and launch slots.
+            profile_suffix (str): Suffix of the user data directory.
+            launch_profile (str): Name of the launch profile.
+            launcher (Optional[LaunchScheduler]): Scheduler throttling
+                the browser launch.
+        """
+        self.host_id = host_id
+        self.profile_suffix = profile_suffix
+        self.launch_profile = launch_profile
+        self.launcher = launcher or LaunchScheduler()
+        self._browser: Optional[Browser] = None
+        self._contexts: dict[str, tuple[Browser, cdp.browser.BrowserContextID]] = {}
+        self._users = 0
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._contexts)
+
+    async def _acquire(self) -> Browser:
+        """Register a user of the browser, launching it if needed."""
+        async with self._lock:
+            if self._browser is None:
+                async with self.launcher.slot(self.host_id):
+                    self._browser = await start(
+                        build_browser_config(self.profile_suffix, self.launch_profile)
+                    )
+                logger.info("Browser host %d started", self.host_id)
+            self._users += 1
+            return self._browser
+
+    async def _release(
+        self,
+        browser: Optional[Browser],
+        context_id: Optional[cdp.browser.BrowserContextID],
+    ):
+        """Dispose of a context and stop the browser once unused."""
+        async with self._lock:
+            if browser is not self._browser:
+                # The browser was discarded along with its users.
+                return
+            if browser is None:
+                return
+            self._users -= 1
+            if context_id is not None:
+                try:
+                    await browser.connection.send(
+                        cdp.target.dispose_browser_context(context_id)
+                    )
+                except Exception as e:
+                    logger.warning(
+                        "Browser host %d could not dispose context %s: %s",
+                        self.host_id,
+                        context_id,
+                        e,
+                    )
+            if not self._users:
+                browser.stop()
+                self._browser = None
+                logger.info("Browser host %d stopped", self.host_id)
+
+    async def _find_tab(
+        self, browser: Browser, target_id: cdp.target.TargetID, attempts: int = 20
+    ) -> Tab:
+        """Return the tab of a new target once the browser knows about it."""
+        for _ in range(attempts):
+            for tab in browser.targets:
+                if tab.type_ == "page" and tab.target_id == target_id:
+                    return tab
+            await asyncio.sleep(0.05)
+            await browser.update_targets()
+        raise RuntimeError(f"Target {target_id} did not appear in browser host")
+
+    async def open_tab(self) -> Tab:
+        """Create an isolated browser context with one blank tab.
+
+        Returns:
+            Tab: The tab; release it with `close_tab`.
+        """
+        browser = await self._acquire()
+        context_id = None
+        try:
+            context_id = await browser.connection.send(
+                cdp.target.create_browser_context(dispose_on_detach=True)
+            )
+            target_id = await browser.connection.send(
+                cdp.target.create_target("about:blank", browser_context_id=context_id)
+            )
+            tab = await self._find_tab(browser, target_id)
+        except BaseException:
+            await self._release(browser, context_id)
+            raise
+
+        self._contexts[target_id] = (browser, context_id)
+        logger.info(
+            "Browser host %d opened context %s (%d open)",
+            self.host_id,
+            context_id,
+            len(self),
+        )
+        return tab
+
+    async def close_tab(self, tab: Tab):
+        """Dispose of the tab's context, stopping the browser after the last."""
+
+        browser, context_id = self._contexts.pop(tab.target_id, (self._browser, None))
+        await self._release(browser, context_id)
+
+    async def discard(self, browser: Browser):
+        """Kill a dead or hung browser so that the next tab relaunches it.
+
+        Closing the tabs of the discarded browser afterwards is a no-op.
+
+        Args:
+            browser (Browser): The browser the caller's tab lived in;
+                nothing happens if it was already replaced.
+        """
+        async with self._lock:
+            if browser is not self._browser:
+                return
+            kill_browser(browser)
+            self._browser = None
+            self._users = 0
+            logger.warning("Browser host %d discarded", self.host_id)
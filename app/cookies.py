@@ -8,6 +8,12 @@ from app.observability import get_logger
 
 logger = get_logger(__name__)
 
+# `aria-label`s of the consent buttons that keep only essential cookies.
+CONSENT_LABELS = (
+    "Consenti solo i cookie essenziali",
+    "Rifiuta cookie facoltativi",
+)
+
 
 async def wait_cookie_banner(tab: Tab, timeout: int = 15) -> Union[Element, None]:
     """Wait for a cookie consent banner to appear on the page.
@@ -73,45 +79,3 @@ async def find_cookie_button(tab: Tab) -> Union[Element, None]:
         if btn:
             return btn
     return None
-
-
-async def fast_accept_cookies(tab: Tab):
-    """Attempt to accept or reject cookies using a fast JavaScript strategy.
-
-    This function executes an in-page JavaScript snippet that directly
-    searches for cookie consent buttons by their `aria-label` attributes
-    and clicks them if found. This approach avoids DOM traversal via the
-    automation API and is optimized for speed.
-
-    Args:
-        tab (Tab): The Nodriver tab instance where the script is executed.
-    """
-    logger.info("Trying fast cookie accept")
-
-    js = r"""
-    (() => {
-      const labels = [
-        "Consenti solo i cookie essenziali",
-        "Rifiuta cookie facoltativi"
-      ];
-
-      for (const label of labels) {
-        const btn = document.querySelector(
-          `[aria-label="${label}"]`
-        );
-        if (btn) {
-          btn.click();
-          return label;
-        }
-      }
-      return null;
-    })();
-    """
-
-    result = await tab.evaluate(js, return_by_value=True)
-
-    if result:
-        logger.info("Cookie clicked via JS: %s", result)
-        await tab.wait(0.5)
-    else:
-        logger.info("No cookie banner detected (fast path)")
@@ -0,0 +1,413 @@
+"""Long-running serve mode backed by a warm pool of browser workers."""
+
+import asyncio
+import glob
+import json
+import os
+from itertools import count
+from typing import Callable, Iterable, Optional
+
+from app.archive import CaptureArchive
+from app.contexts import BrowserHost
+from app.extraction import ExtractionPool
+from app.launch import LaunchScheduler
+from app.observability import get_logger
+from app.orchestrator import RunConfig, browser_worker, worker_host
+from app.reporting import ScrapeReport
+from app.sinks import ResultSink
+from app.utils import read_urls
+from app.work_queue import Lease
+
+logger = get_logger(__name__)
+
+# Largest request body the HTTP endpoint reads, about 40k URLs.
+MAX_BODY_BYTES = 4 * 2**20
+
+
+class PoolWorkSource:
+    """Work source feeding the pool's workers from a shared in-memory queue.
+
+    `lease` waits for new URLs instead of returning None when the queue
+    is empty; only after `idle_timeout` seconds without work does it
+    return None, which makes the worker exit and stop its browser.
+    """
+
+    def __init__(
+        self, idle_timeout: float, on_drained: Optional[Callable[[], None]] = None
+    ):
+        """Create an empty source.
+
+        Args:
+            idle_timeout (float): Seconds `lease` waits for a URL.
+            on_drained (Optional[Callable[[], None]]): Called whenever
+                the last leased URL is done and no URL is waiting.
+        """
+        self.idle_timeout = idle_timeout
+        self.on_drained = on_drained
+        self.in_flight = 0
+        self._pending: asyncio.Queue[tuple[int, str]] = asyncio.Queue()
+        self._job_ids = count()
+
+    def __len__(self) -> int:
+        return self._pending.qsize()
+
+    def put(self, url: str):
+        """Add a URL for the next free worker."""
+
+        self._pending.put_nowait((next(self._job_ids), url))
+
+    async def lease(self) -> Optional[Lease]:
+        """Wait for the next URL, or return None once idle for too long."""
+
+        try:
+            job_id, url = await asyncio.wait_for(self._pending.get(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            return None
+        self.in_flight += 1
+        return Lease(job_id=job_id, url=url, attempts=1)
+
+    async def ack(self, lease: Lease) -> None:  # pylint: disable=unused-argument
+        """Mark the URL as done."""
+
+        self._finish()
+
+    # pylint: disable-next=unused-argument
+    async def nack(self, lease: Lease, error: str = "") -> bool:
+        """Drop the failed URL; submitted batches are not retried."""
+
+        self._finish()
+        return False
+
+    async def extend(self, lease: Lease) -> None:  # pylint: disable=unused-argument
+        """In-memory leases never expire."""
+
+    def _finish(self):
+        """Release a lease, reporting when all submitted work is done."""
+
+        self.in_flight -= 1
+        if not self.in_flight and self._pending.empty() and self.on_drained:
+            self.on_drained()
+
+
+class WarmPool:  # pylint: disable=too-many-instance-attributes
+    """Keep browser workers alive between batches.
+
+    Workers are started on demand, up to `config.browsers`, when
+    submitted URLs outnumber the workers that are not busy. A worker
+    that receives no URL for `idle_timeout` seconds is reaped. Worker
+    ids, and thus browser profile directories, are reused so that a
+    relaunched browser finds its cookies and cache from earlier batches.
+    Whenever the submitted work is done, the sink is checkpointed, so
+    that small batches do not wait in its buffers for the next ones.
+    """
+
+    def __init__(
+        self,
+        config: RunConfig,
+        sink: ResultSink,
+        idle_timeout: float = 300,
+        restart_delay: float = 5.0,
+    ):
+        """Create an empty pool.
+
+        Args:
+            config (RunConfig): Settings of the workers; `browsers` is
+                the maximum pool size.
+            sink (ResultSink): Output backend shared by all workers.
+            idle_timeout (float): Seconds a worker may wait for work
+                before its browser is stopped.
+            restart_delay (float): Seconds before workers are started
+                again for the backlog after a worker crashed, so that a
+                browser failing at launch is not relaunched in a loop.
+        """
+        self.config = config
+        self.sink = sink
+        self.restart_delay = restart_delay
+        self._restart: Optional[asyncio.TimerHandle] = None
+        self.report = ScrapeReport()
+        self._source = PoolWorkSource(idle_timeout, self._on_drained)
+        self._checkpoints: set[asyncio.Task] = set()
+        self._launcher = LaunchScheduler(config.launch_concurrency)
+        self._extractor = (
+            ExtractionPool(config.extraction_workers)
+            if config.extraction == "network"
+            else None
+        )
+        self._archive = (
+            CaptureArchive(config.archive_dir) if config.archive_dir else None
+        )
+        self._workers: dict[int, asyncio.Task] = {}
+        self._hosts: dict[int, BrowserHost] = {}
+
+    def submit(self, urls: Iterable[str]) -> int:
+        """Queue a batch of URLs, starting workers if needed.
+
+        Args:
+            urls (Iterable[str]): URLs to scrape.
+
+        Returns:
+            int: Number of URLs accepted.
+        """
+        accepted = 0
+        for url in urls:
+            self._source.put(url)
+            accepted += 1
+        self._scale()
+        return accepted
+
+    def status(self) -> dict:
+        """Return the pool size, backlog and cumulative outcome counters."""
+
+        return {
+            "workers": len(self._workers),
+            "busy": self._source.in_flight,
+            "pending": len(self._source),
+            **self.report.summary(),
+        }
+
+    def _scale(self):
+        """Start workers for the backlog that available workers cannot absorb.
+
+        Workers that are idle or still launching count as available;
+        only those holding a lease are busy.
+        """
+        available = len(self._workers) - self._source.in_flight
+        missing = len(self._source) - available
+        free_ids = (
+            i for i in range(1, self.config.browsers + 1) if i not in self._workers
+        )
+        for worker_id, _ in zip(free_ids, range(missing)):
+            task = asyncio.create_task(
+                browser_worker(
+                    worker_id,
+                    self._source,
+                    self.report,
+                    self.sink,
+                    self.config,
+                    launcher=self._launcher,
+                    extractor=self._extractor,
+                    host=worker_host(
+                        self._hosts, worker_id, self.config, self._launcher
+                    ),
+                    archive=self._archive,
+                )
+            )
+            task.add_done_callback(lambda t, i=worker_id: self._on_worker_done(i, t))
+            self._workers[worker_id] = task
+            logger.info("Pool started worker %d (%s)", worker_id, self.status())
+
+    def _on_worker_done(self, worker_id: int, task: asyncio.Task):
+        """Forget a finished worker and log why it stopped."""
+
+        del self._workers[worker_id]
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.error("Pool worker %d crashed: %s", worker_id, task.exception())
+            if self._restart is None:
+                self._restart = asyncio.get_running_loop().call_later(
+                    self.restart_delay, self._rescale
+                )
+            return
+
+        logger.info("Pool reaped idle worker %d (%s)", worker_id, self.status())
+        # A batch may have arrived while this worker was shutting down.
+        self._scale()
+
+    def _on_drained(self):
+        """Checkpoint the sink in the background once the backlog is done."""
+
+        task = asyncio.create_task(self._checkpoint())
+        self._checkpoints.add(task)
+        task.add_done_callback(self._checkpoints.discard)
+
+    async def _checkpoint(self):
+        """Persist the pages of the finished batches."""
+
+        try:
+            await self.sink.checkpoint()
+        except Exception as e:
+            logger.error("Pool could not checkpoint the sink: %s", e)
+
+    def _rescale(self):
+        """Start workers for the backlog left by a crashed worker."""
+
+        self._restart = None
+        self._scale()
+
+    async def close(self):
+        """Stop all workers and close the sink."""
+
+        if self._restart is not None:
+            self._restart.cancel()
+        workers = list(self._workers.values())
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        await asyncio.gather(*self._checkpoints)
+        await self.sink.close()
+        if self._extractor is not None:
+            self._extractor.close()
+        if self._archive is not None:
+            self._archive.close()
+        self.report.log_summary()
+
+
+async def watch_spool(pool: WarmPool, directory: str, interval: float = 2.0):
+    """Submit every `*.txt` URL file dropped into a spool directory.
+
+    Accepted files are moved to the `accepted/` subdirectory. Producers
+    should write under another name and rename to `.txt` when done, so
+    that a partially written file is never picked up.
+
+    Args:
+        pool (WarmPool): The pool receiving the batches.
+        directory (str): The watched directory.
+        interval (float): Seconds between two scans.
+    """
+    accepted_dir = os.path.join(directory, "accepted")
+    os.makedirs(accepted_dir, exist_ok=True)
+
+    while True:
+        for path in sorted(glob.glob(os.path.join(directory, "*.txt"))):
+            urls = read_urls(path)
+            os.replace(path, os.path.join(accepted_dir, os.path.basename(path)))
+            logger.info(
+                "Spool batch %s: %d URLs accepted",
+                os.path.basename(path),
+                pool.submit(urls),
+            )
+        await asyncio.sleep(interval)
+
+
+def _parse_batch(body: bytes) -> list[str]:
+    """Parse a batch given as a JSON list, `{"urls": [...]}` or text lines.
+
+    Raises:
+        ValueError: If the body is JSON of an unexpected shape.
+    """
+    text = body.decode("utf-8").strip()
+    if not text.startswith(("[", "{")):
+        return [line.strip() for line in text.splitlines() if line.strip()]
+
+    data = json.loads(text)
+    urls = data.get("urls") if isinstance(data, dict) else data
+    if not isinstance(urls, list) or not all(isinstance(u, str) for u in urls):
+        raise ValueError('Expected a list of URLs or {"urls": [...]}')
+    return [u.strip() for u in urls if u.strip()]
+
+
+def _route(pool: WarmPool, method: str, path: str, body: bytes) -> tuple[int, dict]:
+    """Dispatch one HTTP request to the pool."""
+
+    if path == "/status":
+        if method != "GET":
+            return 405, {"error": "Use GET"}
+        return 200, pool.status()
+
+    if path == "/batches":
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+        try:
+            urls = _parse_batch(body)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        return 202, {"accepted": pool.submit(urls)}
+
+    return 404, {"error": f"Unknown path {path}"}
+
+
+_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+}
+
+
+async def _handle_http(
+    pool: WarmPool, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+):
+    """Serve a single HTTP/1.1 request and close the connection."""
+
+    try:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if len(request_line) < 2:
+            status, payload = 400, {"error": "Malformed request line"}
+        else:
+            length = int(headers.get("content-length", "0"))
+            if length < 0:
+                raise ValueError(f"Negative Content-Length {length}")
+            if length > MAX_BODY_BYTES:
+                status, payload = 413, {"error": f"Body over {MAX_BODY_BYTES} bytes"}
+            else:
+                body = await reader.readexactly(length) if length else b""
+                status, payload = _route(pool, request_line[0], request_line[1], body)
+
+        data = json.dumps(payload).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1") + data
+        )
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+        logger.warning("Dropped malformed HTTP request: %s", e)
+    finally:
+        writer.close()
+
+
+async def start_http_server(
+    pool: WarmPool, host: str = "127.0.0.1", port: int = 8765
+) -> asyncio.AbstractServer:
+    """Expose `POST /batches` and `GET /status` on a local HTTP endpoint.
+
+    Args:
+        pool (WarmPool): The pool receiving the batches.
+        host (str): Interface to bind; loopback by default.
+        port (int): TCP port to listen on.
+
+    Returns:
+        asyncio.AbstractServer: The listening server.
+    """
+    server = await asyncio.start_server(
+        lambda r, w: _handle_http(pool, r, w), host, port
+    )
+    logger.info("Serving batches on http://%s:%d", host, port)
+    return server
+
+
+async def serve(
+    pool: WarmPool,
+    spool_dir: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: Optional[int] = None,
+):
+    """Accept batches until cancelled, then shut the pool down.
+
+    Args:
+        pool (WarmPool): The warm worker pool.
+        spool_dir (Optional[str]): Directory watched for URL files.
+        host (str): Interface of the HTTP endpoint.
+        port (Optional[int]): Port of the HTTP endpoint, if enabled.
+    """
+    server = await start_http_server(pool, host, port) if port else None
+    tasks = [asyncio.create_task(watch_spool(pool, spool_dir))] if spool_dir else []
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for task in tasks:
+            task.cancel()
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+        await pool.close()
@@ -0,0 +1,204 @@
+"""Python port of the About extraction, run on raw response bodies.
+
+This mirrors the in-page JavaScript of `app.scraper`
+so that payloads can be extracted from captured network responses
+without evaluating anything in the renderer.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Iterator, Optional
+
+from app.observability import get_logger
+
+logger = get_logger(__name__)
+
+MARKER = "about_app_sections"
+
+_SCRIPT_RE = re.compile(
+    r'<script[^>]*type="application/json"[^>]*>(.*?)</script>', re.DOTALL
+)
+
+# Deepest nesting searched for the About sections, here and in the page.
+MAX_DEPTH = 100
+
+# Prefix Facebook prepends to some JSON responses to prevent hijacking.
+_XSSI_PREFIX = "for (;;);"
+
+
+def iter_json_blobs(body: str) -> Iterator[Any]:
+    """Yield the JSON documents of a response body that mention the marker.
+
+    HTML documents contribute their `application/json` script blocks;
+    other bodies are parsed whole or, for streamed GraphQL responses,
+    one line at a time. Unparsable fragments are skipped.
+
+    Args:
+        body (str): The decoded response body.
+
+    Yields:
+        Any: Each parsed JSON document.
+    """
+    fragments: list[str]
+    if body.lstrip().startswith("<"):
+        fragments = [m.group(1) for m in _SCRIPT_RE.finditer(body)]
+    else:
+        body = body.strip().removeprefix(_XSSI_PREFIX)
+        try:
+            yield json.loads(body)
+            return
+        except ValueError:
+            fragments = body.splitlines()
+
+    for fragment in fragments:
+        if MARKER not in fragment:
+            continue
+        try:
+            yield json.loads(fragment)
+        except ValueError:
+            continue
+
+
+def wrap_json_blobs(blobs: list[str]) -> str:
+    """Join JSON blob texts into a body that `iter_json_blobs` reads back.
+
+    Each blob goes into its own `application/json` script block; script
+    contents cannot contain `</script>`, so the blobs round-trip as is.
+
+    Args:
+        blobs (list[str]): Texts of JSON script blocks of a page.
+
+    Returns:
+        str: An HTML fragment holding the blobs, or "" without blobs.
+    """
+    return "".join(f'<script type="application/json">{b}</script>' for b in blobs)
+
+
+def find_about_sections(node: Any, max_depth: int = MAX_DEPTH) -> Optional[dict]:
+    """Find the first `about_app_sections` object that has `nodes`.
+
+    The search is depth-first in document order, like the JavaScript
+    `findAbout`, iterative and limited to `max_depth` levels so that
+    deep documents cost neither stack nor unbounded time.
+    """
+    stack = [(node, 0)]
+    while stack:
+        current, depth = stack.pop()
+        if isinstance(current, dict):
+            about = current.get(MARKER)
+            # JavaScript truthiness: an empty list of nodes still counts.
+            if isinstance(about, dict) and about.get("nodes") not in (None, 0, ""):
+                return about
+            children = list(current.values())
+        elif isinstance(current, list):
+            children = current
+        else:
+            continue
+        if depth < max_depth:
+            stack.extend(
+                (child, depth + 1)
+                for child in reversed(children)
+                if isinstance(child, (dict, list))
+            )
+    return None
+
+
+def _nodes(container: Any) -> list:
+    """Return `container["nodes"]` when present, else an empty list."""
+    nodes = container.get("nodes") if isinstance(container, dict) else None
+    return nodes if isinstance(nodes, list) else []
+
+
+def extract_fields(about: dict) -> dict:
+    """Flatten the profile fields of an `about_app_sections` object.
+
+    Args:
+        about (dict): The `about_app_sections` object.
+
+    Returns:
+        dict: Field values keyed by `field_type`, plus `latitude` and
+        `longitude` when the address carries map coordinates.
+    """
+    result: dict = {}
+    for section in _nodes(about):
+        for collection in _nodes(section.get("activeCollections")):
+            renderer = collection.get("style_renderer")
+            if not isinstance(renderer, dict):
+                continue
+            for field_section in renderer.get("profile_field_sections") or []:
+                for field in _nodes(field_section.get("profile_fields")):
+                    field_type = field.get("field_type")
+                    value = (field.get("title") or {}).get("text")
+                    if field_type and value:
+                        result[field_type] = value
+
+                    coordinates = field.get("map_pin_coordinates")
+                    if field_type == "address" and coordinates:
+                        result["latitude"] = coordinates.get("latitude")
+                        result["longitude"] = coordinates.get("longitude")
+    return result
+
+
+def extract_about_from_body(body: str) -> Optional[dict]:
+    """Extract the About payload from one response body.
+
+    Args:
+        body (str): The decoded response body.
+
+    Returns:
+        Optional[dict]: The flattened payload, or None if the body
+        does not contain About sections.
+    """
+    if MARKER not in body:
+        return None
+
+    for blob in iter_json_blobs(body):
+        about = find_about_sections(blob)
+        if about is not None:
+            return extract_fields(about)
+    return None
+
+
+class ExtractionPool:
+    """Run `extract_about_from_body` off the event loop.
+
+    With `workers` > 0 the bodies are parsed in a process pool, so JSON
+    decoding of large documents neither blocks the browser workers nor
+    contends for the GIL. With 0 workers they are parsed inline.
+    """
+
+    def __init__(self, workers: int = 0):
+        """Create the pool.
+
+        Args:
+            workers (int): Number of extraction processes; 0 parses in
+                the calling thread.
+        """
+        self.workers = workers
+        self._executor: Optional[Executor] = (
+            ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            if workers
+            else None
+        )
+
+    async def extract(self, body: str) -> Optional[dict]:
+        """Extract the About payload from a body, or return None."""
+
+        if MARKER not in body:
+            return None
+        if self._executor is None:
+            return extract_about_from_body(body)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, extract_about_from_body, body
+        )
+
+    def close(self):
+        """Shut the worker processes down."""
+
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
@@ -0,0 +1,229 @@
+"""Hashed fan-out directory layout for per-page JSON files, with a manifest.
+
+A flat output directory slows to a crawl once it holds millions of
+files, and names derived from the URL path alone can collide. In this
+layout every page key is hashed: the first bytes of the digest pick
+nested subdirectories, so each directory stays small, and the file name
+combines a readable slug of the key with the digest, so distinct keys
+never share a file. Files are written to a temporary name and renamed
+into place, so readers never see a partial page.
+
+A SQLite manifest at the root maps each page key to its file, scrape
+time and size, so downstream consumers never list directories.
+"""
+
+import hashlib
+import os
+import re
+import uuid
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from app.observability import get_logger
+from app.records import PageRecord
+from app.result_store import connect
+
+logger = get_logger(__name__)
+
+MANIFEST_NAME = "manifest.sqlite"
+
+# Longest readable prefix kept from the page key in file names.
+_SLUG_LENGTH = 48
+_SLUG_RE = re.compile(r"[^a-z0-9_-]")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    page_key TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    scraped_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_scraped_at ON files (scraped_at);
+"""
+
+_UPSERT = """
+INSERT INTO files (page_key, path, scraped_at, size) VALUES (?, ?, ?, ?)
+ON CONFLICT (page_key) DO UPDATE SET
+    path = excluded.path,
+    scraped_at = excluded.scraped_at,
+    size = excluded.size
+"""
+
+
+def shard_path(key: str, levels: int = 2) -> str:
+    """Return the path of a page key's file, relative to the layout root.
+
+    Args:
+        key (str): The canonical page key.
+        levels (int): Number of nested directories, each named after
+            one byte of the digest (256 entries per level).
+
+    Returns:
+        str: E.g. `3f/a2/some-page-3fa2...json` for two levels.
+    """
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+    slug = _SLUG_RE.sub("", key.replace("/", "_"))[:_SLUG_LENGTH] or "page"
+    directories = [digest[2 * i : 2 * i + 2] for i in range(levels)]
+    return os.path.join(*directories, f"{slug}-{digest}.json")
+
+
+def write_atomic(path: str, data: bytes):
+    """Write a file through a temporary sibling renamed over the target.
+
+    The rename is atomic within a directory, so readers see either the
+    previous or the new content. The temporary name is unique per
+    writer and never ends in `.json`.
+
+    Args:
+        path (str): Destination file; its directory must exist.
+        data (bytes): File content.
+    """
+    tmp = f"{path}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        with open(tmp, "xb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """Location, scrape time and size of one page file."""
+
+    page_key: str
+    path: str
+    scraped_at: float
+    size: int
+
+
+class Manifest:
+    """SQLite index of the files of a fan-out layout.
+
+    Rows are upserted by page key and committed in batches in WAL mode,
+    so several processes writing to the same layout can share it and
+    readers can query it during a run. Files are always written before
+    their row is committed: a crash can leave at most one batch of files
+    unindexed, never an entry pointing at a missing file.
+    """
+
+    def __init__(self, path: str, batch_size: int = 100):
+        """Open (and create if needed) the manifest.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            batch_size (int): Number of buffered rows that triggers a
+                commit.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._pending: list[tuple] = []
+        self._conn = connect(path, _SCHEMA)
+
+    def __len__(self) -> int:
+        row = self._conn.execute("SELECT COUNT(*) FROM files").fetchone()
+        return int(row[0])
+
+    def add(self, entry: ManifestEntry):
+        """Buffer an entry, flushing when the batch is full."""
+
+        self._pending.append((entry.page_key, entry.path, entry.scraped_at, entry.size))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Upsert all buffered entries in one transaction."""
+
+        with self._conn:
+            self._conn.executemany(_UPSERT, self._pending)
+        self._pending.clear()
+
+    def close(self):
+        """Commit buffered entries and close the database."""
+
+        self.flush()
+        self._conn.close()
+
+    def get(self, key: str) -> Optional[ManifestEntry]:
+        """Return the entry of a page key, if any."""
+
+        row = self._conn.execute(
+            "SELECT page_key, path, scraped_at, size FROM files WHERE page_key = ?",
+            (key,),
+        ).fetchone()
+        return ManifestEntry(*row) if row else None
+
+    def entries(self, since: float = 0.0) -> Iterator[ManifestEntry]:
+        """Iterate over the pages scraped at or after `since`, oldest first.
+
+        Args:
+            since (float): Unix timestamp lower bound.
+
+        Yields:
+            ManifestEntry: The committed entries.
+        """
+        rows = self._conn.execute(
+            "SELECT page_key, path, scraped_at, size FROM files "
+            "WHERE scraped_at >= ? ORDER BY scraped_at",
+            (since,),
+        )
+        for row in rows:
+            yield ManifestEntry(*row)
+
+
+class ShardedJsonSink:
+    """Write one pretty-printed JSON file per page in a fan-out layout.
+
+    The files have the same content as those of `JsonFileSink`; only
+    their location differs, see `shard_path`. Re-scraping a page
+    replaces its file and its manifest entry.
+    """
+
+    def __init__(self, directory: str = "data", levels: int = 2, batch_size: int = 100):
+        """Open the layout rooted at `directory` and its manifest.
+
+        Args:
+            directory (str): Root of the layout.
+            levels (int): Nested directory levels, see `shard_path`.
+            batch_size (int): Manifest rows committed at once.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.levels = levels
+        self.manifest = Manifest(os.path.join(directory, MANIFEST_NAME), batch_size)
+        self._created: set[str] = set()
+
+    def path_for(self, key: str) -> str:
+        """Return the output file path of a page key."""
+
+        return os.path.join(self.directory, shard_path(key, self.levels))
+
+    async def write(self, record: PageRecord) -> None:
+        """Atomically write the page file and index it in the manifest."""
+
+        relative = shard_path(record.page_key, self.levels)
+        path = os.path.join(self.directory, relative)
+        parent = os.path.dirname(path)
+        if parent not in self._created:
+            os.makedirs(parent, exist_ok=True)
+            self._created.add(parent)
+
+        data = record.dumps(indent=True, with_url=True)
+        write_atomic(path, data)
+        self.manifest.add(
+            ManifestEntry(record.page_key, relative, record.scraped_at, len(data))
+        )
+        logger.info("Saved output to %s", path)
+
+    async def checkpoint(self) -> bool:
+        """Commit the pending manifest entries; the files are already written."""
+
+        self.manifest.flush()
+        return True
+
+    async def close(self) -> None:
+        """Commit the pending manifest entries."""
+
+        self.manifest.close()
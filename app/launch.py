@@ -0,0 +1,161 @@
+"""Chromium launch profiles and scheduling to ramp up browsers gradually."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from app.observability import get_logger
+from app.performance import Timer
+
+logger = get_logger(__name__)
+
+# Flags of every launch profile, on top of the defaults added by nodriver.
+_BASE_FLAGS = (
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-sync",
+    "--disable-extensions",
+)
+
+# nodriver turns site isolation off through its own `--disable-features`.
+# Chromium only honours the last occurrence of the switch, so profiles
+# disabling further features repeat these two.
+_NODRIVER_DISABLED_FEATURES = "IsolateOrigins,site-per-process"
+
+# Browser services a scraper never uses: translation prompts, Cast
+# discovery, optimization-guide model downloads and the bfcache.
+_UNUSED_FEATURES = "Translate,MediaRouter,OptimizationHints,BackForwardCache"
+
+# Chromium flags per launch profile, compared by `benchmarks/launch_profiles.py`.
+LAUNCH_PROFILES: dict[str, tuple[str, ...]] = {
+    "default": _BASE_FLAGS,
+    "low-memory": (
+        *_BASE_FLAGS,
+        # A single renderer process shared by all tabs and frames.
+        "--renderer-process-limit=1",
+        "--process-per-site",
+        # No GPU process; headless pages are composited in software.
+        "--disable-gpu",
+        # 32 MiB HTTP disk cache instead of a size derived from free disk.
+        "--disk-cache-size=33554432",
+        # Cap the V8 old generation, trading GC time for a smaller heap.
+        "--js-flags=--max-old-space-size=512",
+        "--disable-component-update",
+        f"--disable-features={_NODRIVER_DISABLED_FEATURES},{_UNUSED_FEATURES}",
+    ),
+    "max-throughput": (
+        *_BASE_FLAGS,
+        "--disable-gpu",
+        # Do not throttle the bursts of CDP messages sent per page.
+        "--disable-ipc-flooding-protection",
+        "--disable-hang-monitor",
+        "--disable-client-side-phishing-detection",
+        "--disable-component-update",
+        "--disable-domain-reliability",
+        "--mute-audio",
+        # Skip image decoding altogether, beyond the blocked image URLs.
+        "--blink-settings=imagesEnabled=false",
+        # PaintHolding delays the first paint of same-origin navigations.
+        f"--disable-features={_NODRIVER_DISABLED_FEATURES},{_UNUSED_FEATURES},"
+        "PaintHolding",
+    ),
+}
+
+
+def launch_flags(profile: str) -> list[str]:
+    """Return the Chromium flags of a launch profile.
+
+    Args:
+        profile (str): One of `LAUNCH_PROFILES`.
+
+    Returns:
+        list[str]: The flags, in a fresh list.
+
+    Raises:
+        ValueError: If the profile is unknown.
+    """
+    try:
+        return list(LAUNCH_PROFILES[profile])
+    except KeyError:
+        raise ValueError(
+            f"Unknown launch profile {profile!r}, expected one of "
+            f"{tuple(LAUNCH_PROFILES)}"
+        ) from None
+
+
+class LaunchScheduler:
+    """Limit how many browsers cold-start at the same time.
+
+    Starting every Chromium instance at once saturates CPU and disk and
+    makes each individual startup slower. Workers instead acquire a
+    launch slot around their browser startup; as soon as their browser
+    is ready the slot is released and the worker starts scraping while
+    the remaining browsers are still coming up.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None):
+        """Create the scheduler.
+
+        Args:
+            concurrency (Optional[int]): Maximum number of simultaneous
+                launches. None or 0 disables the limit.
+        """
+        self.concurrency = concurrency or None
+        self._semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+        self.waits: dict[int, float] = {}
+        self.startups: dict[int, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, worker_id: int) -> AsyncIterator[None]:
+        """Hold a launch slot for the duration of a browser startup.
+
+        The time spent waiting for the slot and the time spent inside
+        it are recorded for the worker and logged.
+
+        Args:
+            worker_id (int): The worker launching a browser.
+        """
+        t = Timer()
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        wait = t.lap()
+
+        try:
+            yield
+        finally:
+            startup = t.lap() - wait
+            if self._semaphore is not None:
+                self._semaphore.release()
+            self.waits[worker_id] = wait
+            self.startups[worker_id] = startup
+            logger.info(
+                "Worker %d launch finished (launch_wait=%.2fs, startup_time=%.2fs)",
+                worker_id,
+                wait,
+                startup,
+            )
+
+    def summary(self) -> dict:
+        """Return the launch latency statistics in seconds."""
+
+        if not self.startups:
+            return {"launched": 0}
+
+        startups = list(self.startups.values())
+        return {
+            "launched": len(startups),
+            "max_wait": round(max(self.waits.values()), 3),
+            "mean_startup": round(sum(startups) / len(startups), 3),
+            "max_startup": round(max(startups), 3),
+        }
+
+    def log_summary(self):
+        """Log the launch latency statistics."""
+
+        logger.info(
+            "Launch summary (concurrency=%s): %s",
+            self.concurrency or "unlimited",
+            self.summary(),
+        )
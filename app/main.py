@@ -1,15 +1,46 @@
 """Command-line interface entrypoint for the Facebook Ingestor application."""
 
+from __future__ import annotations
+
 import asyncio
+import json
 import logging
+import signal
+from typing import TYPE_CHECKING, Optional
 
 import click
 
-from app.observability import Observability
-from app.orchestrator import run_parallel
+from app.change_detection import ChangeDetectingSink
+from app.columnar import COLUMNAR_FORMATS, convert_directory
+from app.launch import LAUNCH_PROFILES
+from app.observability import LOG_FORMATS, Observability, get_logger
+from app.priority import UrlRequest, is_priority_file, read_requests
+from app.profiling import profile_run
+from app.reporting import log_merged_summary, write_summary
+from app.result_store import SQLiteResultStore
+from app.sharding import Shard, parse_shard, run_local_shards, select_shard
+from app.sinks import SINK_KINDS, ResultSink, build_sink
+from app.startup import get_profile, timed_import
+from app.utils import read_urls
+from app.work_queue import SQLiteWorkQueue
+
+if TYPE_CHECKING:
+    from app.orchestrator import RunConfig
+
+logger = get_logger(__name__)
 
+# Values of `RunConfig.navigation`, see `app.orchestrator.navigate_url`.
+NAVIGATION_MODES = ("full", "eager")
 
-async def run_async(urls: list[str], browsers: int):
+
+async def run_async(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    urls: list[str],
+    config: RunConfig,
+    queue: Optional[SQLiteWorkQueue] = None,
+    sink: Optional[ResultSink] = None,
+    report_file: Optional[str] = None,
+    requests: Optional[list[UrlRequest]] = None,
+):
     """Execute the asynchronous scraping workflow.
 
     This coroutine acts as a bridge between the synchronous Click
@@ -18,39 +49,478 @@ async def run_async(urls: list[str], browsers: int):
 
     Args:
         urls (list[str]): List of target URLs to scrape.
-        browsers (int): Number of parallel browser instances to launch.
+        config (RunConfig): Settings of the run.
+        queue (Optional[SQLiteWorkQueue]): Durable queue to drain instead
+            of `urls`.
+        sink (Optional[ResultSink]): Output backend for scraped payloads.
+        report_file (Optional[str]): Optional path where the final
+            summary is written as JSON.
+        requests (Optional[list[UrlRequest]]): Prioritized form of
+            `urls`, scheduled by priority class and deadline.
+    """
+    orchestrator = timed_import("app.orchestrator")
+    report = await orchestrator.run_parallel(urls, config, queue, sink, requests)
+
+    if report_file:
+        report.write_summary(report_file)
+
+
+def _run_config(**settings) -> RunConfig:
+    """Build the run settings, importing the browser stack on demand.
+
+    The orchestrator pulls in `nodriver`, which dominates import time, so
+    it is only loaded by commands that actually drive browsers.
+
+    Args:
+        **settings: `RunConfig` fields.
     """
-    await run_parallel(urls, browsers)
+    orchestrator = timed_import("app.orchestrator")
+    config: RunConfig = orchestrator.RunConfig(**settings)
+    return config
+
+
+def _write_startup_profile(path: str):
+    """Log the startup profile and write it as JSON to `path`."""
+    profile = get_profile()
+    profile.log_report()
+    profile.write(path)
+
+
+def _is_default(name: str) -> bool:
+    """Return whether the option `name` of the current command was left unset."""
+
+    source = click.get_current_context().get_parameter_source(name)
+    return source in (None, click.core.ParameterSource.DEFAULT)
+
+
+def _read_input(urls_file: str) -> tuple[list[str], Optional[list[UrlRequest]]]:
+    """Read the input URLs, with their priorities for TSV / JSONL files."""
+    if not is_priority_file(urls_file):
+        return read_urls(urls_file), None
+
+    try:
+        requests = read_requests(urls_file)
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+    return [request.url for request in requests], requests
+
+
+def _parse_shard_option(_ctx, _param, value: Optional[str]) -> Optional[Shard]:
+    """Click callback converting `--shard` into a `Shard`."""
+    if value is None:
+        return None
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+def _parse_browsers_option(_ctx, _param, value: str) -> int:
+    """Click callback converting `--browsers` into a count, 0 for `auto`."""
+    if value == "auto":
+        return 0
+    try:
+        browsers = int(value)
+    except ValueError:
+        browsers = 0
+    if browsers < 1:
+        raise click.BadParameter(f"{value!r} is neither a positive count nor 'auto'.")
+    return browsers
+
+
+def _build_sink(
+    kind: str,
+    db_path: Optional[str],
+    columnar_path: Optional[str],
+    hash_index: Optional[str],
+    changes_file: Optional[str],
+) -> ResultSink:
+    """Create the output sink, turning missing optional packages into CLI errors."""
+    try:
+        sink = build_sink(
+            kind, db_path=db_path or "", columnar_path=columnar_path or ""
+        )
+    except RuntimeError as e:
+        raise click.ClickException(str(e)) from e
+
+    if hash_index:
+        return ChangeDetectingSink(sink, hash_index, changes_file)
+    return sink
+
+
+# Options set by the local launcher itself for every shard process.
+_LAUNCHER_OPTIONS = frozenset(
+    {
+        "urls_file",
+        "browsers",
+        "shard",
+        "processes",
+        "profile_namespace",
+        "report_file",
+        "startup_profile",
+    }
+)
+
+
+def _forward_args(ctx: click.Context, exclude: frozenset) -> list[str]:
+    """Rebuild the non-default options of `ctx` as command-line arguments.
+
+    Used to pass the user's settings through to child processes.
+    """
+    args: list[str] = []
+    for param in ctx.command.params:
+        if not isinstance(param, click.Option) or param.name in exclude:
+            continue
+        value = ctx.params.get(param.name or "")
+        if value is None or value == param.default:
+            continue
+        if param.is_flag and param.secondary_opts:
+            args.append(param.opts[0] if value else param.secondary_opts[0])
+        elif param.is_flag:
+            args.append(param.opts[0])
+        else:
+            args += [param.opts[0], str(value)]
+    return args
+
+
+class DefaultCommandGroup(click.Group):
+    """Click group falling back to a default command.
+
+    Keeps `python -m app.main -f urls.txt` working while also exposing
+    subcommands such as `enqueue`.
+    """
+
+    default_command = "run"
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if not args or (
+            args[0] not in self.commands and args[0] not in ctx.help_option_names
+        ):
+            args = [self.default_command, *args]
+        rest: list[str] = super().parse_args(ctx, args)
+        return rest
+
+
+@click.group(
+    cls=DefaultCommandGroup,
+    context_settings={"help_option_names": ["-h", "--help"]},
+)
+def cli():
+    """Facebook Ingestor command-line interface.
+
+    Without a subcommand, the arguments are passed to `run`.
+    """
+
+
+def _sink_options(func):
+    """Attach the output sink options shared by `run` and `serve`."""
+    options = [
+        click.option(
+            "--sink",
+            "sink_kind",
+            type=click.Choice(SINK_KINDS),
+            default="json",
+            show_default=True,
+            help="Output backend for scraped payloads.",
+        ),
+        click.option(
+            "--db-path",
+            type=click.Path(dir_okay=False),
+            default=None,
+            help="SQLite result database (default: data/results.sqlite).",
+        ),
+        click.option(
+            "--columnar-path",
+            type=click.Path(dir_okay=False),
+            default=None,
+            help="Output file for parquet/arrow sinks (default: data/results.<sink>).",
+        ),
+        click.option(
+            "--hash-index",
+            type=click.Path(dir_okay=False),
+            default=None,
+            help="Skip writing pages whose payload hash matches this index.",
+        ),
+        click.option(
+            "--changes-file",
+            type=click.Path(dir_okay=False),
+            default=None,
+            help="Append a field-level diff per changed page (needs --hash-index).",
+        ),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
 
+def _worker_options(func):
+    """Attach the browser worker options shared by `run` and `serve`."""
+    options = [
+        click.option(
+            "--launch-concurrency",
+            default=4,
+            show_default=True,
+            type=click.IntRange(min=0),
+            help="Browsers allowed to start at the same time (0 for no limit).",
+        ),
+        click.option(
+            "--launch-profile",
+            type=click.Choice(tuple(LAUNCH_PROFILES)),
+            default="default",
+            show_default=True,
+            help="Chromium flag set trading memory per browser against speed.",
+        ),
+        click.option(
+            "--contexts-per-browser",
+            type=click.IntRange(min=1),
+            default=1,
+            show_default=True,
+            help="Workers sharing one browser, each in an isolated browser context.",
+        ),
+        click.option(
+            "--prefetch-depth",
+            type=click.IntRange(min=0),
+            default=0,
+            show_default=True,
+            help="Pages each worker loads in extra tabs while extracting the "
+            "current one.",
+        ),
+        click.option(
+            "--heartbeat-interval",
+            type=click.FloatRange(min=0),
+            default=10.0,
+            show_default=True,
+            help="Seconds between browser health checks by the watchdog; 0 "
+            "disables it.",
+        ),
+        click.option(
+            "--page-timeout",
+            type=click.FloatRange(min=0),
+            default=120.0,
+            show_default=True,
+            help="Seconds a page may take before its browser is replaced; 0 disables.",
+        ),
+        click.option(
+            "--headroom",
+            type=click.FloatRange(min=0, max=0.9),
+            default=0.2,
+            show_default=True,
+            help="Share of the CPUs and memory left unused by --browsers auto.",
+        ),
+        click.option(
+            "--navigation",
+            type=click.Choice(NAVIGATION_MODES),
+            default="full",
+            show_default=True,
+            help="Wait for full page loads, or extract as soon as the data is present.",
+        ),
+        click.option(
+            "--extraction",
+            type=click.Choice(["js", "network"]),
+            default="js",
+            show_default=True,
+            help="Extract in the page, or from captured network responses.",
+        ),
+        click.option(
+            "--extraction-workers",
+            type=click.IntRange(min=0),
+            default=2,
+            show_default=True,
+            help="Processes parsing captured responses (0 parses inline).",
+        ),
+        click.option(
+            "--archive-dir",
+            type=click.Path(file_okay=False),
+            default=None,
+            help="Also archive each page's raw data here, for `reextract`.",
+        ),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
 
-@click.command(context_settings={"help_option_names": ["-h", "--help"]})
+
+def _log_options(func):
+    """Attach the logging options shared by `run` and `serve`."""
+    options = [
+        click.option(
+            "--log-resources/--no-log-resources",
+            default=True,
+            show_default=True,
+            help="Enable or disable hardware resource logging.",
+        ),
+        click.option(
+            "--log-format",
+            type=click.Choice(LOG_FORMATS),
+            default="text",
+            show_default=True,
+            help="Plain text log lines or one JSON object per line.",
+        ),
+        click.option(
+            "--log-rate",
+            type=click.FloatRange(min=0),
+            default=2.0,
+            show_default=True,
+            help="INFO records per second per call site before dropping (0: off).",
+        ),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+def _profile_options(func):
+    """Attach the profiling options shared by `run` and `serve`."""
+    options = [
+        click.option(
+            "--profile",
+            "profile_dir",
+            type=click.Path(file_okay=False),
+            default=None,
+            help="Profile the run and write stats, traces and hotspots here.",
+        ),
+        click.option(
+            "--trace-rate",
+            type=click.FloatRange(min=0, max=1),
+            default=0.05,
+            show_default=True,
+            help="Fraction of pages traced in the browser with --profile.",
+        ),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+@cli.command()
 @click.option(
     "--browsers",
     "-b",
-    default=10,
+    default="10",
     show_default=True,
-    type=int,
-    help="Number of parallel browser instances to launch.",
+    metavar="N|auto",
+    callback=_parse_browsers_option,
+    help="Number of parallel browser instances to launch, or `auto` to plan "
+    "it from the CPUs and memory of the host.",
 )
 @click.option(
     "--urls-file",
     "-f",
     type=click.Path(exists=True, dir_okay=False),
-    required=True,
-    help="Path to a text file containing one URL per line.",
+    default=None,
+    help="File with one URL per line, or a .tsv / .jsonl file with priorities.",
+)
+@_worker_options
+@click.option(
+    "--calibration-pages",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Pages measured by --browsers auto before the remaining browsers start.",
 )
+@_log_options
+@_profile_options
 @click.option(
-    "--log-resources/--no-log-resources",
-    default=True,
+    "--shard",
+    callback=_parse_shard_option,
+    default=None,
+    help="Only process shard i of n (zero-based), e.g. 0/4.",
+)
+@click.option(
+    "--processes",
+    "-p",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of local orchestrator processes, one shard each.",
+)
+@click.option(
+    "--profile-namespace",
+    default=None,
+    help="Prefix for browser profile directories of this process.",
+)
+@click.option(
+    "--report-file",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write the final summary as JSON to this file.",
+)
+@click.option(
+    "--queue",
+    "queue_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Drain URLs from this durable SQLite queue instead of a file.",
+)
+@click.option(
+    "--visibility-timeout",
+    default=300.0,
     show_default=True,
-    help="Enable or disable hardware resource logging.",
+    type=click.FloatRange(min=1),
+    help="Seconds a leased queue job stays hidden from other consumers.",
 )
-def cli(browsers: int, urls_file: str, log_resources: bool):
+@click.option(
+    "--max-attempts",
+    default=3,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Deliveries of a queue job before it is marked dead.",
+)
+@click.option(
+    "--retry-delay",
+    default=0.0,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Seconds a failed queue job waits before it is delivered again.",
+)
+@_sink_options
+@click.option(
+    "--startup-profile",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write deferred import times and first-page milestones as JSON.",
+)
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def run(  # pylint: disable=too-many-locals,too-many-branches
+    browsers: int,
+    urls_file: Optional[str],
+    launch_concurrency: int,
+    launch_profile: str,
+    contexts_per_browser: int,
+    prefetch_depth: int,
+    heartbeat_interval: float,
+    page_timeout: float,
+    headroom: float,
+    calibration_pages: int,
+    navigation: str,
+    extraction: str,
+    extraction_workers: int,
+    archive_dir: Optional[str],
+    log_resources: bool,
+    log_format: str,
+    log_rate: float,
+    profile_dir: Optional[str],
+    trace_rate: float,
+    shard: Optional[Shard],
+    processes: int,
+    profile_namespace: Optional[str],
+    report_file: Optional[str],
+    queue_path: Optional[str],
+    visibility_timeout: float,
+    max_attempts: int,
+    retry_delay: float,
+    sink_kind: str,
+    db_path: Optional[str],
+    columnar_path: Optional[str],
+    hash_index: Optional[str],
+    changes_file: Optional[str],
+    startup_profile: Optional[str],
+):
     """Run the Facebook scraper using a Click-based CLI.
 
     This command initializes application-wide logging, loads target URLs
-    from a file, and starts the asynchronous scraping workflow using the
-    specified level of parallelism.
+    from a file or a durable queue, and starts the asynchronous scraping
+    workflow using the specified level of parallelism.
 
     The command is designed for production and batch execution
     environments.
@@ -59,15 +529,459 @@ def cli(browsers: int, urls_file: str, log_resources: bool):
     Observability.setup(
         level=logging.INFO,
         enable_resource_logging=log_resources,
+        log_format=log_format,
+        log_rate=log_rate,
     )
 
-    with open(urls_file, "r", encoding="utf-8") as f:
-        urls = [line.strip() for line in f if line.strip()]
+    if startup_profile:
+        click.get_current_context().call_on_close(
+            lambda: _write_startup_profile(startup_profile)
+        )
+
+    if not browsers and processes > 1:
+        raise click.UsageError(
+            "--browsers auto plans a single process; use --processes 1 or a "
+            "fixed number of browsers."
+        )
+
+    if profile_dir:
+        if processes > 1:
+            raise click.UsageError(
+                "--profile covers a single process; use --shard instead of "
+                "--processes."
+            )
+        click.get_current_context().with_resource(profile_run(profile_dir))
+
+    if changes_file and not hash_index:
+        raise click.UsageError("--changes-file requires --hash-index.")
+
+    if (urls_file is None) == (queue_path is None):
+        raise click.UsageError("Exactly one of --urls-file or --queue is required.")
+
+    if queue_path is not None:
+        if shard is not None or processes > 1:
+            raise click.UsageError(
+                "--queue balances work dynamically and cannot be combined "
+                "with --shard or --processes."
+            )
+
+        sink = _build_sink(sink_kind, db_path, columnar_path, hash_index, changes_file)
+        config = _run_config(
+            browsers=browsers,
+            profile_namespace=profile_namespace,
+            launch_concurrency=launch_concurrency,
+            launch_profile=launch_profile,
+            contexts_per_browser=contexts_per_browser,
+            prefetch_depth=prefetch_depth,
+            plan_prefetch=_is_default("prefetch_depth"),
+            heartbeat_interval=heartbeat_interval,
+            page_timeout=page_timeout,
+            headroom=headroom,
+            calibration_pages=calibration_pages,
+            navigation=navigation,
+            extraction=extraction,
+            extraction_workers=extraction_workers,
+            archive_dir=archive_dir,
+            profile_dir=profile_dir,
+            trace_rate=trace_rate,
+        )
+        queue = SQLiteWorkQueue(
+            queue_path,
+            visibility_timeout=visibility_timeout,
+            max_attempts=max_attempts,
+            retry_delay=retry_delay,
+        )
+        try:
+            asyncio.run(run_async([], config, queue, sink, report_file))
+        finally:
+            queue.close()
+        return
+
+    assert urls_file is not None  # nosec B101
+
+    if processes > 1:
+        if shard is not None:
+            raise click.UsageError("--shard cannot be combined with --processes.")
+        if sink_kind in COLUMNAR_FORMATS:
+            raise click.UsageError(
+                f"--sink {sink_kind} writes a single file and cannot be shared "
+                "by several --processes."
+            )
+
+        extra_args = _forward_args(click.get_current_context(), _LAUNCHER_OPTIONS)
+        summary = run_local_shards(urls_file, processes, browsers, extra_args)
+
+        log_merged_summary(summary)
+        if report_file:
+            write_summary(summary, report_file)
+        if summary.get("failed_shards"):
+            raise click.ClickException(
+                f"Shard processes failed: {', '.join(summary['failed_shards'])}"
+            )
+        return
+
+    urls, requests = _read_input(urls_file)
 
     if not urls:
         raise click.ClickException("No valid URLs found in the provided file.")
 
-    asyncio.run(run_async(urls, browsers))
+    if shard is not None:
+        urls = select_shard(urls, shard)
+        logger.info("Shard %s owns %d URLs", shard, len(urls))
+        if requests is not None:
+            owned = set(urls)
+            requests = [request for request in requests if request.url in owned]
+
+    sink = _build_sink(sink_kind, db_path, columnar_path, hash_index, changes_file)
+    config = _run_config(
+        browsers=browsers,
+        profile_namespace=profile_namespace,
+        launch_concurrency=launch_concurrency,
+        launch_profile=launch_profile,
+        contexts_per_browser=contexts_per_browser,
+        prefetch_depth=prefetch_depth,
+        plan_prefetch=_is_default("prefetch_depth"),
+        heartbeat_interval=heartbeat_interval,
+        page_timeout=page_timeout,
+        headroom=headroom,
+        calibration_pages=calibration_pages,
+        navigation=navigation,
+        extraction=extraction,
+        extraction_workers=extraction_workers,
+        archive_dir=archive_dir,
+        profile_dir=profile_dir,
+        trace_rate=trace_rate,
+    )
+
+    asyncio.run(
+        run_async(urls, config, sink=sink, report_file=report_file, requests=requests)
+    )
+
+
+async def _serve_async(
+    pool_args: dict,
+    spool_dir: Optional[str],
+    host: str,
+    port: Optional[int],
+):
+    """Run the daemon until SIGINT or SIGTERM, then shut it down cleanly."""
+    daemon = timed_import("app.daemon")
+    pool = daemon.WarmPool(**pool_args)
+
+    task = asyncio.current_task()
+    assert task is not None  # nosec B101
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+
+    try:
+        await daemon.serve(pool, spool_dir, host, port)
+    except asyncio.CancelledError:
+        logger.info("Serve mode stopped")
+
+
+@cli.command()
+@click.option(
+    "--browsers",
+    "-b",
+    default="10",
+    show_default=True,
+    metavar="N|auto",
+    callback=_parse_browsers_option,
+    help="Maximum number of warm browser workers, or `auto` to plan it from "
+    "the CPUs and memory of the host.",
+)
+@_worker_options
+@click.option(
+    "--idle-timeout",
+    default=300.0,
+    show_default=True,
+    type=click.FloatRange(min=1),
+    help="Seconds without work after which a browser is stopped.",
+)
+@click.option(
+    "--spool-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Watch this directory for *.txt URL batch files.",
+)
+@click.option(
+    "--port",
+    type=click.IntRange(min=1, max=65535),
+    default=None,
+    help="Accept batches via HTTP POST /batches on this port.",
+)
+@click.option(
+    "--host",
+    default="127.0.0.1",
+    show_default=True,
+    help="Interface the HTTP endpoint binds to.",
+)
+@click.option(
+    "--profile-namespace",
+    default="serve",
+    show_default=True,
+    help="Prefix for browser profile directories of the pool.",
+)
+@_log_options
+@_profile_options
+@_sink_options
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def serve(  # pylint: disable=too-many-locals
+    browsers: int,
+    launch_concurrency: int,
+    launch_profile: str,
+    contexts_per_browser: int,
+    prefetch_depth: int,
+    heartbeat_interval: float,
+    page_timeout: float,
+    headroom: float,
+    navigation: str,
+    extraction: str,
+    extraction_workers: int,
+    archive_dir: Optional[str],
+    idle_timeout: float,
+    spool_dir: Optional[str],
+    port: Optional[int],
+    host: str,
+    profile_namespace: str,
+    log_resources: bool,
+    log_format: str,
+    log_rate: float,
+    profile_dir: Optional[str],
+    trace_rate: float,
+    sink_kind: str,
+    db_path: Optional[str],
+    columnar_path: Optional[str],
+    hash_index: Optional[str],
+    changes_file: Optional[str],
+):
+    """Keep a warm browser pool running and scrape batches as they arrive.
+
+    Batches are submitted as `*.txt` files dropped into `--spool-dir`
+    and/or as `POST /batches` requests on the local `--port`. Browsers
+    stay up between batches and are only stopped after `--idle-timeout`
+    seconds without work, so small frequent batches skip the browser
+    startup entirely.
+    """
+
+    Observability.setup(
+        level=logging.INFO,
+        enable_resource_logging=log_resources,
+        log_format=log_format,
+        log_rate=log_rate,
+    )
+
+    if spool_dir is None and port is None:
+        raise click.UsageError("At least one of --spool-dir or --port is required.")
+    if changes_file and not hash_index:
+        raise click.UsageError("--changes-file requires --hash-index.")
+    if profile_dir:
+        click.get_current_context().with_resource(profile_run(profile_dir))
+    if not browsers:
+        plan = timed_import("app.capacity").plan_pool(
+            headroom,
+            contexts_per_browser,
+            None if _is_default("prefetch_depth") else prefetch_depth + 1,
+        )
+        browsers, prefetch_depth = plan.browsers, plan.tabs - 1
+
+    pool_args = {
+        "config": _run_config(
+            browsers=browsers,
+            profile_namespace=profile_namespace,
+            launch_concurrency=launch_concurrency,
+            launch_profile=launch_profile,
+            contexts_per_browser=contexts_per_browser,
+            prefetch_depth=prefetch_depth,
+            heartbeat_interval=heartbeat_interval,
+            page_timeout=page_timeout,
+            headroom=headroom,
+            navigation=navigation,
+            extraction=extraction,
+            extraction_workers=extraction_workers,
+            archive_dir=archive_dir,
+            profile_dir=profile_dir,
+            trace_rate=trace_rate,
+        ),
+        "sink": _build_sink(
+            sink_kind, db_path, columnar_path, hash_index, changes_file
+        ),
+        "idle_timeout": idle_timeout,
+    }
+    asyncio.run(_serve_async(pool_args, spool_dir, host, port))
+
+
+@cli.command()
+@click.option(
+    "--queue",
+    "queue_path",
+    type=click.Path(dir_okay=False),
+    required=True,
+    help="Path to the durable SQLite queue, created if missing.",
+)
+@click.option(
+    "--urls-file",
+    "-f",
+    type=click.Path(exists=True, dir_okay=False),
+    required=True,
+    help="Path to a text file containing one URL per line.",
+)
+def enqueue(queue_path: str, urls_file: str):
+    """Bulk-load URLs from a file into a durable work queue.
+
+    URLs already present in the queue are skipped, so the command can be
+    re-run safely.
+    """
+
+    urls, _ = _read_input(urls_file)
+    queue = SQLiteWorkQueue(queue_path)
+    try:
+        added = queue.enqueue_many(urls)
+        counts = queue.counts()
+    finally:
+        queue.close()
+
+    click.echo(f"Enqueued {added} of {len(urls)} URLs; queue state: {counts}")
+
+
+@cli.command()
+@click.option(
+    "--db-path",
+    type=click.Path(exists=True, dir_okay=False),
+    default="data/results.sqlite",
+    show_default=True,
+    help="SQLite result database to read from.",
+)
+@click.option(
+    "--since",
+    type=float,
+    default=0.0,
+    show_default=True,
+    help="Only export pages scraped at or after this Unix timestamp.",
+)
+def export(db_path: str, since: float):
+    """Export stored pages as JSON Lines on standard output.
+
+    Combined with `--since`, this provides incremental exports without
+    scanning the output directory.
+    """
+
+    store = SQLiteResultStore(db_path)
+    try:
+        for key, scraped_at, payload in store.iter_since(since):
+            click.echo(
+                json.dumps(
+                    {"page_key": key, "scraped_at": scraped_at, "payload": payload},
+                    ensure_ascii=False,
+                )
+            )
+    finally:
+        store.shutdown()
+
+
+@cli.command()
+@click.option(
+    "--data-dir",
+    type=click.Path(exists=True, file_okay=False),
+    default="data",
+    show_default=True,
+    help="Directory containing per-page JSON files.",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False),
+    required=True,
+    help="Destination Parquet or Arrow file.",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(COLUMNAR_FORMATS),
+    default="parquet",
+    show_default=True,
+    help="Columnar file format.",
+)
+@click.option(
+    "--batch-rows",
+    type=click.IntRange(min=1),
+    default=10_000,
+    show_default=True,
+    help="Rows buffered in memory before a batch is written.",
+)
+def convert(data_dir: str, output: str, fmt: str, batch_rows: int):
+    """Convert an existing directory of JSON pages into a columnar file."""
+
+    try:
+        rows = convert_directory(data_dir, output, fmt, batch_rows)
+    except RuntimeError as e:
+        raise click.ClickException(str(e)) from e
+
+    click.echo(f"Wrote {rows} rows to {output}")
+
+
+@cli.command()
+@click.option(
+    "--archive-dir",
+    type=click.Path(exists=True, file_okay=False),
+    required=True,
+    help="Capture archive written by `run --archive-dir`.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Extraction processes (0: one per core).",
+)
+@click.option(
+    "--all-captures",
+    is_flag=True,
+    default=False,
+    help="Replay every capture instead of the latest one per page.",
+)
+@click.option(
+    "--report-file",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write the final summary as JSON to this file.",
+)
+@_sink_options
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def reextract(
+    archive_dir: str,
+    workers: int,
+    all_captures: bool,
+    report_file: Optional[str],
+    sink_kind: str,
+    db_path: Optional[str],
+    columnar_path: Optional[str],
+    hash_index: Optional[str],
+    changes_file: Optional[str],
+):
+    """Extract the archived captures again, without any browser.
+
+    Useful after a change of the extraction logic: the raw data archived
+    during earlier runs is parsed by a pool of processes and written to
+    the chosen sink as if the pages had just been scraped.
+    """
+
+    Observability.setup(level=logging.INFO, enable_resource_logging=False)
+
+    if changes_file and not hash_index:
+        raise click.UsageError("--changes-file requires --hash-index.")
+
+    sink = _build_sink(sink_kind, db_path, columnar_path, hash_index, changes_file)
+    archive_module = timed_import("app.archive")
+    archive = archive_module.CaptureArchive(archive_dir)
+    try:
+        report = asyncio.run(
+            archive_module.reextract(archive, sink, workers, not all_captures)
+        )
+    finally:
+        archive.close()
+
+    if report_file:
+        report.write_summary(report_file)
 
 
 # pylint: disable=no-value-for-parameter
@@ -0,0 +1,162 @@
+"""Eager navigation and per-page cost measurement."""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, Generator
+
+from nodriver import Tab, cdp
+
+from app.observability import get_logger
+from app.performance import Timer
+
+logger = get_logger(__name__)
+
+# Flags the current document so that the probe ignores it until the
+# navigation has replaced it.
+_MARK_STALE_JS = "window.__ingestorStale = true"
+
+# True as soon as the new document holds the embedded About blob.
+_BLOB_PROBE_JS = r"""
+(() => !window.__ingestorStale && Array.from(
+  document.querySelectorAll('script[type="application/json"]')
+).some(s => s.textContent.includes("about_app_sections")))()
+"""
+
+
+@dataclass(frozen=True)
+class PageCost:
+    """Resources consumed by the renderer for one page."""
+
+    cpu_seconds: float
+    bytes_received: int
+    cdp_messages: int = 0
+    cdp_bytes: int = 0
+
+
+class PageMeter:
+    """Measure renderer CPU time, network bytes and CDP traffic per page.
+
+    CPU time is the `TaskDuration` performance metric collected in
+    thread ticks, i.e. main-thread CPU time rather than wall time.
+    Bytes are the encoded lengths of finished network requests.
+    Requests still in flight when a page is finished are counted
+    towards the next page, so both values are approximations.
+
+    CDP traffic counts the commands sent through the tab and their
+    responses, with their JSON-encoded sizes; protocol events and the
+    meter's own commands are not included.
+    """
+
+    def __init__(self, tab: Tab):
+        """Attach the meter to a tab; call `enable` before use."""
+
+        self.tab = tab
+        self._bytes = 0
+        self._cpu_start = 0.0
+        self._cdp_messages = 0
+        self._cdp_bytes = 0
+
+    async def enable(self):
+        """Enable the performance metrics and the network and CDP counters."""
+
+        await self.tab.send(cdp.performance.enable(time_domain="threadTicks"))
+        self.tab.add_handler(cdp.network.LoadingFinished, self._on_loading_finished)
+
+        send = self.tab.send
+
+        async def metered_send(cdp_obj, _is_update=False):
+            return await send(self._metered(cdp_obj), _is_update=_is_update)
+
+        self.tab.send = metered_send
+
+    def _metered(
+        self, cdp_obj: Generator[dict, Any, Any]
+    ) -> Generator[dict, dict, Any]:
+        """Wrap a CDP command generator to count its request and response."""
+
+        request = cdp_obj.send(None)
+        self._cdp_messages += 1
+        self._cdp_bytes += len(json.dumps(request))
+        response = yield request
+        self._cdp_messages += 1
+        self._cdp_bytes += len(json.dumps(response))
+        try:
+            cdp_obj.send(response)
+        except StopIteration as parsed:
+            return parsed.value
+        raise RuntimeError("CDP command yielded more than one request")
+
+    def _on_loading_finished(self, event: cdp.network.LoadingFinished):
+        self._bytes += int(event.encoded_data_length)
+
+    async def _cpu_time(self) -> float:
+        metrics = await self.tab.send(cdp.performance.get_metrics())
+        return next((m.value for m in metrics if m.name == "TaskDuration"), 0.0)
+
+    async def start(self):
+        """Start measuring a new page."""
+
+        self._bytes = 0
+        self._cpu_start = await self._cpu_time()
+        self._cdp_messages = self._cdp_bytes = 0
+
+    async def finish(self) -> PageCost:
+        """Return the cost of the page since `start`."""
+
+        messages, exchanged = self._cdp_messages, self._cdp_bytes
+        cpu = await self._cpu_time()
+        # A cross-site navigation moves the page to a fresh renderer whose
+        # counters start from zero.
+        elapsed = cpu - self._cpu_start if cpu >= self._cpu_start else cpu
+        return PageCost(
+            cpu_seconds=elapsed,
+            bytes_received=self._bytes,
+            cdp_messages=messages,
+            cdp_bytes=exchanged,
+        )
+
+
+async def start_navigation(tab: Tab, url: str):
+    """Send the navigation command without waiting for the page to load."""
+
+    await tab.evaluate(_MARK_STALE_JS)
+    await tab.send(cdp.page.navigate(url))
+
+
+async def navigate_eager(tab: Tab, url: str, timeout: float = 20, poll: float = 0.1):
+    """Navigate without waiting for the load event.
+
+    The navigation command is sent and the DOM is polled until the
+    About blob is present, at which point extraction can start while
+    secondary resources are still loading.
+
+    Args:
+        tab (Tab): The tab to navigate.
+        url (str): Target URL.
+        timeout (float): Maximum seconds to wait for the blob.
+        poll (float): Seconds between two probes.
+
+    Raises:
+        RuntimeError: If the blob does not appear within `timeout`.
+    """
+    t = Timer()
+    await start_navigation(tab, url)
+
+    while t.lap() < timeout:
+        try:
+            if await tab.evaluate(_BLOB_PROBE_JS, return_by_value=True) is True:
+                logger.info("About blob available after %.2fs", t.lap())
+                return
+        except Exception as e:
+            # The execution context is replaced while the navigation commits.
+            logger.debug("Blob probe failed during navigation: %s", e)
+        await asyncio.sleep(poll)
+
+    raise RuntimeError(f"about_app_sections not present after {timeout:.0f}s")
+
+
+async def stop_loading(tab: Tab):
+    """Stop all pending loads of the page to free renderer CPU and bandwidth."""
+
+    await tab.send(cdp.page.stop_loading())
@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+import atexit
+import importlib
+import json
 import logging
 import os
+import queue
+import time
 from dataclasses import dataclass
-from typing import Optional, Protocol
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional, Protocol
 
-import psutil
+LOG_FORMATS = ("text", "json")
+
+_TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
 
 
 class ProcessLike(Protocol):
@@ -27,6 +35,76 @@ class ObservabilityConfig:
     resource_logging_enabled: bool = True
 
 
+class RateLimitFilter(logging.Filter):
+    """Rate-limit records per call site with a token bucket.
+
+    Each logging call site may emit `burst` records at once and `rate`
+    records per second on average; records above that are dropped and
+    counted, and the next record let through from the site carries the
+    count in its `suppressed` attribute. Records above `max_level` are
+    never dropped.
+    """
+
+    def __init__(self, rate: float, burst: int = 20, max_level: int = logging.INFO):
+        """Create the filter.
+
+        Args:
+            rate (float): Records per second allowed per call site.
+            burst (int): Records a quiet call site may emit at once.
+            max_level (int): Highest level subject to the limit.
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.max_level = max_level
+        # Call site -> [tokens, last refill, records suppressed].
+        self._sites: dict[tuple[str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+
+        now = time.monotonic()
+        site = self._sites.setdefault(
+            (record.pathname, record.lineno), [float(self.burst), now, 0]
+        )
+        site[0] = min(self.burst, site[0] + (now - site[1]) * self.rate)
+        site[1] = now
+        if site[0] < 1:
+            site[2] += 1
+            return False
+
+        site[0] -= 1
+        if site[2]:
+            record.suppressed = site[2]
+            site[2] = 0
+        return True
+
+
+class TextFormatter(logging.Formatter):
+    """Plain text formatter noting how many similar records were dropped."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{text} [{suppressed} similar suppressed]" if suppressed else text
+
+
+class JsonFormatter(logging.Formatter):
+    """Format each record as a single-line JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if suppressed := getattr(record, "suppressed", 0):
+            data["suppressed"] = suppressed
+        return json.dumps(data, ensure_ascii=False)
+
+
 class Observability:
     """Observability and resource logging manager."""
 
@@ -35,9 +113,11 @@ class Observability:
         *,
         config: ObservabilityConfig,
         process: Optional[ProcessLike] = None,
+        listener: Optional[QueueListener] = None,
     ) -> None:
         self._config = config
         self._process = process
+        self._listener = listener
 
     @classmethod
     def setup(
@@ -45,29 +125,67 @@ class Observability:
         *,
         level: int = logging.INFO,
         enable_resource_logging: bool = True,
+        log_format: str = "text",
+        log_rate: float = 0,
     ) -> "Observability":
         """Configure logging and create an Observability instance.
 
-        Intended to be called once at application startup.
+        Intended to be called once at application startup. Records are
+        put on a queue by the logging calls and written to stderr by a
+        listener thread, so that log I/O never blocks the event loop.
+
+        Args:
+            level (int): Root logging level.
+            enable_resource_logging (bool): Whether `log_resources`
+                samples the process memory and CPU usage.
+            log_format (str): `text` or one JSON object per line (`json`).
+            log_rate (float): INFO records per second allowed per call
+                site before records are dropped; 0 disables the limit.
         """
-
-        logging.basicConfig(
-            level=level,
-            format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+        handler = logging.StreamHandler()
+        handler.setFormatter(
+            JsonFormatter() if log_format == "json" else TextFormatter(_TEXT_FORMAT)
+        )
+        queue_handler = QueueHandler(queue.SimpleQueue())
+        # Only merge the arguments here; the listener's handler formats.
+        queue_handler.setFormatter(logging.Formatter("%(message)s"))
+        if log_rate:
+            queue_handler.addFilter(RateLimitFilter(log_rate))
+
+        logging.basicConfig(level=level, handlers=[queue_handler])
+
+        # basicConfig leaves an already configured root logger alone.
+        listener = None
+        if queue_handler in logging.getLogger().handlers:
+            listener = QueueListener(
+                queue_handler.queue, handler, respect_handler_level=True
+            )
+            listener.start()
+
+        # psutil is only needed (and only imported) for resource logging.
+        process = (
+            _import_psutil().Process(os.getpid()) if enable_resource_logging else None
         )
-
-        process = psutil.Process(os.getpid())
 
         obs = cls(
             config=ObservabilityConfig(
                 resource_logging_enabled=enable_resource_logging
             ),
             process=process,
+            listener=listener,
         )
+        atexit.register(obs.close)
 
         _set_default_observability(obs)
         return obs
 
+    def close(self) -> None:
+        """Flush the queued records and stop the listener thread."""
+
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
     def get_logger(self, name: str) -> logging.Logger:
         """Return a module-scoped logger."""
         return logging.getLogger(name)
@@ -130,3 +248,8 @@ def log_resources(label: str = "") -> None:
         return
 
     _default_observability.log_resources(label)
+
+
+def _import_psutil() -> Any:
+    """Import `psutil` on first use to keep CLI startup fast."""
+    return importlib.import_module("psutil")
@@ -1,102 +1,720 @@
 """Parallel orchestration logic for browser-based scraping workers."""
 
 import asyncio
-from typing import List
+import contextlib
+import functools
+import os
+import socket
+from dataclasses import dataclass, field, replace
+from typing import Any, Awaitable, List, Optional
 
-from nodriver import start
+from nodriver import Browser, Tab, start
 
+from app.archive import CaptureArchive
 from app.browser_setup import (
     build_browser_config,
     enable_network_optimizations,
     set_mobile_emulation,
 )
-from app.cookies import fast_accept_cookies
+from app.capacity import (
+    CALIBRATION_BROWSERS,
+    CapacityPlan,
+    HostResources,
+    calibrate,
+    detect_resources,
+    plan_capacity,
+)
+from app.capture import ResponseCapture
+from app.contexts import BrowserHost
+from app.extraction import ExtractionPool
+from app.launch import LaunchScheduler
+from app.navigation import (
+    PageMeter,
+    navigate_eager,
+    start_navigation,
+    stop_loading,
+)
 from app.observability import get_logger, log_resources
 from app.performance import Timer
-from app.reporting import ScrapeReport
+from app.pipeline import PrefetchPipeline
+from app.priority import PriorityWorkSource, UrlRequest
+from app.reporting import ScrapeReport, current_worker, failure_class
 from app.scraper import scrape
-from app.utils import chunked, ensure_about
+from app.sinks import JsonFileSink, ResultSink
+from app.startup import mark
+from app.tracing import PageTracer
+from app.utils import ensure_about
+from app.watchdog import TrackedSource, Watchdog, kill_browser
+from app.work_queue import (
+    Lease,
+    ListWorkSource,
+    QueueWorkSource,
+    SQLiteWorkQueue,
+    WorkSource,
+)
 
 logger = get_logger(__name__)
 
 
-async def browser_worker(worker_id: int, urls: List[str], report: ScrapeReport):
-    """Run a single browser worker to scrape a subset of URLs.
+@dataclass(frozen=True)
+class RunConfig:  # pylint: disable=too-many-instance-attributes
+    """Runtime settings shared by all browser workers of a run."""
 
-    Each worker launches an isolated browser instance with its own
-    profile, applies standard network and mobile emulation settings,
-    and sequentially processes a list of URLs. Cookie handling is
-    performed once per worker to minimize overhead.
+    # 0 plans the number of browsers from the host, see `run_parallel`.
+    browsers: int = 10
+    profile_namespace: Optional[str] = None
+    launch_concurrency: int = 4
+    navigation: str = "full"
+    extraction: str = "js"
+    extraction_workers: int = 2
+    profile_dir: Optional[str] = None
+    trace_rate: float = 0.0
+    launch_profile: str = "default"
+    contexts_per_browser: int = 1
+    prefetch_depth: int = 0
+    # With `browsers` at 0, whether `prefetch_depth` is planned as well.
+    plan_prefetch: bool = True
+    archive_dir: Optional[str] = None
+    heartbeat_interval: float = 10.0
+    page_timeout: float = 120.0
+    headroom: float = 0.2
+    calibration_pages: int = 10
+
+
+@dataclass
+class _Lane:
+    """A tab of a worker with the per-tab instrumentation of its pages."""
+
+    tab: Tab
+    meter: PageMeter
+    capture: Optional[ResponseCapture]
+    tracer: Optional[PageTracer]
+    consent_done: bool = False
+    timer: Timer = field(default_factory=Timer)
+
+
+def _build_capture(
+    tab: Tab, config: RunConfig, extractor: Optional[ExtractionPool]
+) -> Optional[ResponseCapture]:
+    """Set up network-side extraction if the run asks for it."""
+    if config.extraction != "network":
+        return None
+
+    # Eager navigation relies on the capture alone to know when the page
+    # is ready; after a full load the responses are normally already in.
+    timeout = 20 if config.navigation == "eager" else 2
+    capture = ResponseCapture(tab, extractor or ExtractionPool(), timeout)
+    capture.enable()
+    return capture
+
+
+def _build_tracer(tab: Tab, config: RunConfig, worker_id: int) -> Optional[PageTracer]:
+    """Set up browser tracing of sampled pages if the run is profiled."""
+    if config.profile_dir is None or not config.trace_rate:
+        return None
+
+    tracer = PageTracer(tab, config.profile_dir, config.trace_rate, worker_id)
+    tracer.enable()
+    return tracer
+
+
+async def _finish_trace(tracer: PageTracer, url: str):
+    """Write the trace of the page just scraped, if it was sampled."""
+    try:
+        await tracer.finish(url)
+    except Exception as e:
+        logger.warning("Trace of %s lost: %s", url, e)
+
+
+async def _record_page_cost(meter: PageMeter, url: str, report: ScrapeReport):
+    """Log and report the renderer cost of the page just scraped."""
+    cost = await meter.finish()
+    await report.record_page_cost(
+        cost.cpu_seconds, cost.bytes_received, cost.cdp_messages, cost.cdp_bytes
+    )
+    logger.info(
+        "Page cost for %s: cpu=%.3fs, bytes=%d, cdp_messages=%d, cdp_bytes=%d",
+        url,
+        cost.cpu_seconds,
+        cost.bytes_received,
+        cost.cdp_messages,
+        cost.cdp_bytes,
+    )
+
+
+async def _after_save(step: Awaitable[Any], what: str, url: str):
+    """Await a step following the scrape of a page, logging its failure.
+
+    The page may already be saved: failing to clean up after it must
+    neither count it as failed nor have it scraped again.
+    """
+    try:
+        await step
+    except Exception as e:
+        logger.warning("Could not %s for %s: %s", what, url, e)
+
+
+async def navigate_url(
+    tab: Tab,
+    url: str,
+    config: RunConfig,
+    capture: Optional[ResponseCapture] = None,
+):
+    """Load a page until it is ready to be scraped.
+
+    In `full` mode the tab waits for the page to load and settle. In
+    `eager` mode it only waits for the About blob to be in the DOM, or
+    with a network capture for the navigation to be committed, leaving
+    the capture to deliver the payload.
 
     Args:
-        worker_id (int): Unique identifier for the worker, used for
-            logging and browser profile isolation.
-        urls (List[str]): List of URLs assigned to this worker.
+        tab (Tab): The worker's tab.
+        url (str): The page URL; normalized to its About section.
+        config (RunConfig): Settings of the run.
+        capture (Optional[ResponseCapture]): Network capture used for
+            extraction instead of in-page JavaScript.
     """
-    logger.info(
-        "Worker %d starting execution (assigned_urls=%d)",
-        worker_id,
-        len(urls),
+    url = ensure_about(url)
+
+    if capture is not None:
+        capture.start()
+
+    if config.navigation != "eager":
+        await tab.get(url)
+        await tab.wait(4)
+    elif capture is not None:
+        await start_navigation(tab, url)
+    else:
+        await navigate_eager(tab, url)
+    mark("first navigation")
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+async def extract_page(
+    tab: Tab,
+    report: ScrapeReport,
+    sink: ResultSink,
+    config: RunConfig,
+    consent: bool = False,
+    capture: Optional[ResponseCapture] = None,
+    archive: Optional[CaptureArchive] = None,
+):
+    """Scrape a page loaded by `navigate_url`.
+
+    In `eager` mode all pending loads are stopped once the page is
+    scraped.
+
+    Args:
+        tab (Tab): The worker's tab.
+        report (ScrapeReport): Shared report collecting the outcome.
+        sink (ResultSink): Output backend.
+        config (RunConfig): Settings of the run.
+        consent (bool): Whether to dismiss the cookie banner.
+        capture (Optional[ResponseCapture]): Network capture used for
+            extraction instead of in-page JavaScript.
+        archive (Optional[CaptureArchive]): Archive of the raw page data.
+    """
+    try:
+        await scrape(
+            tab,
+            report,
+            sink,
+            settle=0,
+            capture=capture,
+            dismiss_consent=consent,
+            archive=archive,
+        )
+    finally:
+        if config.navigation == "eager":
+            await _after_save(stop_loading(tab), "stop loading", tab.target.url)
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+async def _setup_lane(
+    tab: Tab,
+    config: RunConfig,
+    extractor: Optional[ExtractionPool],
+    worker_id: int,
+    traced: bool,
+) -> _Lane:
+    """Apply the emulation settings to a tab and attach its instrumentation."""
+    await enable_network_optimizations(tab)
+    await set_mobile_emulation(tab)
+    meter = PageMeter(tab)
+    await meter.enable()
+    capture = _build_capture(tab, config, extractor)
+    tracer = _build_tracer(tab, config, worker_id) if traced else None
+    return _Lane(tab, meter, capture, tracer)
+
+
+async def _navigate_lane(config: RunConfig, lane: _Lane, lease: Lease):
+    """Start measuring a leased page and load it in its lane."""
+    lane.timer = Timer()
+    await lane.meter.start()
+    if lane.tracer is not None:
+        await lane.tracer.start()
+    await navigate_url(lane.tab, lease.url, config, lane.capture)
+
+
+async def _release_tabs(
+    tabs: List[Tab], browser: Optional[Browser], host: Optional[BrowserHost]
+):
+    """Stop the worker's own browser, or close its contexts in the host."""
+    if host is not None:
+        for tab in tabs:
+            await host.close_tab(tab)
+    elif browser is not None:
+        browser.stop()
+
+
+async def _open_tabs(
+    count: int, browser: Optional[Browser], host: Optional[BrowserHost]
+) -> List[Tab]:
+    """Open the tabs of a worker in its own browser or in the host."""
+    tabs: List[Tab] = []
+    try:
+        for i in range(count):
+            if host is not None:
+                tabs.append(await host.open_tab())
+            else:
+                assert browser is not None  # nosec B101
+                tabs.append(await browser.get("about:blank", new_tab=i > 0))
+    except BaseException:
+        await _release_tabs(tabs, browser, host)
+        raise
+    return tabs
+
+
+def worker_host(
+    hosts: dict[int, BrowserHost],
+    worker_id: int,
+    config: RunConfig,
+    launcher: LaunchScheduler,
+) -> Optional[BrowserHost]:
+    """Return the shared browser of a worker, creating it on first use.
+
+    With `config.contexts_per_browser` above 1, consecutive worker ids
+    are grouped onto the same `BrowserHost`; otherwise every worker
+    launches its own browser and None is returned.
+
+    Args:
+        hosts (dict[int, BrowserHost]): Hosts of the run by host id,
+            updated in place.
+        worker_id (int): The worker, numbered from 1.
+        config (RunConfig): Settings of the run.
+        launcher (LaunchScheduler): Scheduler of the browser launches.
+    """
+    per_browser = config.contexts_per_browser
+    if per_browser <= 1:
+        return None
+
+    host_id = (worker_id - 1) // per_browser + 1
+    if host_id not in hosts:
+        namespace = config.profile_namespace
+        suffix = f"{namespace}-host{host_id}" if namespace else f"host{host_id}"
+        hosts[host_id] = BrowserHost(host_id, suffix, config.launch_profile, launcher)
+    return hosts[host_id]
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+async def _start_session(
+    worker_id: int,
+    config: RunConfig,
+    launcher: LaunchScheduler,
+    extractor: Optional[ExtractionPool],
+    host: Optional[BrowserHost],
+) -> tuple[Optional[Browser], List[Tab], List[_Lane]]:
+    """Launch the worker's browser, or join the host, and set up its lanes.
+
+    The browser startup runs inside a slot of the launch scheduler, so
+    only a bounded number of browsers cold-start at once.
+    """
+    namespace = config.profile_namespace
+    suffix = f"{namespace}-{worker_id}" if namespace else str(worker_id)
+    browser = None
+    lanes: List[_Lane] = []
+
+    slot = launcher.slot(worker_id) if host is None else contextlib.nullcontext()
+    async with slot:
+        if host is None:
+            browser = await start(build_browser_config(suffix, config.launch_profile))
+        tabs = await _open_tabs(config.prefetch_depth + 1, browser, host)
+        mark("first browser started")
+
+        try:
+            for i, tab in enumerate(tabs):
+                lanes.append(
+                    await _setup_lane(tab, config, extractor, worker_id, i == 0)
+                )
+        except BaseException:
+            await _release_tabs(tabs, browser, host)
+            raise
+
+    log_resources(f"worker {worker_id} after browser startup")
+    return browser, tabs, lanes
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+async def _drain(
+    worker_id: int,
+    lanes: List[_Lane],
+    source: TrackedSource,
+    report: ScrapeReport,
+    sink: ResultSink,
+    config: RunConfig,
+    archive: Optional[CaptureArchive],
+):
+    """Scrape the pages of a source in the lanes of one browser session."""
+    pipeline = PrefetchPipeline(
+        lanes,
+        functools.partial(_navigate_lane, config),
+        report if config.prefetch_depth else None,
     )
 
-    config = build_browser_config(str(worker_id))
-    t = Timer()
-    browser = await start(config)
+    async with contextlib.aclosing(pipeline.pages(source)) as pages:
+        async for page in pages:
+            lane, lease = page.lane, page.lease
+            try:
+                # The page may have waited for its turn after loading.
+                await source.extend(lease)
+                if page.error is not None:
+                    raise page.error
+                await extract_page(
+                    lane.tab,
+                    report,
+                    sink,
+                    config,
+                    not lane.consent_done,
+                    lane.capture,
+                    archive,
+                )
+                lane.consent_done = True
+                mark("first page scraped")
+            except Exception as e:
+                logger.warning(
+                    "Worker %d failed on %s (attempt %d): %s",
+                    worker_id,
+                    lease.url,
+                    lease.attempts,
+                    e,
+                )
+                if not await source.nack(lease, str(e)):
+                    await report.record_failed(failure_class(e))
+            else:
+                await source.ack(lease)
+                await _after_save(
+                    _record_page_cost(lane.meter, lease.url, report),
+                    "record the page cost",
+                    lease.url,
+                )
+            await report.record_page_time(lane.timer.lap())
+            if lane.tracer is not None:
+                await _finish_trace(lane.tracer, lease.url)
 
-    logger.info(
-        "Browser instance started for worker %d (startup_time=%.2fs)",
+            if source.completed % 10 == 0:
+                log_resources(
+                    f"worker {worker_id} after processing {source.completed} urls"
+                )
+
+
+async def _discard_browser(browser: Browser, host: Optional[BrowserHost]):
+    """Kill a dead or hung browser, through its host if it is shared."""
+    if host is not None:
+        await host.discard(browser)
+    else:
+        kill_browser(browser)
+
+
+async def _recover(
+    worker_id: int, kind: str, source: TrackedSource, report: ScrapeReport
+):
+    """Requeue the URLs a worker held when its browser failed."""
+    requeued, exhausted = source.requeue()
+    for lease in exhausted:
+        if not await source.nack(lease, kind):
+            await report.record_failed(kind)
+    await report.record_incident(kind, requeued, len(exhausted))
+    logger.warning(
+        "Worker %d recovering from %s: %d urls requeued, %d given up",
         worker_id,
-        t.lap(),
+        kind,
+        requeued,
+        len(exhausted),
     )
-    log_resources(f"worker {worker_id} after browser startup")
 
-    tab = await browser.get("about:blank")
-    await enable_network_optimizations(tab)
-    await set_mobile_emulation(tab)
 
-    cookie_done = False
+# pylint: disable-next=too-many-arguments,too-many-locals
+async def browser_worker(
+    worker_id: int,
+    source: WorkSource,
+    report: ScrapeReport,
+    sink: ResultSink,
+    config: RunConfig,
+    *,
+    launcher: Optional[LaunchScheduler] = None,
+    extractor: Optional[ExtractionPool] = None,
+    host: Optional[BrowserHost] = None,
+    archive: Optional[CaptureArchive] = None,
+):
+    """Run a single browser worker draining a work source.
+
+    Each worker launches an isolated browser instance with its own
+    profile, or opens an isolated browser context in a `host` browser
+    shared with other workers. It applies standard network and mobile
+    emulation settings to its tab and sequentially processes the URLs
+    leased from its work source. Cookie handling is performed once per
+    tab to minimize overhead.
+
+    With `config.prefetch_depth` above 0 the worker opens that many
+    extra tabs, in its own browser or as extra contexts of the host, and
+    a `PrefetchPipeline` navigates the next pages in them while the
+    current page is extracted and written.
 
-    for i, url in enumerate(urls, start=1):
-        await tab.get(ensure_about(url))
+    The browser startup runs inside a slot of the launch scheduler, so
+    only a bounded number of browsers cold-start at once; the worker
+    starts scraping as soon as its own browser is ready.
 
-        if not cookie_done:
-            await fast_accept_cookies(tab)
-            cookie_done = True
+    A URL is acknowledged once it has been scraped; a URL whose
+    navigation or extraction raises is given back to the source, which
+    decides whether it is retried.
+
+    A `Watchdog` heartbeats the browser every `config.heartbeat_interval`
+    seconds and bounds each page to `config.page_timeout` seconds. When
+    the browser dies or hangs, it is killed and launched again with the
+    same settings, and the URLs in flight are requeued.
+
+    Args:
+        worker_id (int): Unique identifier for the worker, used for
+            logging and browser profile isolation.
+        source (WorkSource): Source of the URLs assigned to this worker.
+        report (ScrapeReport): Shared report collecting the outcomes.
+        sink (ResultSink): Output backend shared by all workers.
+        config (RunConfig): Settings of the run; its profile namespace
+            keeps the profiles of concurrent processes apart.
+        launcher (Optional[LaunchScheduler]): Scheduler shared by the
+            workers of the run; launches are unthrottled without one.
+        extractor (Optional[ExtractionPool]): Pool parsing captured
+            responses when `config.extraction` is `network`; bodies are
+            parsed inline without one.
+        host (Optional[BrowserHost]): Browser shared with other workers;
+            its launch is scheduled by the host itself.
+        archive (Optional[CaptureArchive]): Archive receiving the raw
+            data of every page, shared by the workers of the run.
+    """
+    logger.info("Worker %d starting execution", worker_id)
 
-        await scrape(tab, report)
+    launcher = launcher or LaunchScheduler()
+    tracked = TrackedSource(source)
+    watchdog = Watchdog(tracked, config.heartbeat_interval, config.page_timeout)
+    current_worker.set(worker_id)
 
-        if i % 10 == 0:
-            log_resources(f"worker {worker_id} after processing {i} urls")
+    while True:
+        browser, tabs, lanes = await _start_session(
+            worker_id, config, launcher, extractor, host
+        )
+        watched = lanes[0].tab.browser
+        try:
+            incident = await watchdog.supervise(
+                _drain(worker_id, lanes, tracked, report, sink, config, archive),
+                watched,
+                functools.partial(_discard_browser, watched, host),
+            )
+        finally:
+            await _release_tabs(tabs, browser, host)
+        if incident is None:
+            break
+        await _recover(worker_id, incident, tracked, report)
 
     logger.info(
-        "Worker %d completed execution successfully",
+        "Worker %d completed execution successfully (processed=%d)",
         worker_id,
+        tracked.completed,
     )
-    browser.stop()
 
 
-async def run_parallel(urls: List[str], browsers: int):
+async def _plan_browsers(
+    report: ScrapeReport,
+    config: RunConfig,
+    resources: HostResources,
+    tasks: List[asyncio.Task],
+    limit: Optional[int],
+) -> Optional[CapacityPlan]:
+    """Calibrate on the running workers and plan the browsers of the run.
+
+    Returns:
+        Optional[CapacityPlan]: The plan, or None if the run ended
+        before it could be calibrated.
+    """
+    cost = await calibrate(
+        report,
+        len(tasks) * (config.prefetch_depth + 1),
+        config.calibration_pages,
+        done=lambda: all(task.done() for task in tasks),
+    )
+    if cost is None or all(task.done() for task in tasks):
+        logger.info("Run ended during calibration, keeping %d browsers", len(tasks))
+        return None
+
+    plan = plan_capacity(
+        resources,
+        cost,
+        config.headroom,
+        limit,
+        tabs=None if config.plan_prefetch else config.prefetch_depth + 1,
+        contexts_per_browser=config.contexts_per_browser,
+    )
+    plan.log()
+    if plan.browsers < len(tasks):
+        logger.info(
+            "Planned below the %d calibration browsers, which keep running",
+            len(tasks),
+        )
+    return plan
+
+
+# pylint: disable-next=too-many-locals,too-many-statements
+async def run_parallel(
+    urls: List[str],
+    config: RunConfig,
+    queue: Optional[SQLiteWorkQueue] = None,
+    sink: Optional[ResultSink] = None,
+    requests: Optional[List[UrlRequest]] = None,
+) -> ScrapeReport:
     """Execute multiple browser workers in parallel.
 
-    This function splits the input URL list into evenly sized chunks
-    and assigns each chunk to a dedicated browser worker. All workers
-    are executed concurrently using asyncio.
+    Without a queue, all browser workers lease URLs from one shared
+    in-memory list, so a worker whose browser is ready early does not
+    wait for the others. With a durable queue, all workers lease URLs
+    from it until it is drained, cooperating with any other process
+    consuming the same queue. All workers are executed concurrently
+    using asyncio, while browser launches are ramped up according to
+    `config.launch_concurrency`.
+
+    With `config.browsers` at 0 the number of browsers is planned from
+    the host: `CALIBRATION_BROWSERS` workers start, the cost of their
+    browsers is measured on their first pages, and more workers, with
+    the planned number of tabs each, join them (see `app.capacity`).
 
     Args:
-        urls (List[str]): Complete list of URLs to be scraped.
-        browsers (int): Number of parallel browser instances to launch.
+        urls (List[str]): Complete list of URLs to be scraped. Ignored
+            when `queue` is given.
+        config (RunConfig): Settings of the run, including the number
+            of parallel browser instances and how many of them may
+            start at the same time.
+        queue (Optional[SQLiteWorkQueue]): Durable queue to drain instead
+            of the in-memory URL list.
+        sink (Optional[ResultSink]): Output backend, closed once all
+            workers are done; defaults to one JSON file per page.
+        requests (Optional[List[UrlRequest]]): URLs with priorities and
+            deadlines, scheduled by a `PriorityWorkSource` in place of
+            `urls`.
+
+    Returns:
+        ScrapeReport: The report aggregated over all workers.
     """
     report = ScrapeReport()
-    chunks = list(chunked(urls, (len(urls) + browsers - 1) // browsers))
+    browsers = config.browsers or CALIBRATION_BROWSERS
+    sink = sink or JsonFileSink()
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    shared: Optional[WorkSource] = None
+    limit: Optional[int] = None
 
-    logger.info(
-        "Starting parallel execution (total_urls=%d, browsers=%d, urls_per_browser≈%d)",
-        len(urls),
-        browsers,
-        len(chunks[0]),
+    if queue is not None:
+        logger.info(
+            "Starting parallel execution from queue (browsers=%d, queue=%s)",
+            browsers,
+            queue.counts(),
+        )
+    elif requests:
+        limit = len(requests)
+        browsers = min(browsers, limit)
+        shared = PriorityWorkSource(requests, report)
+        logger.info(
+            "Starting prioritized execution (total_urls=%d, browsers=%d, "
+            "launch_concurrency=%s)",
+            len(requests),
+            browsers,
+            config.launch_concurrency or "unlimited",
+        )
+    elif urls:
+        # One shared source: browsers that finish launching first start
+        # draining it while the rest of the ramp is still in progress.
+        limit = len(urls)
+        browsers = min(browsers, limit)
+        shared = ListWorkSource(urls)
+        logger.info(
+            "Starting parallel execution (total_urls=%d, browsers=%d, "
+            "launch_concurrency=%s)",
+            len(urls),
+            browsers,
+            config.launch_concurrency or "unlimited",
+        )
+    else:
+        logger.info("No URLs to process, skipping browser startup")
+        await sink.close()
+        report.log_summary()
+        return report
+
+    # Measured before any browser starts, so that they are not counted
+    # as used by someone else.
+    resources = None if config.browsers else detect_resources()
+    launcher = LaunchScheduler(config.launch_concurrency)
+    extractor = (
+        ExtractionPool(config.extraction_workers)
+        if config.extraction == "network"
+        else None
     )
+    archive = CaptureArchive(config.archive_dir) if config.archive_dir else None
+    hosts: dict[int, BrowserHost] = {}
 
-    tasks = [browser_worker(i + 1, chunk, report) for i, chunk in enumerate(chunks)]
+    def spawn(worker_id: int, worker_config: RunConfig) -> asyncio.Task:
+        source = shared
+        if source is None:
+            assert queue is not None  # nosec B101
+            source = QueueWorkSource(queue, f"{owner}:{worker_id}")
+        return asyncio.create_task(
+            browser_worker(
+                worker_id,
+                source,
+                report,
+                sink,
+                worker_config,
+                launcher=launcher,
+                extractor=extractor,
+                host=worker_host(hosts, worker_id, worker_config, launcher),
+                archive=archive,
+            )
+        )
 
-    await asyncio.gather(*tasks)
+    tasks = [spawn(i + 1, config) for i in range(browsers)]
+    try:
+        if resources is not None:
+            plan = await _plan_browsers(report, config, resources, tasks, limit)
+            if plan is not None:
+                planned = replace(
+                    config, browsers=plan.browsers, prefetch_depth=plan.tabs - 1
+                )
+                tasks += [
+                    spawn(i + 1, planned) for i in range(len(tasks), plan.browsers)
+                ]
+        if hosts:
+            logger.info(
+                "Workers share %d browsers (%d contexts each)",
+                len(hosts),
+                config.contexts_per_browser,
+            )
+        await asyncio.gather(*tasks)
+    finally:
+        # Workers still running when the run fails or is cancelled must
+        # not outlive the sink.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await sink.close()
+        if extractor is not None:
+            extractor.close()
+        if archive is not None:
+            archive.close()
+    launcher.log_summary()
     report.log_summary()
+    return report
@@ -0,0 +1,140 @@
+"""Per-worker pipeline loading upcoming pages while the current one is scraped."""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncGenerator, Awaitable, Callable, Generic, Optional, TypeVar
+
+from app.performance import Timer
+from app.reporting import ScrapeReport
+from app.work_queue import Lease, WorkSource
+
+LaneT = TypeVar("LaneT")
+
+
+@dataclass(frozen=True)
+class Prefetched(Generic[LaneT]):
+    """A leased page whose navigation has finished, successfully or not."""
+
+    lane: LaneT
+    lease: Lease
+    error: Optional[Exception]
+    navigation_seconds: float
+
+
+class PrefetchPipeline(Generic[LaneT]):
+    """Navigate upcoming pages in spare lanes while the current one is processed.
+
+    A lane is whatever a page loads in, typically a tab. Every free lane
+    leases the next URL and starts navigating it right away, so with n
+    lanes up to n - 1 pages are loading while another one is being
+    extracted and persisted. A lane only takes new work once the caller
+    is done with its page, so the prefetch depth is bounded by the
+    number of lanes. With a single lane the pipeline is strictly
+    sequential.
+    """
+
+    def __init__(
+        self,
+        lanes: list[LaneT],
+        navigate: Callable[[LaneT, Lease], Awaitable[None]],
+        report: Optional[ScrapeReport] = None,
+    ):
+        """Create the pipeline.
+
+        Args:
+            lanes (list[LaneT]): The lanes, at least one.
+            navigate (Callable[[LaneT, Lease], Awaitable[None]]): Loads
+                a leased page in a lane.
+            report (Optional[ScrapeReport]): Report receiving how much
+                navigation time was hidden behind processing.
+
+        Raises:
+            ValueError: If no lane is given.
+        """
+        if not lanes:
+            raise ValueError("A pipeline needs at least one lane")
+        self.lanes = lanes
+        self.navigate = navigate
+        self.report = report
+
+    @property
+    def depth(self) -> int:
+        """Number of pages loaded ahead of the one being processed."""
+
+        return len(self.lanes) - 1
+
+    async def _prepare(
+        self, lane: LaneT, source: WorkSource
+    ) -> Optional[Prefetched[LaneT]]:
+        """Lease the next URL and navigate it in `lane`."""
+        lease = await source.lease()
+        if lease is None:
+            return None
+
+        t = Timer()
+        error = None
+        try:
+            await self.navigate(lane, lease)
+        except Exception as e:
+            error = e
+        return Prefetched(lane, lease, error, t.lap())
+
+    async def pages(
+        self, source: WorkSource
+    ) -> AsyncGenerator[Prefetched[LaneT], None]:
+        """Yield the navigated pages of `source` until it is drained.
+
+        Pages are yielded as their navigation completes, so a slow page
+        or a lease still waiting for work never holds up a page that is
+        ready. The lane of a yielded page is reused once the caller asks
+        for the next page. Navigations still in progress when the
+        iteration stops early are cancelled; their leases are neither
+        acked nor nacked.
+
+        Args:
+            source (WorkSource): Source of the URLs.
+
+        Yields:
+            Prefetched[LaneT]: The next page, whose `error` is set if
+            its navigation failed.
+        """
+        free = deque(self.lanes)
+        pending: set[asyncio.Task] = set()
+        ready: deque[tuple[Prefetched[LaneT], float]] = deque()
+        drained = False
+        try:
+            while True:
+                while free and not drained:
+                    pending.add(
+                        asyncio.create_task(self._prepare(free.popleft(), source))
+                    )
+                if ready:
+                    page, waited = ready.popleft()
+                    if self.report is not None:
+                        await self.report.record_prefetch(
+                            page.navigation_seconds, waited
+                        )
+                    yield page
+                    free.append(page.lane)
+                    continue
+                if not pending:
+                    return
+
+                t = Timer()
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                waited = t.lap()
+                for task in done:
+                    if (prepared := task.result()) is None:
+                        drained = True
+                    else:
+                        # Only the first page was waited for, the others
+                        # were ready by the time it was.
+                        ready.append((prepared, waited))
+                        waited = 0.0
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
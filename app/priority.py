@@ -0,0 +1,217 @@
+"""Priority and deadline-aware input format and scheduling."""
+
+import heapq
+import json
+import math
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import count
+from typing import Iterable, Optional
+
+from app.reporting import ScrapeReport
+from app.work_queue import Lease
+
+# Share of the leases each class receives while several are waiting.
+PRIORITY_WEIGHTS = {"high": 4, "normal": 2, "low": 1}
+DEFAULT_PRIORITY = "normal"
+
+# Input file extensions carrying per-URL priority and deadline.
+PRIORITY_FORMATS = (".tsv", ".jsonl")
+
+
+@dataclass(frozen=True)
+class UrlRequest:
+    """A URL to scrape together with its scheduling hints."""
+
+    url: str
+    priority: str = DEFAULT_PRIORITY
+    deadline: Optional[float] = None
+
+
+def parse_deadline(value) -> Optional[float]:
+    """Convert a deadline into a Unix timestamp.
+
+    Args:
+        value: Unix seconds, an ISO 8601 string (naive values are UTC),
+            or an empty value for no deadline.
+
+    Returns:
+        Optional[float]: The deadline, or None if there is none.
+
+    Raises:
+        ValueError: If the value cannot be parsed.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _make_request(url: str, priority: Optional[str], deadline) -> UrlRequest:
+    """Validate the fields of one input record."""
+
+    priority = priority or DEFAULT_PRIORITY
+    if priority not in PRIORITY_WEIGHTS:
+        raise ValueError(
+            f"Unknown priority {priority!r}, expected one of "
+            f"{', '.join(PRIORITY_WEIGHTS)}"
+        )
+    return UrlRequest(url.strip(), priority, parse_deadline(deadline))
+
+
+def is_priority_file(path: str) -> bool:
+    """Return whether `path` uses one of the priority input formats."""
+
+    return os.path.splitext(path)[1].lower() in PRIORITY_FORMATS
+
+
+def read_requests(path: str) -> list[UrlRequest]:
+    """Read URL requests from a TSV or JSON Lines file.
+
+    TSV lines hold `url`, then optionally `priority` and `deadline`,
+    separated by tabs. JSON Lines records are objects with a `url` and
+    optional `priority` and `deadline` keys. Blank lines and lines
+    starting with `#` are skipped.
+
+    Args:
+        path (str): Path to the input file.
+
+    Returns:
+        list[UrlRequest]: The requests in file order.
+
+    Raises:
+        ValueError: If a line is malformed, naming the line number.
+    """
+    jsonl = path.lower().endswith(".jsonl")
+    requests = []
+
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                if jsonl:
+                    record = json.loads(line)
+                    request = _make_request(
+                        record["url"], record.get("priority"), record.get("deadline")
+                    )
+                else:
+                    fields = line.split("\t") + ["", ""]
+                    request = _make_request(
+                        fields[0], fields[1].strip(), fields[2].strip()
+                    )
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{path}:{number}: invalid request: {e}") from e
+            requests.append(request)
+
+    return requests
+
+
+class PriorityWorkSource:
+    """In-memory work source serving important and urgent URLs first.
+
+    Requests are kept in one queue per priority class, ordered by
+    earliest deadline (requests without one go last, in input order).
+    A request whose deadline falls within `urgency` seconds is served
+    before anything else. Otherwise classes are picked by smooth
+    weighted round-robin over `PRIORITY_WEIGHTS`, so that a backlog of
+    high-priority pages slows lower classes down but never starves them.
+
+    Latency is measured from the creation of the source to the
+    completion of each request and recorded per class in the report.
+    """
+
+    def __init__(
+        self,
+        requests: Iterable[UrlRequest],
+        report: Optional[ScrapeReport] = None,
+        urgency: float = 60.0,
+    ):
+        """Queue the requests.
+
+        Args:
+            requests (Iterable[UrlRequest]): Requests to schedule.
+            report (Optional[ScrapeReport]): Report receiving per-class
+                latencies.
+            urgency (float): Seconds before its deadline from which a
+                request bypasses the class weights.
+        """
+        self.report = report
+        self.urgency = urgency
+        self._started = time.time()
+        self._seq = count()
+        self._queues: dict[str, list] = {name: [] for name in PRIORITY_WEIGHTS}
+        self._credit = dict.fromkeys(PRIORITY_WEIGHTS, 0)
+        self._leased: dict[int, UrlRequest] = {}
+
+        for request in requests:
+            deadline = math.inf if request.deadline is None else request.deadline
+            heapq.heappush(
+                self._queues[request.priority], (deadline, next(self._seq), request)
+            )
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _next_class(self) -> Optional[str]:
+        """Pick the class of the next request to serve."""
+
+        waiting = [name for name, queue in self._queues.items() if queue]
+        if not waiting:
+            return None
+
+        urgent = min(waiting, key=lambda name: self._queues[name][0][0])
+        if self._queues[urgent][0][0] <= time.time() + self.urgency:
+            return urgent
+
+        for name in waiting:
+            self._credit[name] += PRIORITY_WEIGHTS[name]
+        chosen = max(waiting, key=lambda name: self._credit[name])
+        self._credit[chosen] -= sum(PRIORITY_WEIGHTS[name] for name in waiting)
+        return chosen
+
+    async def lease(self) -> Optional[Lease]:
+        """Return the next request according to deadlines and class weights."""
+
+        name = self._next_class()
+        if name is None:
+            return None
+        _, job_id, request = heapq.heappop(self._queues[name])
+        self._leased[job_id] = request
+        return Lease(job_id=job_id, url=request.url, attempts=1)
+
+    async def ack(self, lease: Lease) -> None:
+        """Record the latency of a completed request."""
+
+        await self._complete(lease)
+
+    # pylint: disable-next=unused-argument
+    async def nack(self, lease: Lease, error: str = "") -> bool:
+        """Drop the failed request, recording its latency; no retries."""
+
+        await self._complete(lease)
+        return False
+
+    async def extend(self, lease: Lease) -> None:  # pylint: disable=unused-argument
+        """In-memory leases never expire."""
+
+    async def _complete(self, lease: Lease):
+        """Forget a leased request and report its latency."""
+
+        request = self._leased.pop(lease.job_id)
+        if self.report is None:
+            return
+
+        now = time.time()
+        missed = request.deadline is not None and now > request.deadline
+        await self.report.record_latency(request.priority, now - self._started, missed)
@@ -0,0 +1,203 @@
+"""Python profiling of a run and hotspot summaries of its artifacts.
+
+The Python side is profiled with yappi when it is installed, which
+attributes time to coroutines correctly across suspensions, and with
+cProfile otherwise. Browser traces are written by `app.tracing` into the
+same directory; `profile_run` summarizes both once the run is over.
+"""
+
+import contextlib
+import cProfile
+import glob
+import importlib
+import json
+import os
+import pstats
+from collections import Counter
+from typing import Iterator, List, Optional
+
+from app.observability import get_logger
+
+logger = get_logger(__name__)
+
+PYTHON_STATS_FILE = "python.pstats"
+HOTSPOTS_FILE = "hotspots.json"
+TRACE_PATTERN = "trace-*.json"
+
+
+class PythonProfiler:
+    """Profile the Python code of the current process.
+
+    With yappi the CPU clock is used for every thread and coroutine;
+    cProfile only sees the calling thread, and counts each resumption
+    of a coroutine as a separate call.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        """Pick the profiler backend.
+
+        Args:
+            backend (Optional[str]): `yappi` or `cprofile`; by default
+                yappi if it can be imported.
+        """
+        self._yappi = None
+        if backend in (None, "yappi"):
+            try:
+                self._yappi = importlib.import_module("yappi")
+            except ImportError:
+                if backend == "yappi":
+                    raise
+        self.backend = "yappi" if self._yappi is not None else "cprofile"
+        self._cprofile = cProfile.Profile()
+
+    def start(self):
+        """Start collecting."""
+
+        if self._yappi is not None:
+            self._yappi.set_clock_type("cpu")
+            self._yappi.start()
+        else:
+            self._cprofile.enable()
+
+    def stop(self):
+        """Stop collecting."""
+
+        if self._yappi is not None:
+            self._yappi.stop()
+        else:
+            self._cprofile.disable()
+
+    def save(self, path: str):
+        """Write the statistics in `pstats` format."""
+
+        if self._yappi is not None:
+            self._yappi.get_func_stats().save(path, type="pstat")
+        else:
+            self._cprofile.dump_stats(path)
+
+
+def python_hotspots(path: str, limit: int = 20) -> List[dict]:
+    """Return the functions with the most own time in a `pstats` file.
+
+    Args:
+        path (str): Statistics written by `PythonProfiler.save`.
+        limit (int): Number of functions to return.
+
+    Returns:
+        List[dict]: Function location, call count (`total/primitive`
+        for recursive functions), own and cumulative seconds, by
+        decreasing own time.
+    """
+    profiles = pstats.Stats(path).get_stats_profile().func_profiles
+    rows = sorted(profiles.items(), key=lambda item: -item[1].tottime)[:limit]
+    return [
+        {
+            "function": f"{p.file_name}:{p.line_number}({name})",
+            "calls": p.ncalls,
+            "own_seconds": round(p.tottime, 4),
+            "cumulative_seconds": round(p.cumtime, 4),
+        }
+        for name, p in rows
+    ]
+
+
+def trace_hotspots(paths: List[str], limit: int = 20) -> List[dict]:
+    """Return the trace events with the most total duration.
+
+    Complete (`X`) events of all traces are grouped by name, so that
+    e.g. script evaluation, parsing, layout and garbage collection can
+    be compared across the sampled pages.
+
+    Args:
+        paths (List[str]): Trace files written by `app.tracing`.
+        limit (int): Number of event names to return.
+
+    Returns:
+        List[dict]: Event name, occurrences and total milliseconds, by
+        decreasing duration.
+    """
+    durations: Counter = Counter()
+    counts: Counter = Counter()
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            events = json.load(f).get("traceEvents", [])
+        for event in events:
+            if event.get("ph") == "X" and "dur" in event:
+                durations[event["name"]] += event["dur"]
+                counts[event["name"]] += 1
+    return [
+        {"name": name, "count": counts[name], "total_ms": round(dur / 1000, 1)}
+        for name, dur in durations.most_common(limit)
+    ]
+
+
+def write_hotspots(directory: str, limit: int = 20) -> dict:
+    """Summarize the profile and traces of `directory` into `hotspots.json`.
+
+    Args:
+        directory (str): Directory holding the profiling artifacts.
+        limit (int): Entries per section.
+
+    Returns:
+        dict: The summary, with `python` and `browser` hotspots and the
+        trace files it covers.
+    """
+    stats_path = os.path.join(directory, PYTHON_STATS_FILE)
+    traces = sorted(glob.glob(os.path.join(directory, TRACE_PATTERN)))
+    summary = {
+        "python": (
+            python_hotspots(stats_path, limit) if os.path.exists(stats_path) else []
+        ),
+        "browser": trace_hotspots(traces, limit),
+        "traces": [os.path.basename(path) for path in traces],
+    }
+    with open(os.path.join(directory, HOTSPOTS_FILE), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def _log_hotspots(summary: dict, limit: int = 10):
+    """Log the first hotspots of both sides."""
+
+    for entry in summary["python"][:limit]:
+        logger.info(
+            "Python hotspot: %s own=%.3fs cumulative=%.3fs calls=%s",
+            entry["function"],
+            entry["own_seconds"],
+            entry["cumulative_seconds"],
+            entry["calls"],
+        )
+    for entry in summary["browser"][:limit]:
+        logger.info(
+            "Browser hotspot: %s total=%.1fms count=%d",
+            entry["name"],
+            entry["total_ms"],
+            entry["count"],
+        )
+
+
+@contextlib.contextmanager
+def profile_run(directory: str, backend: Optional[str] = None) -> Iterator[None]:
+    """Profile the enclosed code and summarize the artifacts afterwards.
+
+    Args:
+        directory (str): Output directory, created if needed.
+        backend (Optional[str]): Python profiler backend, see
+            `PythonProfiler`.
+    """
+    os.makedirs(directory, exist_ok=True)
+    profiler = PythonProfiler(backend)
+    logger.info("Profiling with %s into %s", profiler.backend, directory)
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        profiler.save(os.path.join(directory, PYTHON_STATS_FILE))
+        summary = write_hotspots(directory)
+        _log_hotspots(summary)
+        logger.info(
+            "Profile written to %s (%d browser traces)",
+            directory,
+            len(summary["traces"]),
+        )
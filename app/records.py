@@ -0,0 +1,162 @@
+"""Typed record of a scraped page and its JSON (de)serialization.
+
+`orjson` is an optional dependency: when it is installed it parses and
+serializes the payloads, otherwise the standard library `json` module
+does. Both produce the same documents.
+"""
+
+import functools
+import importlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional, Union
+
+from app.utils import as_float, page_key
+
+# Payload keys stored in their own typed attributes of `PageRecord`.
+_RESERVED = ("display_name", "latitude", "longitude")
+
+
+@functools.cache
+def _orjson():
+    """Return the `orjson` module, or None if it is not installed."""
+    try:
+        return importlib.import_module("orjson")
+    except ImportError:
+        return None
+
+
+def json_backend() -> str:
+    """Return the name of the JSON library in use."""
+
+    return "orjson" if _orjson() is not None else "json"
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document.
+
+    Raises:
+        ValueError: If `data` is not valid JSON.
+    """
+    orjson = _orjson()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def dumps(value: Any, indent: bool = False) -> bytes:
+    """Serialize a value as UTF-8 JSON, compact or indented by two spaces."""
+
+    orjson = _orjson()
+    if orjson is not None:
+        data: bytes = orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else 0)
+        return data
+    return json.dumps(
+        value,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+    ).encode("utf-8")
+
+
+@dataclass(frozen=True, slots=True)
+class PageRecord:
+    """One scraped page, as handed to the output sinks.
+
+    The display name and the coordinates are typed attributes, so that
+    sinks with their own columns do not have to look them up and convert
+    them for every page; all other extracted fields stay in `fields`.
+    """
+
+    url: str
+    page_key: str
+    display_name: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    fields: dict = field(repr=False)
+    scraped_at: float
+
+    @classmethod
+    def from_payload(
+        cls,
+        url: str,
+        payload: dict,
+        display_name: Optional[str] = None,
+        scraped_at: Optional[float] = None,
+    ) -> "PageRecord":
+        """Build a record from an extracted payload.
+
+        Args:
+            url (str): The page URL the payload was scraped from.
+            payload (dict): The extracted fields.
+            display_name (Optional[str]): The page title, taking
+                precedence over a `display_name` in the payload.
+            scraped_at (Optional[float]): Scrape timestamp, defaulting
+                to now.
+
+        Returns:
+            PageRecord: The record.
+        """
+        return cls(
+            url=url,
+            page_key=page_key(url),
+            display_name=display_name or payload.get("display_name"),
+            latitude=as_float(payload.get("latitude")),
+            longitude=as_float(payload.get("longitude")),
+            fields={k: v for k, v in payload.items() if k not in _RESERVED},
+            scraped_at=scraped_at if scraped_at is not None else time.time(),
+        )
+
+    @classmethod
+    def from_json(
+        cls,
+        url: str,
+        data: Union[str, bytes],
+        display_name: Optional[str] = None,
+        scraped_at: Optional[float] = None,
+    ) -> "PageRecord":
+        """Parse an extracted payload once and build its record.
+
+        Args:
+            url (str): The page URL the payload was scraped from.
+            data (Union[str, bytes]): The payload as a JSON object.
+            display_name (Optional[str]): The page title.
+            scraped_at (Optional[float]): Scrape timestamp, defaulting
+                to now.
+
+        Returns:
+            PageRecord: The record.
+
+        Raises:
+            ValueError: If `data` is not a JSON object.
+        """
+        payload = loads(data)
+        if not isinstance(payload, dict):
+            raise ValueError(f"Expected a JSON object, got {type(payload).__name__}")
+        return cls.from_payload(url, payload, display_name, scraped_at)
+
+    def to_payload(self) -> dict:
+        """Return the payload written by the sinks.
+
+        Coordinates are only present when known; `display_name` always
+        is, as None when the page had no title.
+        """
+        payload = dict(self.fields)
+        if self.latitude is not None:
+            payload["latitude"] = self.latitude
+        if self.longitude is not None:
+            payload["longitude"] = self.longitude
+        payload["display_name"] = self.display_name
+        return payload
+
+    def dumps(self, indent: bool = False, with_url: bool = False) -> bytes:
+        """Serialize the payload as UTF-8 JSON.
+
+        Args:
+            indent (bool): Pretty-print the document.
+            with_url (bool): Store the page URL under `url`, for files
+                whose name does not identify the page on its own.
+        """
+        payload = self.to_payload()
+        if with_url:
+            payload["url"] = self.url
+        return dumps(payload, indent)
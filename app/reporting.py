@@ -1,38 +1,518 @@
 """Execution reporting and aggregation utilities for scraping jobs."""
 
-import asyncio
+import json
+import math
+import time
+from contextvars import ContextVar
+from typing import Iterable, Optional
 
 from app.observability import get_logger
 
 logger = get_logger(__name__)
 
+# Id of the browser worker running the current task; set by each worker
+# so that outcomes are attributed without passing the id down every call.
+current_worker: ContextVar[Optional[int]] = ContextVar("current_worker", default=None)
 
+# Seconds covered by one slot of the throughput timeline.
+TIMELINE_RESOLUTION = 10
+
+
+class LatencyHistogram:
+    """Streaming histogram with logarithmic buckets, in the style of HDR.
+
+    Each bucket spans a constant ratio of `1 + precision`, so that
+    percentiles are exact to within `precision` relative error whatever
+    the range of values, while memory only grows with the logarithm of
+    that range. Histograms with the same precision can be merged.
+    """
+
+    def __init__(self, precision: float = 0.01):
+        """Create an empty histogram.
+
+        Args:
+            precision (float): Relative width of a bucket.
+        """
+        self.precision = precision
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._buckets: dict[int, int] = {}
+        self._log_base = math.log1p(precision)
+
+    def record(self, value: float):
+        """Add a non-negative value."""
+
+        index = math.ceil(math.log(max(value, 1e-9)) / self._log_base)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, pct: float) -> float:
+        """Return the nearest-rank percentile, or 0 when empty.
+
+        The value returned is the upper bound of the bucket holding the
+        rank, capped by the largest recorded value.
+        """
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(math.exp(index * self._log_base), self.max)
+        return 0.0
+
+    def stats(self, digits: int = 3) -> dict:
+        """Return count, mean, p50, p90, p95, p99 and max."""
+
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, digits),
+            **{
+                f"p{pct}": round(self.percentile(pct), digits)
+                for pct in (50, 90, 95, 99)
+            },
+            "max": round(self.max, digits),
+        }
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add the values of another histogram with the same precision.
+
+        Raises:
+            ValueError: If the precisions differ.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge histograms of different precision")
+        for index, n in other._buckets.items():  # pylint: disable=protected-access
+            self._buckets[index] = self._buckets.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> dict:
+        """Return a JSON-serializable form, read back by `from_dict`."""
+
+        return {
+            "precision": self.precision,
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+            "buckets": {str(i): n for i, n in sorted(self._buckets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        """Rebuild a histogram written by `to_dict`."""
+
+        histogram = cls(data["precision"])
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.max = data["max"]
+        histogram._buckets = {int(i): n for i, n in data["buckets"].items()}
+        return histogram
+
+
+def failure_class(error: BaseException) -> str:
+    """Name the class of failure an exception belongs to in the report."""
+
+    if isinstance(error, TimeoutError):
+        return "timeout"
+    if isinstance(error, ConnectionError):
+        return "connection"
+    if "about_app_sections" in str(error):
+        return "not_found"
+    return type(error).__name__
+
+
+def _class_stats(histogram: LatencyHistogram, missed: int) -> dict:
+    """Return the latency statistics of a priority class."""
+
+    return {
+        "count": histogram.count,
+        "mean": round(histogram.total / histogram.count, 3),
+        "p50": round(histogram.percentile(50), 3),
+        "p95": round(histogram.percentile(95), 3),
+        "max": round(histogram.max, 3),
+        "missed_deadlines": missed,
+    }
+
+
+def _extraction_stats(histogram: LatencyHistogram) -> dict:
+    """Return the in-page extraction statistics, or {} if none ran."""
+
+    if not histogram.count:
+        return {}
+    return {
+        "count": histogram.count,
+        "mean_ms": round(histogram.total / histogram.count, 1),
+        "p50_ms": round(histogram.percentile(50), 1),
+        "p95_ms": round(histogram.percentile(95), 1),
+        "max_ms": round(histogram.max, 1),
+    }
+
+
+def _page_cost(totals: dict) -> dict:
+    """Return the page cost section from its totals, or {} without pages."""
+
+    pages = int(totals["pages"])
+    if not pages:
+        return {}
+    cpu_seconds = totals["cpu_seconds"]
+    received = int(totals["bytes"])
+    messages = int(totals["cdp_messages"])
+    exchanged = int(totals["cdp_bytes"])
+    return {
+        "pages": pages,
+        "cpu_seconds": round(cpu_seconds, 3),
+        "cpu_seconds_per_page": round(cpu_seconds / pages, 3),
+        "bytes": received,
+        "bytes_per_page": received // pages,
+        "cdp_messages": messages,
+        "cdp_messages_per_page": round(messages / pages, 1),
+        "cdp_bytes": exchanged,
+        "cdp_bytes_per_page": exchanged // pages,
+    }
+
+
+def _prefetch(totals: dict) -> dict:
+    """Return the prefetch section from its totals, or {} without pages."""
+
+    pages = int(totals["pages"])
+    if not pages:
+        return {}
+    navigation = totals["navigation_seconds"]
+    hidden = navigation - totals["waited_seconds"]
+    return {
+        "pages": pages,
+        "navigation_seconds": round(navigation, 3),
+        "waited_seconds": round(totals["waited_seconds"], 3),
+        "hidden_seconds": round(hidden, 3),
+        "overlap_ratio": round(hidden / navigation, 3) if navigation else 0.0,
+    }
+
+
+def _incidents(kinds: dict[str, int], recovery: dict[str, int]) -> dict:
+    """Return the incidents section, or {} if no incident occurred."""
+
+    if not kinds:
+        return {}
+    return {
+        "total": sum(kinds.values()),
+        "kinds": dict(sorted(kinds.items(), key=lambda i: -i[1])),
+        "requeued": recovery["requeued"],
+        "given_up": recovery["given_up"],
+    }
+
+
+# pylint: disable-next=too-many-instance-attributes,too-many-public-methods
 class ScrapeReport:
     """Aggregate and report scraping results across concurrent workers.
 
-    This class provides an asyncio-safe mechanism to track how many
-    scraping operations succeeded or failed during a run and to emit
-    a final summary report once execution completes.
+    This class tracks how many scraping operations succeeded or failed
+    during a run, per worker and per failure class, together with page
+    latencies and throughput over time, and emits a final summary once
+    execution completes.
+
+    All workers share one event loop and no update awaits anything, so
+    updates are atomic without a lock. The recording methods are kept
+    awaitable for the existing callers.
     """
 
-    def __init__(self):
+    def __init__(self) -> None:
         """Initialize an empty scrape report."""
 
         self._saved = 0
         self._failed = 0
-        self._lock = asyncio.Lock()
+        self._started = time.monotonic()
+        self._failures: dict[str, int] = {}
+        self._workers: dict[int, dict] = {}
+        self._timeline: dict[int, list[int]] = {}
+        self._page_latency = LatencyHistogram()
+        self._latencies: dict[str, LatencyHistogram] = {}
+        self._missed: dict[str, int] = {}
+        self._extraction_ms = LatencyHistogram()
+        self._prefetch = {"pages": 0, "navigation_seconds": 0.0, "waited_seconds": 0.0}
+        self._incidents: dict[str, int] = {}
+        self._recovery = {"requeued": 0, "given_up": 0}
+        self._cost = {
+            "pages": 0,
+            "cpu_seconds": 0.0,
+            "bytes": 0,
+            "cdp_messages": 0,
+            "cdp_bytes": 0,
+        }
+
+    def _worker(self) -> Optional[dict]:
+        """Return the counters of the current worker, if any."""
+
+        worker_id = current_worker.get()
+        if worker_id is None:
+            return None
+        return self._workers.setdefault(
+            worker_id, {"saved": 0, "failed": 0, "pages": 0, "busy_seconds": 0.0}
+        )
+
+    def _count(self, outcome: int):
+        """Count a saved (0) or failed (1) page in the timeline."""
+
+        slot = int((time.monotonic() - self._started) // TIMELINE_RESOLUTION)
+        self._timeline.setdefault(slot, [0, 0])[outcome] += 1
 
     async def record_saved(self):
         """Record a successful scrape result."""
 
-        async with self._lock:
-            self._saved += 1
+        self._saved += 1
+        self._count(0)
+        if (worker := self._worker()) is not None:
+            worker["saved"] += 1
+
+    async def record_failed(self, reason: str = "error"):
+        """Record a failed scrape result.
+
+        Args:
+            reason (str): Failure class, e.g. from `failure_class`.
+        """
+        self._failed += 1
+        self._count(1)
+        self._failures[reason] = self._failures.get(reason, 0) + 1
+        if (worker := self._worker()) is not None:
+            worker["failed"] += 1
+
+    async def record_page_time(self, seconds: float):
+        """Record the wall time a worker spent on one page.
+
+        Args:
+            seconds (float): Time from lease to outcome, retries excluded.
+        """
+        self._page_latency.record(seconds)
+        if (worker := self._worker()) is not None:
+            worker["pages"] += 1
+            worker["busy_seconds"] += seconds
+
+    async def record_latency(
+        self, priority_class: str, seconds: float, missed_deadline: bool = False
+    ):
+        """Record how long a request of a priority class took to complete.
+
+        Args:
+            priority_class (str): Scheduling class of the request.
+            seconds (float): Time from submission to completion.
+            missed_deadline (bool): Whether it completed after its
+                deadline.
+        """
+        self._latencies.setdefault(priority_class, LatencyHistogram()).record(seconds)
+        self._missed[priority_class] = (
+            self._missed.get(priority_class, 0) + missed_deadline
+        )
+
+    def class_latency(self) -> dict:
+        """Return latency statistics in seconds per priority class.
+
+        Returns:
+            dict: For each class, the number of completed requests, the
+            mean, median, 95th percentile and maximum latency, and the
+            number of missed deadlines. Empty without recorded latencies.
+        """
+        return {
+            name: _class_stats(histogram, self._missed[name])
+            for name, histogram in self._latencies.items()
+        }
+
+    async def record_page_cost(
+        self,
+        cpu_seconds: float,
+        bytes_received: int,
+        cdp_messages: int = 0,
+        cdp_bytes: int = 0,
+    ):
+        """Record the renderer CPU time, network bytes and CDP traffic of a page.
+
+        Args:
+            cpu_seconds (float): Main-thread CPU time spent on the page.
+            bytes_received (int): Encoded bytes transferred for the page.
+            cdp_messages (int): CDP commands and responses exchanged.
+            cdp_bytes (int): Size of those CDP messages.
+        """
+        self._cost["pages"] += 1
+        self._cost["cpu_seconds"] += cpu_seconds
+        self._cost["bytes"] += bytes_received
+        self._cost["cdp_messages"] += cdp_messages
+        self._cost["cdp_bytes"] += cdp_bytes
+
+    def page_cost(self) -> dict:
+        """Return the total and per-page CPU time, bytes and CDP traffic.
+
+        Returns:
+            dict: Totals and means over the measured pages, or an empty
+            dict if no page was measured.
+        """
+        return _page_cost(self._cost)
+
+    async def record_extraction_time(self, milliseconds: float):
+        """Record the time the in-page extraction script took.
+
+        Args:
+            milliseconds (float): Duration measured in the page.
+        """
+        self._extraction_ms.record(milliseconds)
+
+    def extraction_time(self) -> dict:
+        """Return statistics in milliseconds of the in-page extraction.
+
+        Returns:
+            dict: Count, mean, p50, p95 and max, or an empty dict if no
+            extraction ran in the page.
+        """
+        return _extraction_stats(self._extraction_ms)
+
+    async def record_prefetch(self, navigation_seconds: float, waited_seconds: float):
+        """Record how much of a page's navigation the pipeline overlapped.
+
+        Args:
+            navigation_seconds (float): Duration of the navigation.
+            waited_seconds (float): Part of it the worker spent waiting,
+                i.e. not hidden behind the extraction of earlier pages.
+        """
+        self._prefetch["pages"] += 1
+        self._prefetch["navigation_seconds"] += navigation_seconds
+        self._prefetch["waited_seconds"] += min(waited_seconds, navigation_seconds)
+
+    def prefetch(self) -> dict:
+        """Return the navigation time hidden by prefetching.
+
+        Returns:
+            dict: Pages, navigation and waited seconds, the hidden
+            seconds and their share of the navigation time, or an empty
+            dict if no page went through the pipeline.
+        """
+        return _prefetch(self._prefetch)
+
+    async def record_incident(self, kind: str, requeued: int, given_up: int):
+        """Record a browser that died or hung and was replaced by the watchdog.
+
+        Args:
+            kind (str): Kind of incident, e.g. `page_stall`.
+            requeued (int): URLs in flight handed out again.
+            given_up (int): URLs in flight dropped after too many
+                incidents.
+        """
+        self._incidents[kind] = self._incidents.get(kind, 0) + 1
+        self._recovery["requeued"] += requeued
+        self._recovery["given_up"] += given_up
+
+    def incidents(self) -> dict:
+        """Return the watchdog incidents and the URLs they affected.
+
+        Returns:
+            dict: The number of incidents in total and per kind, and the
+            requeued and given up URLs, or an empty dict if no incident
+            occurred.
+        """
+        return _incidents(self._incidents, self._recovery)
+
+    def failures(self) -> dict:
+        """Return the number of failed pages per failure class."""
+
+        return dict(sorted(self._failures.items(), key=lambda item: -item[1]))
+
+    def workers(self) -> dict:
+        """Return the outcome counters and busy time of every worker.
+
+        Returns:
+            dict: For each worker id, saved and failed pages, pages
+            timed, total busy seconds and mean seconds per page.
+        """
+        stats = {}
+        for worker_id, counters in sorted(self._workers.items()):
+            pages = counters["pages"]
+            stats[worker_id] = {
+                **counters,
+                "busy_seconds": round(counters["busy_seconds"], 3),
+                "seconds_per_page": (
+                    round(counters["busy_seconds"] / pages, 3) if pages else 0.0
+                ),
+            }
+        return stats
+
+    def page_latency(self) -> dict:
+        """Return percentiles in seconds of the time spent per page."""
+
+        return self._page_latency.stats() if self._page_latency.count else {}
+
+    def throughput(self, interval: int = 60) -> list[dict]:
+        """Return the outcomes over time since the report was created.
+
+        Args:
+            interval (int): Seconds per entry, rounded up to a multiple
+                of `TIMELINE_RESOLUTION`.
 
-    async def record_failed(self):
-        """Record a failed scrape result."""
+        Returns:
+            list[dict]: One entry per interval up to the last outcome,
+            with its start offset in seconds, saved and failed pages
+            and the rate in pages per minute.
+        """
+        if not self._timeline:
+            return []
+        width = max(1, math.ceil(interval / TIMELINE_RESOLUTION))
+        seconds = width * TIMELINE_RESOLUTION
+        entries = []
+        for start in range(0, max(self._timeline) + 1, width):
+            saved = failed = 0
+            for slot in range(start, start + width):
+                counts = self._timeline.get(slot, (0, 0))
+                saved, failed = saved + counts[0], failed + counts[1]
+            entries.append(
+                {
+                    "start": start * TIMELINE_RESOLUTION,
+                    "saved": saved,
+                    "failed": failed,
+                    "pages_per_minute": round((saved + failed) * 60 / seconds, 1),
+                }
+            )
+        return entries
+
+    def to_dict(self) -> dict:
+        """Return the full report in a JSON-serializable form.
+
+        The counts of `summary` are always present; the other sections
+        only when something was recorded for them. Latency statistics
+        carry their histograms so that `merge_summaries` can combine
+        reports exactly.
+        """
+        elapsed = time.monotonic() - self._started
+        data: dict = {
+            **self.summary(),
+            "elapsed_seconds": round(elapsed, 3),
+            "pages_per_minute": round(
+                (self._saved + self._failed) * 60 / elapsed if elapsed else 0.0, 1
+            ),
+        }
+        data.update((name, value) for name, value in self._sections().items() if value)
+        if self._page_latency.count:
+            data["page_latency"]["histogram"] = self._page_latency.to_dict()
+        for name, stats in data.get("class_latency", {}).items():
+            stats["histogram"] = self._latencies[name].to_dict()
+        if self._extraction_ms.count:
+            data["extraction_time"]["histogram"] = self._extraction_ms.to_dict()
+        return data
 
-        async with self._lock:
-            self._failed += 1
+    def _sections(self) -> dict:
+        """Return every section of the report, empty ones included."""
+
+        return {
+            "failures": self.failures(),
+            "workers": {str(k): v for k, v in self.workers().items()},
+            "page_latency": self.page_latency(),
+            "throughput": self.throughput(),
+            "class_latency": self.class_latency(),
+            "page_cost": self.page_cost(),
+            "extraction_time": self.extraction_time(),
+            "prefetch": self.prefetch(),
+            "incidents": self.incidents(),
+        }
 
     def summary(self) -> dict:
         """Return a summary of scraping results.
@@ -56,3 +536,320 @@ class ScrapeReport:
             summary["saved"],
             summary["failed"],
         )
+        _log_details(summary, self._sections())
+
+    def write_summary(self, path: str):
+        """Write the report as JSON so that another process can merge it.
+
+        Args:
+            path (str): Destination file path.
+        """
+        write_summary(self.to_dict(), path)
+
+
+def _log_details(summary: dict, sections: dict):
+    """Log the sections of a report, as returned by `ScrapeReport.to_dict`."""
+
+    failures = sections.get("failures")
+    if failures:
+        logger.info(
+            "Failures by class: %s",
+            ", ".join(f"{name}={n}" for name, n in failures.items()),
+        )
+    page_latency = sections.get("page_latency")
+    if page_latency:
+        logger.info(
+            "Page latency over %d pages: mean=%.2fs, p50=%.2fs, p90=%.2fs, "
+            "p95=%.2fs, p99=%.2fs, max=%.2fs",
+            page_latency["count"],
+            page_latency["mean"],
+            page_latency["p50"],
+            page_latency["p90"],
+            page_latency["p95"],
+            page_latency["p99"],
+            page_latency["max"],
+        )
+    if summary.get("pages_per_minute"):
+        logger.info("Throughput: %.1f pages/minute", summary["pages_per_minute"])
+    for worker_id, stats in sections.get("workers", {}).items():
+        logger.info(
+            "Worker %s: saved=%d, failed=%d, busy=%.1fs (%.2fs/page)",
+            worker_id,
+            stats["saved"],
+            stats["failed"],
+            stats["busy_seconds"],
+            stats["seconds_per_page"],
+        )
+    timeline = sections.get("throughput")
+    if timeline:
+        logger.info(
+            "Throughput per minute: %s",
+            ", ".join(
+                f"{entry['start'] // 60}m={entry['pages_per_minute']:g}"
+                for entry in timeline
+            ),
+        )
+    for name, stats in sections.get("class_latency", {}).items():
+        logger.info(
+            "Latency class=%s: count=%d, mean=%.1fs, p50=%.1fs, p95=%.1fs, "
+            "max=%.1fs, missed_deadlines=%d",
+            name,
+            stats["count"],
+            stats["mean"],
+            stats["p50"],
+            stats["p95"],
+            stats["max"],
+            stats["missed_deadlines"],
+        )
+    cost = sections.get("page_cost")
+    if cost:
+        logger.info(
+            "Page cost over %d pages: cpu=%.2fs (%.3fs/page), "
+            "bytes=%d (%d/page), cdp=%d messages (%.1f/page), "
+            "%d bytes (%d/page)",
+            cost["pages"],
+            cost["cpu_seconds"],
+            cost["cpu_seconds_per_page"],
+            cost["bytes"],
+            cost["bytes_per_page"],
+            cost["cdp_messages"],
+            cost["cdp_messages_per_page"],
+            cost["cdp_bytes"],
+            cost["cdp_bytes_per_page"],
+        )
+    extraction = sections.get("extraction_time")
+    if extraction:
+        logger.info(
+            "In-page extraction over %d pages: mean=%.1fms, p50=%.1fms, "
+            "p95=%.1fms, max=%.1fms",
+            extraction["count"],
+            extraction["mean_ms"],
+            extraction["p50_ms"],
+            extraction["p95_ms"],
+            extraction["max_ms"],
+        )
+    prefetch = sections.get("prefetch")
+    if prefetch:
+        logger.info(
+            "Prefetch over %d pages: navigation=%.1fs, waited=%.1fs, "
+            "hidden=%.1fs (%.0f%%)",
+            prefetch["pages"],
+            prefetch["navigation_seconds"],
+            prefetch["waited_seconds"],
+            prefetch["hidden_seconds"],
+            prefetch["overlap_ratio"] * 100,
+        )
+    incidents = sections.get("incidents")
+    if incidents:
+        logger.warning(
+            "Watchdog incidents: %d (%s), urls requeued=%d, given up=%d",
+            incidents["total"],
+            ", ".join(f"{k}={n}" for k, n in incidents["kinds"].items()),
+            incidents["requeued"],
+            incidents["given_up"],
+        )
+
+
+def write_summary(summary: dict, path: str):
+    """Write a summary dictionary to `path` as JSON.
+
+    Args:
+        summary (dict): The summary to persist.
+        path (str): Destination file path.
+    """
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f)
+
+
+def _add(totals: dict, values: dict):
+    """Add the numeric `values` into `totals`, key by key."""
+
+    for key, value in values.items():
+        totals[key] = totals.get(key, 0) + value
+
+
+def _merge_histograms(histograms: list[LatencyHistogram]) -> LatencyHistogram:
+    """Merge histograms into the first one and return it."""
+
+    merged = histograms[0]
+    for histogram in histograms[1:]:
+        merged.merge(histogram)
+    return merged
+
+
+def _merge_class_latency(values: list[dict]) -> dict:
+    """Merge the `class_latency` sections of several reports."""
+
+    classes: dict[str, list] = {}
+    for value in values:
+        for name, stats in value.items():
+            classes.setdefault(name, []).append(stats)
+    merged = {}
+    for name, entries in classes.items():
+        histogram = _merge_histograms(
+            [LatencyHistogram.from_dict(stats["histogram"]) for stats in entries]
+        )
+        merged[name] = {
+            **_class_stats(histogram, sum(s["missed_deadlines"] for s in entries)),
+            "histogram": histogram.to_dict(),
+        }
+    return merged
+
+
+def _merge_sections(sections: dict[str, list]) -> dict:
+    """Merge the values each report had for every section.
+
+    Args:
+        sections (dict[str, list]): The values of each section, in
+            report order; worker ids must already be unique.
+
+    Returns:
+        dict: The merged non-empty sections.
+    """
+    merged: dict = {}
+
+    failures: dict[str, int] = {}
+    for value in sections["failures"]:
+        _add(failures, value)
+    merged["failures"] = dict(sorted(failures.items(), key=lambda i: -i[1]))
+
+    merged["workers"] = {}
+    for value in sections["workers"]:
+        merged["workers"].update(value)
+
+    if sections["page_latency"]:
+        latency = _merge_histograms(
+            [
+                LatencyHistogram.from_dict(v["histogram"])
+                for v in sections["page_latency"]
+            ]
+        )
+        merged["page_latency"] = {**latency.stats(), "histogram": latency.to_dict()}
+
+    # Shards start together, so entries with the same offset line up.
+    timeline: dict[int, dict] = {}
+    for value in sections["throughput"]:
+        for entry in value:
+            _add(timeline.setdefault(entry["start"], {}), entry)
+    merged["throughput"] = [
+        {
+            **entry,
+            "start": start,
+            "pages_per_minute": round(entry["pages_per_minute"], 1),
+        }
+        for start, entry in sorted(timeline.items())
+    ]
+
+    merged["class_latency"] = _merge_class_latency(sections["class_latency"])
+
+    cost = dict.fromkeys(
+        ("pages", "cpu_seconds", "bytes", "cdp_messages", "cdp_bytes"), 0
+    )
+    for value in sections["page_cost"]:
+        _add(cost, {key: value[key] for key in cost})
+    merged["page_cost"] = _page_cost(cost)
+
+    if sections["extraction_time"]:
+        histogram = _merge_histograms(
+            [
+                LatencyHistogram.from_dict(v["histogram"])
+                for v in sections["extraction_time"]
+            ]
+        )
+        merged["extraction_time"] = {
+            **_extraction_stats(histogram),
+            "histogram": histogram.to_dict(),
+        }
+
+    prefetch = dict.fromkeys(("pages", "navigation_seconds", "waited_seconds"), 0)
+    for value in sections["prefetch"]:
+        _add(prefetch, {key: value[key] for key in prefetch})
+    merged["prefetch"] = _prefetch(prefetch)
+
+    kinds: dict[str, int] = {}
+    recovery = {"requeued": 0, "given_up": 0}
+    for value in sections["incidents"]:
+        _add(kinds, value["kinds"])
+        _add(recovery, {key: value[key] for key in recovery})
+    merged["incidents"] = _incidents(kinds, recovery)
+
+    return {name: value for name, value in merged.items() if value}
+
+
+# Outcome counts and sections of `ScrapeReport.to_dict`.
+_COUNTS = ("saved", "failed", "total")
+_SECTIONS = (
+    "failures",
+    "workers",
+    "page_latency",
+    "throughput",
+    "class_latency",
+    "page_cost",
+    "extraction_time",
+    "prefetch",
+    "incidents",
+)
+
+
+def merge_summaries(summaries: Iterable[dict]) -> dict:
+    """Combine the summaries produced by several independent reports.
+
+    Counts and totals are added up, histograms are merged and their
+    percentiles recomputed, and the throughput timelines are added up
+    by offset. Worker ids are prefixed with the report's `shard`, or its
+    position among `summaries`, since every process numbers its workers
+    from 1. The elapsed time is that of the longest report.
+
+    Args:
+        summaries (Iterable[dict]): Summaries as returned by
+            `ScrapeReport.summary` or `ScrapeReport.to_dict`.
+
+    Returns:
+        dict: A single summary in the format of `ScrapeReport.to_dict`.
+
+    Raises:
+        ValueError: If a summary has a key this function cannot merge,
+        so that no section is silently dropped.
+    """
+    merged: dict = dict.fromkeys(_COUNTS, 0)
+    sections: dict[str, list] = {name: [] for name in _SECTIONS}
+    elapsed = None
+    for position, summary in enumerate(summaries):
+        label = summary.get("shard", position)
+        for key, value in summary.items():
+            if key in _COUNTS:
+                merged[key] += value
+            elif key == "elapsed_seconds":
+                elapsed = max(elapsed or 0.0, value)
+            elif key == "workers":
+                sections[key].append({f"{label}:{k}": v for k, v in value.items()})
+            elif key in sections:
+                sections[key].append(value)
+            elif key not in ("shard", "pages_per_minute"):
+                raise ValueError(f"Cannot merge report key {key!r}")
+
+    if elapsed is not None:
+        merged["elapsed_seconds"] = elapsed
+        merged["pages_per_minute"] = round(
+            merged["total"] * 60 / elapsed if elapsed else 0.0, 1
+        )
+    merged.update(_merge_sections(sections))
+    return merged
+
+
+def log_merged_summary(summary: dict):
+    """Log a summary merged from several processes."""
+
+    logger.info(
+        "Sharded scraping completed. Total=%d, Saved=%d, Failed=%d",
+        summary["total"],
+        summary["saved"],
+        summary["failed"],
+    )
+    if summary.get("failed_shards"):
+        logger.error(
+            "Shards %s failed; the summary only covers the others",
+            ", ".join(summary["failed_shards"]),
+        )
+    _log_details(summary, summary)
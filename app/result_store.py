@@ -0,0 +1,197 @@
+"""SQLite-backed result store with upserts and indexed lookups."""
+
+import asyncio
+import sqlite3
+from typing import Iterator, Optional
+
+from app.observability import get_logger
+from app.records import PageRecord, loads
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    page_key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    display_name TEXT,
+    latitude REAL,
+    longitude REAL,
+    payload TEXT NOT NULL,
+    scraped_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_scraped_at ON pages (scraped_at);
+"""
+
+_UPSERT = """
+INSERT INTO pages (
+    page_key, url, display_name, latitude, longitude, payload, scraped_at
+) VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (page_key) DO UPDATE SET
+    url = excluded.url,
+    display_name = excluded.display_name,
+    latitude = excluded.latitude,
+    longitude = excluded.longitude,
+    payload = excluded.payload,
+    scraped_at = excluded.scraped_at
+"""
+
+
+def connect(
+    path: str, schema: str, check_same_thread: bool = True
+) -> sqlite3.Connection:
+    """Open a SQLite database in WAL mode and create its schema.
+
+    WAL lets readers query the database while a run writes to it, and
+    several processes share it through the 30 second busy timeout.
+
+    Args:
+        path (str): Path to the database file.
+        schema (str): `CREATE ... IF NOT EXISTS` statements.
+        check_same_thread (bool): Reject the use of the connection from
+            other threads than the creating one.
+
+    Returns:
+        sqlite3.Connection: The open connection.
+    """
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=check_same_thread)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(schema)
+    return conn
+
+
+class SQLiteResultStore:
+    """Upsert scraped payloads into a single SQLite database.
+
+    Each page is stored once, keyed by its canonical page key, so
+    re-scraping a page replaces its previous row. Writes are buffered
+    and committed in batches inside a WAL-mode database, which is far
+    cheaper than creating one file per page and lets readers query the
+    store while a run is in progress. Inside the event loop, batches are
+    committed in a worker thread, one at a time and in order.
+    """
+
+    def __init__(self, path: str, batch_size: int = 100):
+        """Open (and create if needed) the result database.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            batch_size (int): Number of buffered rows that triggers a
+                commit.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._pending: list[tuple] = []
+        self._flushing = asyncio.Lock()
+        self._conn = connect(path, _SCHEMA, check_same_thread=False)
+
+    async def write(self, record: PageRecord) -> None:
+        """Buffer the page for upsert, committing full batches."""
+
+        self._pending.append(self._row(record))
+        if len(self._pending) >= self.batch_size:
+            await self._flush_in_thread()
+
+    async def checkpoint(self) -> bool:
+        """Commit the buffered rows."""
+
+        await self._flush_in_thread()
+        return True
+
+    async def close(self) -> None:
+        """Commit buffered rows and close the database."""
+
+        await self._flush_in_thread()
+        self._conn.close()
+
+    def shutdown(self):
+        """Synchronous counterpart of `close` for use outside the event loop."""
+
+        self.flush()
+        self._conn.close()
+
+    def add(self, record: PageRecord):
+        """Buffer a row, flushing when the batch is full.
+
+        Args:
+            record (PageRecord): The scraped page.
+        """
+        self._pending.append(self._row(record))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Upsert all buffered rows in one transaction."""
+
+        self._upsert(self._pending)
+        self._pending.clear()
+
+    async def _flush_in_thread(self):
+        """Run `flush` in a worker thread, keeping the event loop responsive.
+
+        Pages written meanwhile are buffered for the next batch; the rows
+        go back to the buffer if the commit fails.
+        """
+        async with self._flushing:
+            rows, self._pending = self._pending, []
+            try:
+                await asyncio.to_thread(self._upsert, rows)
+            except BaseException:
+                self._pending[:0] = rows
+                raise
+
+    @staticmethod
+    def _row(record: PageRecord) -> tuple:
+        """Return the column values of a page."""
+
+        return (
+            record.page_key,
+            record.url,
+            record.display_name,
+            record.latitude,
+            record.longitude,
+            record.dumps().decode("utf-8"),
+            record.scraped_at,
+        )
+
+    def _upsert(self, rows: list[tuple]):
+        """Upsert rows in one transaction."""
+
+        if not rows:
+            return
+
+        with self._conn:
+            self._conn.executemany(_UPSERT, rows)
+
+        logger.info("Upserted %d pages into %s", len(rows), self.path)
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the stored payload for a page key, if any.
+
+        Args:
+            key (str): The canonical page key.
+
+        Returns:
+            Optional[dict]: The payload, or None if the page is unknown.
+        """
+        row = self._conn.execute(
+            "SELECT payload FROM pages WHERE page_key = ?", (key,)
+        ).fetchone()
+        return loads(row[0]) if row else None
+
+    def iter_since(self, since: float = 0.0) -> Iterator[tuple[str, float, dict]]:
+        """Iterate over pages scraped at or after `since`, oldest first.
+
+        Args:
+            since (float): Unix timestamp lower bound.
+
+        Yields:
+            tuple[str, float, dict]: Page key, scrape time and payload.
+        """
+        rows = self._conn.execute(
+            "SELECT page_key, scraped_at, payload FROM pages "
+            "WHERE scraped_at >= ? ORDER BY scraped_at",
+            (since,),
+        )
+        for key, scraped_at, payload in rows:
+            yield key, scraped_at, loads(payload)
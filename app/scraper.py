@@ -1,160 +1,267 @@
 """Page scraping and data extraction logic for Facebook business pages."""
 
 import json
+from dataclasses import dataclass
 from typing import Optional
 
 from nodriver import Tab
 
+from app.archive import CaptureArchive
+from app.capture import ResponseCapture
+from app.cookies import CONSENT_LABELS
+from app.extraction import MAX_DEPTH, wrap_json_blobs
 from app.observability import get_logger, log_resources
 from app.performance import Timer
+from app.records import PageRecord
 from app.reporting import ScrapeReport
-from app.utils import is_json_string, safe_filename
+from app.sinks import JsonFileSink, ResultSink
 
 logger = get_logger(__name__)
 
-
-async def extract_page_title(tab: Tab) -> Optional[str]:
-    """Extract the document title from the current page.
-
-    This function retrieves the value of `document.title` via JavaScript
-    execution. If the title cannot be extracted or an error occurs,
-    the function returns `None` and logs a warning.
-
-    Args:
-        tab (Tab): The Nodriver tab instance representing the current page.
-
-    Returns:
-        Optional[str]: The page title if available, otherwise None.
-    """
-    try:
-        result = await tab.evaluate("document.title")
-        if isinstance(result, str) and result.strip():
-            return result.strip()
-    except Exception as e:
-        logger.warning("Unable to extract <title>: %s", e)
-    return None
-
-
-async def extract_about_via_js(tab: Tab) -> str:
-    """Extract business "About" information using in-page JavaScript.
-
-    This function executes a JavaScript snippet that scans embedded
-    JSON blobs within the page, recursively searching for the
-    `about_app_sections` structure. The extracted data is normalized
-    and returned as a JSON-formatted string.
-
-    Args:
-        tab (Tab): The Nodriver tab instance from which data is extracted.
-
-    Returns:
-        str: A JSON-formatted string containing the extracted business
-        information.
-
-    Raises:
-        RuntimeError: If the expected `about_app_sections` data cannot
-        be found within the page.
-    """
-    logger.info("Extracting About payload via in-page JS")
-
-    js = r"""
-    (() => {
-      const scripts = Array.from(
-        document.querySelectorAll('script[type="application/json"]')
-      ).filter(s => s.textContent.includes("about_app_sections"));
-
-      const blobs = scripts
-        .map(s => {
-          try { return JSON.parse(s.textContent); }
-          catch { return null; }
-        })
-        .filter(Boolean);
-
-      function deepFindAbout(node) {
-        if (!node || typeof node !== 'object') return null;
-        if (node.about_app_sections?.nodes) return node.about_app_sections;
-
-        for (const key in node) {
-          const v = node[key];
-          if (!v || typeof v !== 'object') continue;
-          const found = deepFindAbout(v);
-          if (found) return found;
-        }
-        return null;
+# Defines `extractAbout()`, returning the About payload as a JSON string,
+# or null when the page holds no `about_app_sections`. Candidate scripts
+# are parsed one at a time in document order and the search stops at the
+# first hit; each blob is walked iteratively down to `MAX_DEPTH` levels.
+_EXTRACT_ABOUT_FN = r"""
+function extractAbout() {
+  function findAbout(root) {
+    const stack = [[root, 0]];
+    while (stack.length) {
+      const [node, depth] = stack.pop();
+      if (node.about_app_sections?.nodes) return node.about_app_sections;
+      if (depth >= __MAX_DEPTH__) continue;
+
+      const children = Object.values(node);
+      for (let i = children.length - 1; i >= 0; i--) {
+        const v = children[i];
+        if (v && typeof v === 'object') stack.push([v, depth + 1]);
       }
-
-      const about = blobs.map(deepFindAbout).find(Boolean);
-      if (!about) return null;
-
-      const result = {};
-      for (const section of about.nodes || []) {
-        for (const collection of section.activeCollections?.nodes || []) {
-          const renderer = collection.style_renderer;
-          if (!renderer) continue;
-
-          for (const fieldSection of renderer.profile_field_sections || []) {
-            for (const field of fieldSection.profile_fields?.nodes || []) {
-              const type = field.field_type;
-              const value = field.title?.text;
-              if (type && value) result[type] = value;
-
-              if (type === 'address' && field.map_pin_coordinates) {
-                result.latitude = field.map_pin_coordinates.latitude;
-                result.longitude = field.map_pin_coordinates.longitude;
-              }
-            }
+    }
+    return null;
+  }
+
+  const scripts = document.querySelectorAll('script[type="application/json"]');
+  let about = null;
+  for (const script of scripts) {
+    const text = script.textContent;
+    if (!text.includes("about_app_sections")) continue;
+
+    let blob;
+    try { blob = JSON.parse(text); }
+    catch { continue; }
+    if (!blob || typeof blob !== 'object') continue;
+
+    about = findAbout(blob);
+    if (about) break;
+  }
+  if (!about) return null;
+
+  const result = {};
+  for (const section of about.nodes || []) {
+    for (const collection of section.activeCollections?.nodes || []) {
+      const renderer = collection.style_renderer;
+      if (!renderer) continue;
+
+      for (const fieldSection of renderer.profile_field_sections || []) {
+        for (const field of fieldSection.profile_fields?.nodes || []) {
+          const type = field.field_type;
+          const value = field.title?.text;
+          if (type && value) result[type] = value;
+
+          if (type === 'address' && field.map_pin_coordinates) {
+            result.latitude = field.map_pin_coordinates.latitude;
+            result.longitude = field.map_pin_coordinates.longitude;
           }
         }
       }
-      return JSON.stringify(result);
-    })();
-    """
-
-    data = await tab.evaluate(js, return_by_value=True)
-    if not data:
-        raise RuntimeError("about_app_sections not found via JS")
-
-    if not isinstance(data, str):
-        raise RuntimeError("Expected JSON string from JS evaluation")
+    }
+  }
+  return JSON.stringify(result);
+}
+""".replace("__MAX_DEPTH__", str(MAX_DEPTH))
+
+# Reads everything `scrape` needs from the page in a single evaluation;
+# called with the consent labels and the dismiss, extract and collect
+# flags. With `collect`, the raw JSON blobs mentioning the About sections
+# are returned as well, for the capture archive.
+_PAGE_PROBE_JS = "((labels, dismiss, extract, collect) => {" + _EXTRACT_ABOUT_FN + r"""
+  let consent = null;
+  for (const label of labels) {
+    const btn = document.querySelector(`[aria-label="${label}"]`);
+    if (btn) {
+      if (dismiss) btn.click();
+      consent = label;
+      break;
+    }
+  }
+  const started = performance.now();
+  const about = extract ? extractAbout() : null;
+  const extractionMs = performance.now() - started;
+  const blobs = collect
+    ? Array.from(
+        document.querySelectorAll('script[type="application/json"]'),
+        (script) => script.textContent,
+      ).filter((text) => text.includes("about_app_sections"))
+    : null;
+  return {
+    title: document.title,
+    readyState: document.readyState,
+    consent,
+    about,
+    extractionMs,
+    blobs,
+  };
+})"""
+
+
+@dataclass(frozen=True)
+class PageProbe:
+    """State of the current page as read by `probe_page`."""
+
+    title: Optional[str]
+    ready_state: str
+    consent: Optional[str]
+    about: Optional[str]
+    extraction_ms: float = 0.0
+    blobs: tuple[str, ...] = ()
+
+
+async def probe_page(
+    tab: Tab,
+    extract: bool = True,
+    dismiss_consent: bool = False,
+    collect: bool = False,
+) -> PageProbe:
+    """Read title, readiness, consent banner and About payload at once.
+
+    Every CDP command is a round trip over the browser's websocket; this
+    replaces the separate title, cookie and extraction evaluations with
+    a single one.
 
-    logger.info("Business data extracted successfully")
-    return data
+    Args:
+        tab (Tab): The Nodriver tab instance currently loaded with the
+            target page.
+        extract (bool): Whether to run the About extraction; False when
+            the payload comes from captured network responses.
+        dismiss_consent (bool): Whether to click the consent button
+            when the banner is present.
+        collect (bool): Whether to also return the raw JSON blobs
+            mentioning the About sections.
 
+    Returns:
+        PageProbe: The page state. `consent` is the label of the consent
+        button found, `about` the payload as a JSON string, or None if
+        not extracted or not found. `extraction_ms` is the time the
+        extraction took in the page, measured with `performance.now()`.
+        `blobs` holds the collected JSON texts.
 
-async def scrape(tab: Tab, report: ScrapeReport):
+    Raises:
+        RuntimeError: If the evaluation fails in the page.
+    """
+    flags = [list(CONSENT_LABELS), dismiss_consent, extract, collect]
+    arguments = json.dumps(flags)[1:-1]
+    expression = f"{_PAGE_PROBE_JS}({arguments})"
+    result = await tab.evaluate(expression, return_by_value=True)
+    if not isinstance(result, dict):
+        raise RuntimeError(f"Page probe failed: {result!r}")
+
+    title = result.get("title")
+    return PageProbe(
+        title=title.strip() or None if isinstance(title, str) else None,
+        ready_state=result.get("readyState", ""),
+        consent=result.get("consent"),
+        about=result.get("about"),
+        extraction_ms=float(result.get("extractionMs") or 0.0),
+        blobs=tuple(result.get("blobs") or ()),
+    )
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+async def scrape(
+    tab: Tab,
+    report: ScrapeReport,
+    sink: Optional[ResultSink] = None,
+    settle: float = 4,
+    capture: Optional[ResponseCapture] = None,
+    dismiss_consent: bool = False,
+    archive: Optional[CaptureArchive] = None,
+):
     """Scrape business information from the current page and persist it.
 
     This function orchestrates the scraping process for a single page:
-    it waits for the DOM to stabilize, extracts the page title and
-    business "About" data, validates the extracted payload, and writes
-    the resulting data to a JSON file on disk.
+    it waits for the DOM to stabilize, probes the page for its title,
+    consent banner and business "About" data in a single evaluation,
+    parses the extracted payload once into a `PageRecord`, and hands
+    the record to the output sink.
 
     Args:
         tab (Tab): The Nodriver tab instance currently loaded with the
             target page.
+        report (ScrapeReport): Report collecting the outcome.
+        sink (Optional[ResultSink]): Output backend; defaults to one
+            JSON file per page under `data/`.
+        settle (float): Seconds to let the page settle before extracting;
+            0 when the caller already waited for the About blob.
+        capture (Optional[ResponseCapture]): Network capture of the
+            page; when it yields the payload, the probe skips the
+            extraction. The JavaScript extraction is the fallback.
+        dismiss_consent (bool): Whether the probe clicks the cookie
+            consent button.
+        archive (Optional[CaptureArchive]): Archive receiving the raw
+            response body or JSON blobs the payload is extracted from,
+            even when the extraction finds nothing.
+
+    Raises:
+        RuntimeError: If the page holds no `about_app_sections`.
     """
-    await tab.wait(4)
+    if settle:
+        await tab.wait(settle)
     logger.info("DOM ready, skipping full HTML dump")
 
     t = Timer()
-    title = await extract_page_title(tab)
-    data = await extract_about_via_js(tab)
-    log_resources("after about extraction")
-
-    if not is_json_string(data):
-        logger.warning("About payload non è JSON valido: %r", data)
-        await report.record_failed()
-        return
-
-    logger.info("About extraction: %.3fs", t.lap())
-
-    filename = f"data/{safe_filename(tab.target.url)}.json"
-    payload = json.loads(data)
-    payload["display_name"] = title
-
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2, ensure_ascii=False)
+    payload = await capture.payload() if capture is not None else None
+    collect = archive is not None and payload is None
+    probe = await probe_page(tab, payload is None, dismiss_consent, collect)
+    if probe.consent:
+        logger.info(
+            "Cookie banner found (dismissed=%s): %s", dismiss_consent, probe.consent
+        )
+
+    if archive is not None:
+        raw = capture.body if capture is not None and payload is not None else None
+        body = raw or wrap_json_blobs(list(probe.blobs))
+        if body:
+            await archive.add(tab.target.url, probe.title, body)
+
+    if payload is not None:
+        logger.info("About payload extracted from network responses")
+        record = PageRecord.from_payload(tab.target.url, payload, probe.title)
+    else:
+        if capture is not None:
+            logger.warning("About payload not captured, falling back to in-page JS")
+
+        await report.record_extraction_time(probe.extraction_ms)
+        data = probe.about
+        if not data:
+            raise RuntimeError("about_app_sections not found via JS")
+        log_resources("after about extraction")
+
+        try:
+            record = PageRecord.from_json(tab.target.url, data, probe.title)
+        except ValueError:
+            logger.warning("About payload non è JSON valido: %r", data)
+            await report.record_failed("invalid_payload")
+            return
+
+    logger.info(
+        "About extraction: %.3fs (in-page %.1fms, readyState=%s)",
+        t.lap(),
+        probe.extraction_ms,
+        probe.ready_state,
+    )
+
+    await (sink or JsonFileSink()).write(record)
 
     await report.record_saved()
 
-    logger.info("Saved output to %s", filename)
     logger.info("Scraping completed successfully")
@@ -0,0 +1,151 @@
+"""Static work sharding across processes and machines."""
+
+import hashlib
+import json
+import subprocess  # nosec B404
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+from app.observability import get_logger
+from app.reporting import merge_summaries
+from app.utils import page_key
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Shard:
+    """A single slice of the input, identified as `index/count`."""
+
+    index: int
+    count: int
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def parse_shard(spec: str) -> Shard:
+    """Parse a shard specification of the form `i/n`.
+
+    Shard indices are zero-based, so valid specifications for a job
+    split in four are `0/4`, `1/4`, `2/4` and `3/4`.
+
+    Args:
+        spec (str): The shard specification.
+
+    Returns:
+        Shard: The parsed shard.
+
+    Raises:
+        ValueError: If the specification is malformed or out of range.
+    """
+    try:
+        index_str, count_str = spec.split("/")
+        index, count = int(index_str), int(count_str)
+    except ValueError as e:
+        raise ValueError(f"Invalid shard specification {spec!r}, expected i/n") from e
+
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard out of range in {spec!r}, expected 0 <= i < n")
+
+    return Shard(index, count)
+
+
+def shard_of(key: str, count: int) -> int:
+    """Return the shard a page key belongs to.
+
+    The assignment uses a stable digest rather than Python's salted
+    `hash()`, so every process and every machine agrees on it without
+    any coordination.
+
+    Args:
+        key (str): The canonical page key.
+        count (int): Total number of shards.
+
+    Returns:
+        int: The zero-based shard index.
+    """
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count
+
+
+def select_shard(urls: List[str], shard: Shard) -> List[str]:
+    """Keep only the URLs whose canonical page key falls into `shard`.
+
+    Args:
+        urls (List[str]): The complete list of input URLs.
+        shard (Shard): The shard owned by the current process.
+
+    Returns:
+        List[str]: The URLs assigned to the shard, in input order.
+    """
+    return [url for url in urls if shard_of(page_key(url), shard.count) == shard.index]
+
+
+def run_local_shards(
+    urls_file: str,
+    processes: int,
+    browsers: int,
+    extra_args: List[str] | None = None,
+) -> dict:
+    """Run one orchestrator process per shard and merge their reports.
+
+    Each child process owns shard `i/processes`, launches its own
+    browsers and uses a dedicated profile namespace so that no two
+    Chromium instances share a user data directory.
+
+    Args:
+        urls_file (str): Path to the input URL file shared by all shards.
+        processes (int): Number of orchestrator processes to start.
+        browsers (int): Browser instances launched by each process.
+        extra_args (List[str] | None): Additional CLI arguments passed
+            through to every child process.
+
+    Returns:
+        dict: The merged summary of the child reports. If any child
+        exits with a non-zero status, the summary only covers the
+        others and lists the failed shards under `failed_shards`.
+    """
+    with tempfile.TemporaryDirectory(prefix="fb-shards-") as tmp:
+        children = []
+        for index in range(processes):
+            report_file = Path(tmp) / f"shard-{index}.json"
+            cmd = [
+                sys.executable,
+                "-m",
+                "app.main",
+                "--urls-file",
+                urls_file,
+                "--browsers",
+                str(browsers),
+                "--shard",
+                str(Shard(index, processes)),
+                "--profile-namespace",
+                f"shard{index}",
+                "--report-file",
+                str(report_file),
+                *(extra_args or []),
+            ]
+            logger.info("Launching shard %d/%d", index, processes)
+            # pylint: disable-next=consider-using-with
+            child = subprocess.Popen(cmd)  # nosec B603
+            children.append((index, report_file, child))
+
+        failed = []
+        summaries = []
+        for index, report_file, child in children:
+            shard = str(Shard(index, processes))
+            if child.wait() != 0:
+                logger.error("Shard %s exited with status %d", shard, child.returncode)
+                failed.append(shard)
+                continue
+            with open(report_file, "r", encoding="utf-8") as f:
+                summaries.append({**json.load(f), "shard": shard})
+
+    merged = merge_summaries(summaries)
+    if failed:
+        merged["failed_shards"] = failed
+    return merged
@@ -0,0 +1,104 @@
+"""Output sinks persisting scraped payloads."""
+
+import os
+from typing import Protocol
+
+from app.columnar import COLUMNAR_FORMATS, ColumnarSink
+from app.fanout import ShardedJsonSink
+from app.observability import get_logger
+from app.records import PageRecord
+from app.result_store import SQLiteResultStore
+from app.utils import safe_filename
+
+logger = get_logger(__name__)
+
+
+class ResultSink(Protocol):
+    """Protocol implemented by every output backend."""
+
+    async def write(self, record: PageRecord) -> None:
+        """Persist a scraped page."""
+
+    async def checkpoint(self) -> bool:
+        """Flush pending writes.
+
+        Returns:
+            bool: Whether every page written so far now survives a
+            crash.
+        """
+
+    async def close(self) -> None:
+        """Flush pending writes and release resources."""
+
+
+class JsonFileSink:
+    """Write one pretty-printed JSON file per page into a directory.
+
+    This is the historical output format: files are named after the
+    page URL path via `safe_filename`.
+    """
+
+    def __init__(self, directory: str = "data"):
+        """Initialize the sink for the given output directory."""
+
+        self.directory = directory
+
+    def path_for(self, url: str) -> str:
+        """Return the output file path for a page URL."""
+
+        return f"{self.directory}/{safe_filename(url)}.json"
+
+    async def write(self, record: PageRecord) -> None:
+        """Write the payload to its JSON file, replacing any previous one."""
+
+        filename = self.path_for(record.url)
+        with open(filename, "wb") as f:
+            f.write(record.dumps(indent=True, with_url=True))
+
+        logger.info("Saved output to %s", filename)
+
+    async def checkpoint(self) -> bool:
+        """Nothing to flush: every write is a complete file."""
+
+        return True
+
+    async def close(self) -> None:
+        """Nothing to flush: every write is a complete file."""
+
+
+SINK_KINDS = ("json", "json-sharded", "sqlite", *COLUMNAR_FORMATS)
+
+
+def build_sink(
+    kind: str,
+    *,
+    data_dir: str = "data",
+    db_path: str = "",
+    columnar_path: str = "",
+) -> ResultSink:
+    """Create the output sink selected on the command line.
+
+    Args:
+        kind (str): One of `SINK_KINDS`.
+        data_dir (str): Output directory for file-based sinks.
+        db_path (str): Database path for the SQLite sink; defaults to
+            `results.sqlite` inside `data_dir`.
+        columnar_path (str): Output file for the Parquet and Arrow
+            sinks; defaults to `results.<kind>` inside `data_dir`.
+
+    Returns:
+        ResultSink: The configured sink.
+
+    Raises:
+        ValueError: If `kind` is unknown.
+    """
+    if kind == "json":
+        return JsonFileSink(data_dir)
+    if kind == "json-sharded":
+        return ShardedJsonSink(data_dir)
+    if kind == "sqlite":
+        return SQLiteResultStore(db_path or os.path.join(data_dir, "results.sqlite"))
+    if kind in COLUMNAR_FORMATS:
+        default_path = os.path.join(data_dir, f"results.{kind}")
+        return ColumnarSink(columnar_path or default_path, kind)
+    raise ValueError(f"Unknown sink kind {kind!r}, expected one of {SINK_KINDS}")
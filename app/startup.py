@@ -0,0 +1,99 @@
+"""Startup instrumentation: deferred import timing and first-page latency."""
+
+import importlib
+import json
+import sys
+import time
+from types import ModuleType
+from typing import Optional
+
+import app
+from app.observability import get_logger
+
+logger = get_logger(__name__)
+
+
+class StartupProfile:
+    """Record how long deferred imports and startup milestones take.
+
+    Times are measured from `origin`, which defaults to the moment the
+    `app` package was first imported, i.e. before any CLI dependency.
+    """
+
+    def __init__(self, origin: Optional[float] = None) -> None:
+        self.origin = app.IMPORTED_AT if origin is None else origin
+        self.imports: dict[str, dict] = {}
+        self.milestones: dict[str, float] = {}
+
+    def import_module(self, name: str) -> ModuleType:
+        """Import `name`, recording its cumulative import time.
+
+        Only the first, cold import of a module is recorded, together
+        with the top-level packages it pulled in.
+        """
+        if name in sys.modules:
+            return sys.modules[name]
+
+        before = set(sys.modules)
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        elapsed = time.perf_counter() - start
+
+        loaded = set(sys.modules) - before
+        self.imports[name] = {
+            "ms": round(elapsed * 1000, 1),
+            "modules": len(loaded),
+            "packages": sorted({m.split(".", 1)[0] for m in loaded}),
+        }
+        return module
+
+    def mark(self, milestone: str) -> None:
+        """Record the first time a milestone is reached."""
+
+        if milestone not in self.milestones:
+            elapsed = time.perf_counter() - self.origin
+            self.milestones[milestone] = round(elapsed * 1000, 1)
+
+    def report(self) -> dict:
+        """Return the recorded imports and milestones in milliseconds."""
+
+        return {"imports_ms": self.imports, "milestones_ms": self.milestones}
+
+    def log_report(self) -> None:
+        """Log one line per deferred import and per milestone."""
+
+        for name, info in self.imports.items():
+            logger.info(
+                "Startup import %s: %.1f ms (%d modules, packages=%s)",
+                name,
+                info["ms"],
+                info["modules"],
+                ",".join(info["packages"]),
+            )
+        for milestone, ms in self.milestones.items():
+            logger.info("Startup milestone %s at %.1f ms", milestone, ms)
+
+    def write(self, path: str) -> None:
+        """Write the report as JSON to `path`."""
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+# Process-wide profile; always collected since recording is negligible.
+_profile = StartupProfile()  # pylint: disable=invalid-name
+
+
+def get_profile() -> StartupProfile:
+    """Return the process-wide startup profile."""
+    return _profile
+
+
+def timed_import(name: str) -> ModuleType:
+    """Import a deferred module through the process-wide profile."""
+    return _profile.import_module(name)
+
+
+def mark(milestone: str) -> None:
+    """Record a startup milestone on the process-wide profile."""
+    _profile.mark(milestone)
@@ -0,0 +1,118 @@
+"""Chromium performance traces of a sample of pages via the CDP Tracing domain."""
+
+import asyncio
+import json
+import os
+from typing import Optional
+
+from nodriver import Tab, cdp
+
+from app.observability import get_logger
+
+logger = get_logger(__name__)
+
+# Categories recorded by the DevTools performance panel.
+TRACE_CATEGORIES = [
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "v8.execute",
+    "blink.user_timing",
+    "loading",
+]
+
+
+class PageTracer:  # pylint: disable=too-many-instance-attributes
+    """Record a Chromium trace for a fraction of the pages of a tab.
+
+    Pages are sampled deterministically: with a rate of 0.1 every tenth
+    page is traced. Trace events are streamed back as `dataCollected`
+    events and written as `trace-<worker>-<page>.json` in the format read
+    by the DevTools performance panel and Perfetto.
+    """
+
+    def __init__(self, tab: Tab, directory: str, rate: float, worker_id: int = 0):
+        """Attach the tracer to a tab; call `enable` before use.
+
+        Args:
+            tab (Tab): The traced tab.
+            directory (str): Output directory of the trace files.
+            rate (float): Fraction of pages traced, between 0 and 1.
+            worker_id (int): Worker id used in the file names.
+        """
+        self.tab = tab
+        self.directory = directory
+        self.rate = rate
+        self.worker_id = worker_id
+        self._credit = 0.0
+        self._pages = 0
+        self._events: Optional[list] = None
+        self._complete: Optional[asyncio.Future] = None
+
+    def enable(self):
+        """Register the tracing event handlers."""
+
+        self.tab.add_handler(cdp.tracing.DataCollected, self._on_data)
+        self.tab.add_handler(cdp.tracing.TracingComplete, self._on_complete)
+
+    def _on_data(self, event: cdp.tracing.DataCollected, _connection=None):
+        if self._events is not None:
+            self._events.extend(event.value)
+
+    def _on_complete(self, event: cdp.tracing.TracingComplete, _connection=None):
+        if self._complete is not None and not self._complete.done():
+            self._complete.set_result(event.data_loss_occurred)
+
+    async def start(self):
+        """Start tracing the next page if it is sampled."""
+
+        self._pages += 1
+        self._credit += self.rate
+        if self._credit < 1:
+            return
+        self._credit -= 1
+
+        self._events = []
+        self._complete = asyncio.get_running_loop().create_future()
+        await self.tab.send(
+            cdp.tracing.start(
+                transfer_mode="ReportEvents",
+                trace_config=cdp.tracing.TraceConfig(
+                    included_categories=TRACE_CATEGORIES
+                ),
+            )
+        )
+
+    async def finish(self, url: str, timeout: float = 30) -> Optional[str]:
+        """Stop tracing the current page and write its trace.
+
+        Args:
+            url (str): The traced page, recorded in the trace metadata.
+            timeout (float): Seconds to wait for the buffered events.
+
+        Returns:
+            Optional[str]: Path of the trace file, or None if the page
+            was not traced.
+        """
+        if self._events is None or self._complete is None:
+            return None
+
+        try:
+            await self.tab.send(cdp.tracing.end())
+            data_loss = await asyncio.wait_for(self._complete, timeout)
+            events = self._events
+        finally:
+            self._events = self._complete = None
+
+        path = os.path.join(
+            self.directory, f"trace-{self.worker_id}-{self._pages}.json"
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "traceEvents": events,
+                    "metadata": {"url": url, "dataLoss": data_loss},
+                },
+                f,
+            )
+        logger.info("Trace of %s written to %s (%d events)", url, path, len(events))
+        return path
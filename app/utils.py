@@ -1,26 +1,8 @@
-"""Shared utility functions for URL handling, validation, and batching."""
+"""Shared utility functions for URL handling and validation."""
 
-import json
 import re
-from urllib.parse import urlparse, urlunparse
-
-
-def chunked(lst, n):
-    """Yield successive chunks from a list.
-
-    This generator splits a list into consecutive sublists of a given
-    size. The final chunk may be smaller if the list length is not
-    evenly divisible by the chunk size.
-
-    Args:
-        lst (list): The list to be split into chunks.
-        n (int): The maximum size of each chunk.
-
-    Yields:
-        list: A sublist containing up to `n` elements.
-    """
-    for i in range(0, len(lst), n):
-        yield lst[i : i + n]
+from typing import Optional
+from urllib.parse import parse_qs, urlparse, urlunparse
 
 
 def safe_filename(url: str) -> str:
@@ -41,25 +23,19 @@ def safe_filename(url: str) -> str:
     return path or "index"
 
 
-def is_json_string(value) -> bool:
-    """Check whether a value is a valid JSON-formatted string.
-
-    This function attempts to parse the given value as JSON. Only
-    string values are considered valid candidates.
+def as_float(value) -> Optional[float]:
+    """Convert a value to float, tolerating missing or malformed input.
 
     Args:
-        value (Any): The value to validate.
+        value (Any): The value to convert, typically a coordinate.
 
     Returns:
-        bool: True if the value is a valid JSON string, False otherwise.
+        Optional[float]: The float value, or None if not convertible.
     """
-    if not isinstance(value, str):
-        return False
     try:
-        json.loads(value)
-        return True
-    except json.JSONDecodeError:
-        return False
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
 
 
 def ensure_about(url: str) -> str:
@@ -90,3 +66,46 @@ def ensure_about(url: str) -> str:
         path = path + "/about"
 
     return urlunparse(parsed._replace(path=path))
+
+
+def page_key(url: str) -> str:
+    """Derive the canonical key identifying a Facebook page.
+
+    The key is independent of scheme, host, letter case, trailing
+    slashes and the `/about` suffix, so that every spelling of the same
+    page maps to the same value. Numeric `profile.php?id=` URLs are
+    keyed by their identifier.
+
+    Args:
+        url (str): The Facebook page URL.
+
+    Returns:
+        str: The canonical page key.
+    """
+    parsed = urlparse(url.strip())
+    path = parsed.path.strip("/").lower()
+
+    if path.endswith("/about"):
+        path = path[: -len("/about")]
+    elif path == "about":
+        path = ""
+
+    if path == "profile.php":
+        page_id = parse_qs(parsed.query).get("id")
+        if page_id:
+            return page_id[0]
+
+    return path or "index"
+
+
+def read_urls(path: str) -> list[str]:
+    """Read one URL per line from a text file, skipping blank lines.
+
+    Args:
+        path (str): Path to the URL file.
+
+    Returns:
+        list[str]: The stripped, non-empty lines of the file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
@@ -0,0 +1,246 @@
+"""Detection of hung tabs and dead browsers, and recovery of their work.
+
+A renderer stuck in a script or a browser process that died leaves the
+CDP commands of a worker waiting forever, stalling every URL it holds.
+The watchdog heartbeats the browser of each worker and bounds the time
+a leased page may take; on an incident the worker kills the browser,
+launches a new one with the same settings and gets its in-flight URLs
+back from its `TrackedSource`.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, List, Optional
+
+from nodriver import Browser, cdp
+
+from app.observability import get_logger
+from app.work_queue import Lease, WorkSource
+
+logger = get_logger(__name__)
+
+
+def kill_browser(browser: Browser):
+    """Kill a browser process outright and drop its connection.
+
+    A hung browser may ignore the SIGTERM sent by `Browser.stop`, so the
+    process is sent SIGKILL first.
+    """
+    process = browser._process  # pylint: disable=protected-access
+    if process is not None and process.returncode is None:
+        process.kill()
+    browser.stop()
+
+
+class TrackedSource:
+    """`WorkSource` wrapper remembering the leases a worker holds.
+
+    Leases handed out and neither acked nor nacked yet are outstanding.
+    After an incident `requeue` hands them out again, ahead of new work,
+    until a lease has been caught in `max_requeues` incidents. Requeued
+    leases stay leased from the wrapped source meanwhile, so it sees
+    exactly one ack or nack per lease, whatever the wrapped source's
+    own retry policy.
+    """
+
+    def __init__(self, source: WorkSource, max_requeues: int = 1):
+        """Wrap a work source.
+
+        Args:
+            source (WorkSource): The worker's source.
+            max_requeues (int): Incidents a lease survives before it is
+                given up, so that a page crashing every browser does not
+                hold the worker forever.
+        """
+        self.source = source
+        self.max_requeues = max_requeues
+        self.completed = 0
+        self._outstanding: dict[Lease, float] = {}
+        self._requeued: deque[Lease] = deque()
+        self._incidents: dict[Lease, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._outstanding)
+
+    async def lease(self) -> Optional[Lease]:
+        """Return a requeued lease, or the next one of the wrapped source."""
+
+        lease = (
+            self._requeued.popleft() if self._requeued else await self.source.lease()
+        )
+        if lease is not None:
+            self._outstanding[lease] = time.monotonic()
+        return lease
+
+    def _settle(self, lease: Lease):
+        self._outstanding.pop(lease, None)
+        self._incidents.pop(lease, None)
+        self.completed += 1
+
+    async def ack(self, lease: Lease) -> None:
+        """Acknowledge a processed lease to the wrapped source."""
+
+        self._settle(lease)
+        await self.source.ack(lease)
+
+    async def nack(self, lease: Lease, error: str = "") -> bool:
+        """Give a failed lease back to the wrapped source."""
+
+        self._settle(lease)
+        return await self.source.nack(lease, error)
+
+    async def extend(self, lease: Lease) -> None:
+        """Extend the lease in the wrapped source.
+
+        The page time bounded by the watchdog still counts from the
+        lease.
+        """
+        await self.source.extend(lease)
+
+    def oldest(self) -> float:
+        """Return the seconds the oldest outstanding lease has been held."""
+
+        if not self._outstanding:
+            return 0.0
+        return time.monotonic() - min(self._outstanding.values())
+
+    def requeue(self) -> tuple[int, List[Lease]]:
+        """Hand all outstanding leases out again after an incident.
+
+        Returns:
+            tuple[int, List[Lease]]: The number of requeued leases, and
+            the leases over `max_requeues`; nack them to give them up.
+        """
+        exhausted = []
+        for lease in self._outstanding:
+            incidents = self._incidents.get(lease, 0) + 1
+            if incidents > self.max_requeues:
+                exhausted.append(lease)
+            else:
+                self._incidents[lease] = incidents
+                self._requeued.append(lease)
+        requeued = len(self._outstanding) - len(exhausted)
+        self._outstanding.clear()
+        return requeued, exhausted
+
+
+class Watchdog:
+    """Watch the browser of a worker while it drains its source.
+
+    Every `interval` seconds the watchdog checks that the browser process
+    is alive, that it answers `Browser.getVersion` within `timeout`, and
+    that no lease has been outstanding for more than `page_timeout`. The
+    heartbeat is answered by the browser process itself, so a renderer
+    busy on a heavy page does not fail it; a hung renderer shows up as a
+    stalled page instead. A page thus takes at most about `page_timeout`
+    plus `interval` before its browser is replaced.
+    """
+
+    def __init__(
+        self,
+        source: TrackedSource,
+        interval: float = 10.0,
+        page_timeout: float = 120.0,
+        timeout: float = 10.0,
+    ):
+        """Create the watchdog of a worker.
+
+        Args:
+            source (TrackedSource): The worker's source, whose oldest
+                lease bounds the page time.
+            interval (float): Seconds between checks; 0 disables the
+                watchdog.
+            page_timeout (float): Seconds a lease may be outstanding; 0
+                only watches the browser.
+            timeout (float): Seconds the heartbeat may take, and the
+                cancelled work may take to stop after an incident.
+        """
+        self.source = source
+        self.interval = interval
+        self.page_timeout = page_timeout
+        self.timeout = timeout
+
+    async def check(self, browser: Browser) -> Optional[str]:
+        """Return the kind of incident the browser is in, if any.
+
+        Returns:
+            Optional[str]: `browser_crash`, `browser_unresponsive` or
+            `page_stall`, or None if all is well.
+        """
+        if browser.stopped:
+            return "browser_crash"
+        try:
+            # Unlike `wait_for`, `timeout` never swallows a cancellation of
+            # the watchdog racing with the reply.
+            async with asyncio.timeout(self.timeout):
+                await browser.connection.send(cdp.browser.get_version())
+        except TimeoutError:
+            return "browser_unresponsive"
+        except Exception as e:
+            logger.debug("Browser heartbeat failed: %s", e)
+            return "browser_crash"
+        if self.page_timeout and self.source.oldest() > self.page_timeout:
+            return "page_stall"
+        return None
+
+    async def _watch(self, browser: Browser) -> str:
+        """Check the browser periodically until an incident occurs."""
+        while True:
+            await asyncio.sleep(self.interval)
+            kind = await self.check(browser)
+            if kind is not None:
+                return kind
+
+    async def supervise(
+        self,
+        work: Awaitable[None],
+        browser: Browser,
+        kill: Callable[[], Awaitable[None]],
+    ) -> Optional[str]:
+        """Run a worker's work on a browser until it ends or an incident occurs.
+
+        On an incident the browser is killed first, so that pending CDP
+        commands fail instead of hanging, then the work is cancelled. The
+        outstanding leases are left to the caller to `requeue`.
+
+        Args:
+            work (Awaitable[None]): Drains the source using `browser`.
+            browser (Browser): The browser to watch.
+            kill (Callable[[], Awaitable[None]]): Kills the browser.
+
+        Returns:
+            Optional[str]: The kind of incident, or None if the work
+            completed.
+
+        Raises:
+            Exception: Whatever the work raised.
+        """
+        task = asyncio.ensure_future(work)
+        if not self.interval:
+            await task
+            return None
+
+        monitor = asyncio.create_task(self._watch(browser))
+        try:
+            await asyncio.wait({task, monitor}, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            task.cancel()
+            monitor.cancel()
+            await asyncio.gather(task, monitor, return_exceptions=True)
+            raise
+
+        if task.done():
+            monitor.cancel()
+            await asyncio.gather(monitor, return_exceptions=True)
+            task.result()
+            return None
+
+        kind = monitor.result()
+        logger.warning("Watchdog detected %s, killing the browser", kind)
+        await kill()
+        task.cancel()
+        done, _ = await asyncio.wait({task}, timeout=self.timeout)
+        if not done:
+            logger.warning("Work on the killed browser did not stop; abandoning it")
+        return kind
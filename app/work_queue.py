@@ -0,0 +1,370 @@
+"""Work sources feeding URLs to browser workers, including a durable queue."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Optional, Protocol
+
+from app.observability import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Lease:
+    """A unit of work handed out to a worker until it is acked or nacked."""
+
+    job_id: int
+    url: str
+    attempts: int
+    token: str = ""
+
+
+class WorkSource(Protocol):
+    """Protocol implemented by everything a browser worker can drain."""
+
+    async def lease(self) -> Optional[Lease]:
+        """Return the next unit of work, or None when drained."""
+
+    async def ack(self, lease: Lease) -> None:
+        """Mark a unit of work as successfully processed."""
+
+    async def nack(self, lease: Lease, error: str = "") -> bool:
+        """Give a unit of work back, returning True if it will be retried."""
+
+    async def extend(self, lease: Lease) -> None:
+        """Keep a unit of work leased while it is still being processed."""
+
+
+class ListWorkSource:
+    """In-memory work source over a fixed list of URLs.
+
+    Every URL is handed out exactly once; failures are not retried,
+    matching the behaviour of a plain static chunk.
+    """
+
+    def __init__(self, urls: Iterable[str]):
+        """Initialize the source from a list of URLs."""
+
+        self._pending = deque(enumerate(urls))
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def lease(self) -> Optional[Lease]:
+        """Return the next URL in input order."""
+
+        if not self._pending:
+            return None
+        job_id, url = self._pending.popleft()
+        return Lease(job_id=job_id, url=url, attempts=1)
+
+    async def ack(self, lease: Lease) -> None:  # pylint: disable=unused-argument
+        """Nothing to persist for in-memory work."""
+
+    # pylint: disable-next=unused-argument
+    async def nack(self, lease: Lease, error: str = "") -> bool:
+        """Drop the failed URL; in-memory work is never retried."""
+
+        return False
+
+    async def extend(self, lease: Lease) -> None:  # pylint: disable=unused-argument
+        """In-memory leases never expire."""
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_token TEXT,
+    lease_owner TEXT,
+    lease_expires REAL,
+    available_at REAL NOT NULL,
+    enqueued_at REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (state, available_at);
+CREATE INDEX IF NOT EXISTS jobs_lease ON jobs (state, lease_expires);
+"""
+
+
+class SQLiteWorkQueue:
+    """Durable, lease-based work queue stored in a local SQLite file.
+
+    Several ingestor processes can drain the same queue file. A leased
+    job stays invisible to other consumers until its visibility timeout
+    expires, so work held by a crashed process is re-delivered
+    automatically. Jobs failing `max_attempts` times are parked in the
+    `dead` state instead of being retried forever.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 3,
+        retry_delay: float = 0.0,
+    ):
+        """Open (and create if needed) the queue database.
+
+        Args:
+            path (str): Path to the SQLite database file.
+            visibility_timeout (float): Seconds a lease stays exclusive
+                before the job becomes visible to other consumers again.
+            max_attempts (int): Deliveries after which a job is
+                considered dead.
+            retry_delay (float): Seconds a nacked job waits before it is
+                delivered again.
+        """
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        """Close the underlying database connection."""
+
+        with self._lock:
+            self._conn.close()
+
+    def enqueue_many(self, urls: Iterable[str]) -> int:
+        """Add URLs to the queue in a single transaction.
+
+        URLs already present in the queue, whatever their state, are
+        ignored so that re-running a bulk load is harmless.
+
+        Args:
+            urls (Iterable[str]): The URLs to enqueue.
+
+        Returns:
+            int: Number of newly enqueued jobs.
+        """
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO jobs (url, available_at, enqueued_at) "
+                    "VALUES (?, ?, ?)",
+                    ((url, now, now) for url in urls),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._conn.total_changes - before
+
+    def lease(self, owner: str = "") -> Optional[Lease]:
+        """Lease the oldest visible job.
+
+        Args:
+            owner (str): Free-form identifier of the consumer, stored for
+                troubleshooting.
+
+        Returns:
+            Optional[Lease]: The leased job, or None if nothing is ready.
+        """
+        now = time.time()
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE jobs SET state = 'dead', last_error = 'lease expired' "
+                    "WHERE state = 'leased' AND lease_expires <= ? "
+                    "AND attempts >= ?",
+                    (now, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    "SELECT id, url, attempts FROM jobs "
+                    "WHERE (state = 'pending' AND available_at <= ?) "
+                    "OR (state = 'leased' AND lease_expires <= ?) "
+                    "ORDER BY id LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+
+                job_id, url, attempts = row
+                self._conn.execute(
+                    "UPDATE jobs SET state = 'leased', attempts = attempts + 1, "
+                    "lease_token = ?, lease_owner = ?, lease_expires = ? "
+                    "WHERE id = ?",
+                    (token, owner, now + self.visibility_timeout, job_id),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if attempts:
+            logger.info("Re-delivering job %d (attempt %d)", job_id, attempts + 1)
+        return Lease(job_id=job_id, url=url, attempts=attempts + 1, token=token)
+
+    def ack(self, lease: Lease) -> bool:
+        """Mark a leased job as done.
+
+        Args:
+            lease (Lease): The lease returned by `lease`.
+
+        Returns:
+            bool: False if the lease had expired and was taken over by
+            another consumer in the meantime.
+        """
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE jobs SET state = 'done', lease_expires = NULL "
+                "WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                (lease.job_id, lease.token),
+            )
+            return cur.rowcount == 1
+
+    def extend(self, lease: Lease) -> bool:
+        """Restart the visibility timeout of a job still being processed.
+
+        Args:
+            lease (Lease): The lease returned by `lease`.
+
+        Returns:
+            bool: False if the lease had expired and was taken over by
+            another consumer in the meantime.
+        """
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE jobs SET lease_expires = ? "
+                "WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                (time.time() + self.visibility_timeout, lease.job_id, lease.token),
+            )
+            return cur.rowcount == 1
+
+    def next_visible(self) -> Optional[float]:
+        """Return the seconds until a job may become ready, if any may.
+
+        Jobs waiting for their retry delay become ready once it elapsed,
+        and jobs leased by any consumer once their lease expires, unless
+        they are acked first.
+
+        Returns:
+            Optional[float]: 0 if a job is ready now, or None if every
+            job is done or dead.
+        """
+        with self._lock:
+            (visible,) = self._conn.execute(
+                "SELECT MIN(CASE state WHEN 'pending' THEN available_at "
+                "ELSE lease_expires END) FROM jobs "
+                "WHERE state IN ('pending', 'leased')"
+            ).fetchone()
+        return None if visible is None else max(0.0, visible - time.time())
+
+    def nack(self, lease: Lease, error: str = "") -> bool:
+        """Return a leased job to the queue after a failure.
+
+        Args:
+            lease (Lease): The lease returned by `lease`.
+            error (str): Short description of the failure.
+
+        Returns:
+            bool: True if the job will be delivered again, False if it
+            reached `max_attempts` and is now dead.
+        """
+        retry = lease.attempts < self.max_attempts
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, available_at = ?, "
+                "lease_expires = NULL, last_error = ? "
+                "WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                (
+                    "pending" if retry else "dead",
+                    time.time() + self.retry_delay,
+                    error,
+                    lease.job_id,
+                    lease.token,
+                ),
+            )
+        return retry
+
+    def counts(self) -> dict:
+        """Return the number of jobs in each state."""
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM jobs GROUP BY state"
+            ).fetchall()
+        return dict(rows)
+
+
+class QueueWorkSource:
+    """Asynchronous `WorkSource` adapter over a `SQLiteWorkQueue`.
+
+    Database calls run in a thread so that waiting on the SQLite write
+    lock held by another process never blocks the event loop.
+    """
+
+    def __init__(self, queue: SQLiteWorkQueue, owner: str, poll_interval: float = 1.0):
+        """Bind the adapter to a queue and a consumer identifier.
+
+        Args:
+            queue (SQLiteWorkQueue): The queue to drain.
+            owner (str): Identifier of the consumer.
+            poll_interval (float): Seconds between checks of the queue
+                while every remaining job is leased or waiting to be
+                retried.
+        """
+        self._queue = queue
+        self._owner = owner
+        self.poll_interval = poll_interval
+
+    async def lease(self) -> Optional[Lease]:
+        """Lease the next ready job, waiting while some may become ready.
+
+        Jobs leased by other consumers may still come back, if their
+        consumer crashes or fails on them, so the source is only
+        drained once every job is done or dead.
+        """
+        waiting = False
+        while True:
+            lease = await asyncio.to_thread(self._queue.lease, self._owner)
+            if lease is not None:
+                return lease
+            wait = await asyncio.to_thread(self._queue.next_visible)
+            if wait is None:
+                return None
+            if not waiting:
+                logger.info("Waiting for queue jobs leased by other consumers")
+                waiting = True
+            await asyncio.sleep(min(wait, self.poll_interval))
+
+    async def ack(self, lease: Lease) -> None:
+        """Acknowledge a processed job."""
+
+        if not await asyncio.to_thread(self._queue.ack, lease):
+            logger.warning("Lease for job %d expired before ack", lease.job_id)
+
+    async def nack(self, lease: Lease, error: str = "") -> bool:
+        """Return a failed job to the queue."""
+
+        return await asyncio.to_thread(self._queue.nack, lease, error)
+
+    async def extend(self, lease: Lease) -> None:
+        """Restart the visibility timeout of a job still being processed."""
+
+        if not await asyncio.to_thread(self._queue.extend, lease):
+            logger.warning("Lease for job %d expired before extension", lease.job_id)
@@ -0,0 +1,140 @@
+"""Local fixture site serving synthetic Facebook-like About pages.
+
+Every `/<page>/about` path returns a page shaped like the real ones: a
+large DOM, several `application/json` data scripts and one holding the
+`about_app_sections` blob, so benchmarks exercise the real extraction
+without network access.
+
+Usage:
+    python -m benchmarks.fixture_site --port 8000
+"""
+
+import contextlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import click
+
+# Size of the synthetic page, roughly matching a real About page.
+FILLER_ELEMENTS = 3000
+FILLER_SCRIPTS = 20
+
+
+def about_blob(page: str) -> dict:
+    """Return the nested data blob holding the About sections of `page`."""
+
+    fields = [
+        {"field_type": "category", "title": {"text": "Ristorante"}},
+        {
+            "field_type": "address",
+            "title": {"text": f"Via {page} 1, Milano"},
+            "map_pin_coordinates": {"latitude": 45.46, "longitude": 9.19},
+        },
+        {"field_type": "phone", "title": {"text": "+39 02 1234 5678"}},
+        {"field_type": "website", "title": {"text": f"https://{page}.example"}},
+    ]
+    sections = {
+        "nodes": [
+            {
+                "activeCollections": {
+                    "nodes": [
+                        {
+                            "style_renderer": {
+                                "profile_field_sections": [
+                                    {"profile_fields": {"nodes": fields}}
+                                ]
+                            }
+                        }
+                    ]
+                }
+            }
+        ]
+    }
+    return {
+        "require": [["ScheduledServerJS", {"data": {"about_app_sections": sections}}]]
+    }
+
+
+def render_page(page: str) -> bytes:
+    """Render the HTML of the About page of `page`."""
+
+    filler_data = json.dumps(
+        {"items": [{"id": i, "label": "x" * 40} for i in range(200)]}
+    )
+    scripts = "".join(
+        f'<script type="application/json">{filler_data}</script>'
+        for _ in range(FILLER_SCRIPTS)
+    )
+    elements = "".join(
+        f'<div class="row"><span>{page} item {i}</span></div>'
+        for i in range(FILLER_ELEMENTS)
+    )
+    about = json.dumps(about_blob(page))
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<title>{page} | Facebook</title></head><body>"
+        f"{elements}{scripts}"
+        f'<script type="application/json">{about}</script>'
+        "</body></html>"
+    ).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve `/<page>/about` and answer 404 for anything else."""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Render the requested About page."""
+
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 2 or parts[1] != "about":
+            self.send_error(404)
+            return
+
+        body = render_page(parts[0])
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keep request lines out of the benchmark output."""
+
+
+@contextlib.contextmanager
+def serve_fixture_site(host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+    """Serve the fixture site from a background thread.
+
+    Args:
+        host (str): Interface to bind.
+        port (int): TCP port; 0 picks a free one.
+
+    Yields:
+        str: The base URL of the site.
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8000, show_default=True, type=int)
+def main(host: str, port: int):
+    """Serve the fixture site until interrupted."""
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    click.echo(f"Serving http://{host}:{port}/<page>/about")
+    with contextlib.suppress(KeyboardInterrupt):
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,211 @@
+"""Compare the Chromium launch profiles on the local fixture site.
+
+Each profile scrapes the same fixture pages with the same number of
+browsers through the regular orchestrator. The resident memory of all
+browser processes is sampled during the run and reported per worker,
+next to the throughput in pages per second (browser startup included).
+
+Usage:
+    python -m benchmarks.launch_profiles --browsers 4 --pages 200
+"""
+
+import asyncio
+import json
+import logging
+import time
+from contextlib import suppress
+from typing import Optional
+
+import click
+import psutil
+
+from app.launch import LAUNCH_PROFILES
+from app.observability import Observability
+from app.orchestrator import RunConfig, run_parallel
+from app.records import PageRecord
+from benchmarks.fixture_site import serve_fixture_site
+
+_MIB = 2**20
+
+
+class NullSink:
+    """Sink discarding every page, so that disk writes are not measured."""
+
+    async def write(self, record: PageRecord) -> None:
+        """Drop the page."""
+
+    async def checkpoint(self) -> bool:
+        """Nothing to flush."""
+
+        return True
+
+    async def close(self) -> None:
+        """Nothing to flush."""
+
+
+def browser_rss() -> int:
+    """Return the summed RSS in bytes of all child processes."""
+
+    total = 0
+    for child in psutil.Process().children(recursive=True):
+        with suppress(psutil.Error):
+            total += child.memory_info().rss
+    return total
+
+
+async def _sample_rss(samples: list[int], interval: float):
+    """Append the browser RSS to `samples` every `interval` seconds."""
+    while True:
+        samples.append(browser_rss())
+        await asyncio.sleep(interval)
+
+
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+async def bench_profile(
+    profile: str,
+    urls: list[str],
+    browsers: int,
+    navigation: str,
+    contexts_per_browser: int = 1,
+    prefetch_depth: int = 0,
+) -> dict:
+    """Scrape `urls` with one launch profile and measure the run.
+
+    Args:
+        profile (str): One of `LAUNCH_PROFILES`.
+        urls (list[str]): Fixture page URLs.
+        browsers (int): Number of browser workers.
+        navigation (str): Navigation mode of the run.
+        contexts_per_browser (int): Workers sharing one browser process.
+        prefetch_depth (int): Pages each worker loads ahead.
+
+    Returns:
+        dict: Outcome counts, pages per second, the peak and mean RSS
+        per worker in MiB and the share of navigation time hidden by
+        prefetching.
+    """
+    config = RunConfig(
+        browsers=browsers,
+        profile_namespace=f"bench-{profile}",
+        navigation=navigation,
+        launch_profile=profile,
+        contexts_per_browser=contexts_per_browser,
+        prefetch_depth=prefetch_depth,
+    )
+    samples: list[int] = []
+    sampler = asyncio.create_task(_sample_rss(samples, 0.5))
+    started = time.perf_counter()
+    try:
+        report = await run_parallel(urls, config, sink=NullSink())
+    finally:
+        sampler.cancel()
+    elapsed = time.perf_counter() - started
+
+    summary = report.summary()
+    running = [s for s in samples if s] or [0]
+    return {
+        "profile": profile,
+        "browsers": browsers,
+        "contexts_per_browser": contexts_per_browser,
+        "prefetch_depth": prefetch_depth,
+        "saved": summary["saved"],
+        "failed": summary["failed"],
+        "seconds": round(elapsed, 2),
+        "pages_per_second": round(summary["saved"] / elapsed, 2),
+        "peak_rss_mib_per_worker": round(max(running) / browsers / _MIB, 1),
+        "mean_rss_mib_per_worker": round(
+            sum(running) / len(running) / browsers / _MIB, 1
+        ),
+        "prefetch_overlap_ratio": report.prefetch().get("overlap_ratio", 0.0),
+    }
+
+
+def _print_table(results: list[dict]):
+    """Print one line per profile."""
+    click.echo(
+        f"{'profile':<16}{'pages/s':>9}{'peak MiB':>10}{'mean MiB':>10}"
+        f"{'saved':>7}{'failed':>7}"
+    )
+    for r in results:
+        click.echo(
+            f"{r['profile']:<16}{r['pages_per_second']:>9}"
+            f"{r['peak_rss_mib_per_worker']:>10}{r['mean_rss_mib_per_worker']:>10}"
+            f"{r['saved']:>7}{r['failed']:>7}"
+        )
+
+
+@click.command()
+@click.option("--browsers", "-b", default=4, show_default=True, type=int)
+@click.option("--pages", default=100, show_default=True, type=int)
+@click.option(
+    "--profile",
+    "profiles",
+    multiple=True,
+    type=click.Choice(tuple(LAUNCH_PROFILES)),
+    help="Profile to benchmark; repeatable (default: all).",
+)
+@click.option(
+    "--navigation",
+    type=click.Choice(["full", "eager"]),
+    default="eager",
+    show_default=True,
+)
+@click.option(
+    "--contexts-per-browser",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Workers sharing one browser through browser contexts.",
+)
+@click.option(
+    "--prefetch-depth",
+    default=0,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Pages each worker loads in extra tabs while extracting.",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Also write the results as JSON to this file.",
+)
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def main(
+    browsers: int,
+    pages: int,
+    profiles: tuple[str, ...],
+    navigation: str,
+    contexts_per_browser: int,
+    prefetch_depth: int,
+    output: Optional[str],
+):
+    """Benchmark the launch profiles one after the other."""
+
+    Observability.setup(level=logging.WARNING, enable_resource_logging=False)
+
+    results = []
+    with serve_fixture_site() as base_url:
+        urls = [f"{base_url}/page{i}/about" for i in range(pages)]
+        for profile in profiles or tuple(LAUNCH_PROFILES):
+            results.append(
+                asyncio.run(
+                    bench_profile(
+                        profile,
+                        urls,
+                        browsers,
+                        navigation,
+                        contexts_per_browser,
+                        prefetch_depth,
+                    )
+                )
+            )
+
+    _print_table(results)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,179 @@
+"""Track the time to first page of a cold CLI run on the fixture site.
+
+Every round starts `python -m app.main` in a fresh interpreter, with one
+browser and `--startup-profile`, on a few fixture pages, and reads back
+the startup milestones, measured from the import of the `app` package.
+The medians over the rounds are compared with a baseline file: the
+benchmark exits with status 1 when the time to first page regressed by
+more than `--tolerance`.
+
+Usage:
+    python -m benchmarks.startup --rounds 5 --baseline startup-baseline.json
+    python -m benchmarks.startup --baseline startup-baseline.json --update-baseline
+"""
+
+import json
+import os
+import statistics
+import subprocess  # nosec B404
+import sys
+import tempfile
+from typing import Optional
+
+import click
+
+from benchmarks.fixture_site import serve_fixture_site
+
+FIRST_PAGE = "first page scraped"
+
+_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_once(base_url: str, pages: int, timeout: float) -> dict[str, float]:
+    """Scrape `pages` fixture pages in a fresh CLI process.
+
+    Args:
+        base_url (str): Base URL of the fixture site.
+        pages (int): Fixture pages to scrape.
+        timeout (float): Seconds the run may take.
+
+    Returns:
+        dict[str, float]: The startup milestones and the summed deferred
+        import time (`imports`), in milliseconds.
+
+    Raises:
+        click.ClickException: If the run failed or scraped no page.
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        os.makedirs(os.path.join(workdir, "data"))
+        urls_file = os.path.join(workdir, "urls.txt")
+        with open(urls_file, "w", encoding="utf-8") as f:
+            f.writelines(f"{base_url}/page{i}/about\n" for i in range(pages))
+        profile_file = os.path.join(workdir, "startup.json")
+
+        env = {**os.environ, "PYTHONPATH": _REPO}
+        # Runs from the scratch directory, which receives the output.
+        result = subprocess.run(  # nosec B603
+            [
+                sys.executable,
+                "-m",
+                "app.main",
+                "run",
+                "-f",
+                urls_file,
+                "--browsers",
+                "1",
+                "--startup-profile",
+                profile_file,
+            ],
+            cwd=workdir,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            check=False,
+        )
+        if result.returncode != 0 or not os.path.exists(profile_file):
+            raise click.ClickException(
+                f"Run failed ({result.returncode}): {result.stderr[-2000:]}"
+            )
+        with open(profile_file, encoding="utf-8") as f:
+            profile = json.load(f)
+
+    milestones = profile["milestones_ms"]
+    if FIRST_PAGE not in milestones:
+        raise click.ClickException("The run scraped no page")
+    imports = sum(info["ms"] for info in profile["imports_ms"].values())
+    return {**milestones, "imports": round(imports, 1)}
+
+
+def measure(rounds: int, pages: int, timeout: float) -> dict[str, float]:
+    """Return the median of each metric over `rounds` cold runs."""
+
+    runs = []
+    with serve_fixture_site() as base_url:
+        for _ in range(rounds):
+            runs.append(run_once(base_url, pages, timeout))
+    return {
+        metric: round(statistics.median(run[metric] for run in runs), 1)
+        for metric in runs[0]
+        if all(metric in run for run in runs)
+    }
+
+
+def regressions(
+    result: dict[str, float], baseline: dict[str, float], tolerance: float
+) -> list[str]:
+    """Describe the metrics slower than the baseline beyond `tolerance`.
+
+    Only the time to first page and the deferred imports are checked;
+    the other milestones are reported for context.
+    """
+    slower = []
+    for metric in (FIRST_PAGE, "imports"):
+        if metric not in baseline or metric not in result:
+            continue
+        limit = baseline[metric] * (1 + tolerance)
+        if result[metric] > limit:
+            slower.append(
+                f"{metric}: {result[metric]} ms, baseline {baseline[metric]} ms "
+                f"(limit {limit:.1f} ms)"
+            )
+    return slower
+
+
+@click.command()
+@click.option("--rounds", default=5, show_default=True, type=click.IntRange(min=1))
+@click.option("--pages", default=3, show_default=True, type=click.IntRange(min=1))
+@click.option(
+    "--baseline",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="JSON file with the reference medians to compare with.",
+)
+@click.option(
+    "--tolerance",
+    default=0.2,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Allowed slowdown relative to the baseline.",
+)
+@click.option(
+    "--update-baseline",
+    is_flag=True,
+    help="Write the measured medians to --baseline instead of comparing.",
+)
+@click.option("--timeout", default=120.0, show_default=True, type=float)
+# pylint: disable-next=too-many-arguments,too-many-positional-arguments
+def main(
+    rounds: int,
+    pages: int,
+    baseline: Optional[str],
+    tolerance: float,
+    update_baseline: bool,
+    timeout: float,
+):
+    """Measure the time to first page and check it against a baseline."""
+
+    result = measure(rounds, pages, timeout)
+    for metric, ms in result.items():
+        click.echo(f"{metric:<24}{ms:>10} ms")
+
+    if baseline is None:
+        return
+    if update_baseline or not os.path.exists(baseline):
+        with open(baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        click.echo(f"Baseline written to {baseline}")
+        return
+
+    with open(baseline, encoding="utf-8") as f:
+        reference = json.load(f)
+    slower = regressions(result, reference, tolerance)
+    if slower:
+        raise click.ClickException("Startup regressed: " + "; ".join(slower))
+    click.echo("No startup regression")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
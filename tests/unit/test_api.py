@@ -0,0 +1,133 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.api import QueueSink, ScrapeResult, ingest
+from app.orchestrator import RunConfig
+from app.records import PageRecord
+
+URLS = [f"https://www.facebook.com/page{i}/about" for i in range(5)]
+
+
+def _fake_run(events=None, error=None, closed=None):
+    async def run_parallel(urls, _config, sink):
+        try:
+            for url in urls:
+                await sink.write(PageRecord.from_payload(url, {}, url[-11:]))
+                if events is not None:
+                    events.append(url)
+            if error is not None:
+                raise error
+        finally:
+            await sink.close()
+            if closed is not None:
+                closed.append(True)
+
+    return run_parallel
+
+
+@pytest.mark.asyncio
+async def test_ingest_yields_typed_results(monkeypatch):
+    monkeypatch.setattr("app.api.run_parallel", _fake_run())
+
+    results = [result async for result in ingest(URLS, RunConfig(browsers=2))]
+
+    assert [r.url for r in results] == URLS
+    assert isinstance(results[0], ScrapeResult)
+    assert results[0].page_key == "page0"
+    assert results[0].display_name == "page0/about"
+    assert results[0].payload == {"display_name": "page0/about"}
+
+
+@pytest.mark.asyncio
+async def test_ingest_applies_backpressure(monkeypatch):
+    events = []
+    monkeypatch.setattr("app.api.run_parallel", _fake_run(events))
+
+    stream = ingest(URLS, buffer_size=2)
+    first = await stream.__anext__()
+    await asyncio.sleep(0.01)
+
+    # One result consumed, two buffered, the producer blocked on the next.
+    assert first.url == URLS[0]
+    assert len(events) == 3
+
+    rest = [result async for result in stream]
+    assert len(rest) == 4
+
+
+@pytest.mark.asyncio
+async def test_ingest_cancels_run_when_consumer_stops(monkeypatch):
+    events = []
+    monkeypatch.setattr("app.api.run_parallel", _fake_run(events))
+
+    stream = ingest(URLS, buffer_size=1)
+    async for _ in stream:
+        break
+    await stream.aclose()
+
+    assert len(events) < len(URLS)
+
+
+@pytest.mark.asyncio
+async def test_ingest_stops_run_blocked_on_full_buffer(monkeypatch):
+    events, closed = [], []
+    monkeypatch.setattr("app.api.run_parallel", _fake_run(events, closed=closed))
+
+    stream = ingest(URLS, buffer_size=2)
+    async for _ in stream:
+        # Let the producer fill the buffer and block on the next result.
+        await asyncio.sleep(0.01)
+        break
+    async with asyncio.timeout(1):
+        await stream.aclose()
+
+    assert len(events) == 3
+    assert closed == [True]
+
+
+@pytest.mark.asyncio
+async def test_ingest_reraises_run_errors(monkeypatch):
+    monkeypatch.setattr(
+        "app.api.run_parallel", _fake_run(error=RuntimeError("browser crashed"))
+    )
+
+    received = []
+    with pytest.raises(RuntimeError, match="browser crashed"):
+        async for result in ingest(URLS[:2]):
+            received.append(result)
+
+    assert len(received) == 2
+
+
+@pytest.mark.asyncio
+async def test_ingest_reraises_errors_before_sink_is_closed(monkeypatch):
+    async def run_parallel(urls, _config, sink):
+        await sink.write(PageRecord.from_payload(urls[0], {}))
+        await asyncio.sleep(0.01)
+        raise OSError("cannot create archive")
+
+    monkeypatch.setattr("app.api.run_parallel", run_parallel)
+
+    results = []
+    with pytest.raises(OSError, match="archive"):
+        async with asyncio.timeout(1):
+            async for result in ingest(URLS):
+                results.append(result)
+
+    assert [r.url for r in results] == URLS[:1]
+
+
+@pytest.mark.asyncio
+async def test_queue_sink_forwards_to_tee():
+    tee = AsyncMock()
+    sink = QueueSink(maxsize=10, tee=tee)
+
+    record = PageRecord.from_payload(URLS[0], {"a": 1})
+    await sink.write(record)
+    await sink.close()
+
+    tee.write.assert_awaited_once_with(record)
+    tee.close.assert_awaited_once()
+    assert sink.queue.qsize() == 2
@@ -0,0 +1,128 @@
+import json
+import os
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.archive import (
+    CaptureArchive,
+    decode_frame,
+    encode_frame,
+    reextract,
+)
+from app.extraction import wrap_json_blobs
+
+ABOUT = {
+    "about_app_sections": {
+        "nodes": [
+            {
+                "activeCollections": {
+                    "nodes": [
+                        {
+                            "style_renderer": {
+                                "profile_field_sections": [
+                                    {
+                                        "profile_fields": {
+                                            "nodes": [
+                                                {
+                                                    "field_type": "phone",
+                                                    "title": {"text": "+39 02 1"},
+                                                }
+                                            ]
+                                        }
+                                    }
+                                ]
+                            }
+                        }
+                    ]
+                }
+            }
+        ]
+    }
+}
+
+BODY = wrap_json_blobs([json.dumps(ABOUT)])
+
+
+@pytest.fixture
+def archive(tmp_path):
+    a = CaptureArchive(str(tmp_path / "archive"), batch_size=2)
+    yield a
+    a.close()
+
+
+def test_frame_round_trip_and_corruption():
+    frame = encode_frame("données about_app_sections")
+
+    assert decode_frame(frame) == "données about_app_sections"
+    with pytest.raises(ValueError):
+        decode_frame(frame[:-1])
+    with pytest.raises(ValueError):
+        decode_frame(b"XXXX" + frame[4:])
+
+
+@pytest.mark.asyncio
+async def test_index_is_committed_in_batches(archive):
+    await archive.add("https://facebook.com/a", "A", BODY)
+
+    assert list(archive.entries()) == []
+    assert len(archive) == 1
+
+    await archive.add("https://facebook.com/b", None, "other")
+
+    assert [e.page_key for e in archive.entries()] == ["a", "b"]
+    assert archive.get("a") == BODY
+    assert archive.get("b") == "other"
+    assert archive.get("c") is None
+
+
+@pytest.mark.asyncio
+async def test_latest_capture_per_page(archive):
+    await archive.add("https://facebook.com/a", "A", "first")
+    await archive.add("https://facebook.com/b", "B", "only")
+    await archive.add("https://facebook.com/a/about", "A2", "second")
+    archive.flush()
+
+    latest = list(archive.entries())
+    assert [(e.page_key, e.title) for e in latest] == [("b", "B"), ("a", "A2")]
+    assert len(list(archive.entries(latest=False))) == 3
+    assert archive.get("a") == "second"
+
+
+@pytest.mark.asyncio
+async def test_writers_use_separate_segments(tmp_path):
+    directory = str(tmp_path / "archive")
+    first, second = CaptureArchive(directory), CaptureArchive(directory)
+    second.segment = "other.bin"
+
+    await first.add("https://facebook.com/a", None, "from first")
+    await second.add("https://facebook.com/b", None, "from second")
+    first.close()
+    second.close()
+
+    reader = CaptureArchive(directory)
+    assert reader.get("a") == "from first"
+    assert reader.get("b") == "from second"
+    reader.close()
+    assert len([f for f in os.listdir(directory) if f.endswith(".bin")]) == 2
+
+
+@pytest.mark.asyncio
+async def test_reextract_replays_archive(archive):
+    await archive.add("https://facebook.com/a", "Page A", BODY)
+    await archive.add("https://facebook.com/b", "Page B", "no about here")
+    await archive.add("https://facebook.com/c", "Page C", BODY)
+    archive.flush()
+    with open(os.path.join(archive.directory, archive.segment), "r+b") as f:
+        f.seek(list(archive.entries())[-1].offset)
+        f.write(b"XXXX")
+    sink = AsyncMock()
+
+    report = await reextract(archive, sink, workers=1, batch_size=2)
+
+    assert report.summary() == {"saved": 1, "failed": 2, "total": 3}
+    assert report.failures() == {"not_found": 1, "corrupt_capture": 1}
+    record = sink.write.await_args.args[0]
+    assert record.page_key == "a"
+    assert record.to_payload() == {"phone": "+39 02 1", "display_name": "Page A"}
+    sink.close.assert_awaited_once()
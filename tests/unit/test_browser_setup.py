@@ -13,8 +13,8 @@ def test_build_browser_config_without_suffix():
 
     assert config.headless is True
     assert config.user_data_dir == "./chrome-profile-fb"
-    assert "--disable-background-networking" in config.args
-    assert "--disable-extensions" in config.args
+    assert "--disable-background-networking" in config.browser_args
+    assert "--disable-extensions" in config.browser_args
 
 
 def test_build_browser_config_with_suffix():
@@ -23,6 +23,11 @@ def test_build_browser_config_with_suffix():
     assert config.user_data_dir == "./chrome-profile-fb-worker-1"
 
 
+def test_build_browser_config_rejects_unknown_launch_profile():
+    with pytest.raises(ValueError, match="Unknown launch profile"):
+        build_browser_config(launch_profile="turbo")
+
+
 @pytest.mark.asyncio
 async def test_set_mobile_emulation_sends_two_commands():
     tab = MagicMock()
@@ -0,0 +1,196 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.capacity import (
+    BrowserCost,
+    HostResources,
+    TreeSample,
+    calibrate,
+    cgroup_limits,
+    detect_resources,
+    measure_cost,
+    plan_capacity,
+    sample_tree,
+)
+from app.reporting import ScrapeReport
+
+MIB = 2**20
+GIB = 2**30
+
+
+def _write(directory, files):
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, content in files.items():
+        (directory / name).write_text(content)
+
+
+@pytest.fixture
+def proc_cgroup(tmp_path):
+    def write(content):
+        path = tmp_path / "cgroup"
+        path.write_text(content)
+        return str(path)
+
+    return write
+
+
+def test_cgroup_v2_limits_include_ancestors(tmp_path, proc_cgroup):
+    root = tmp_path / "fs"
+    _write(root, {"cgroup.controllers": "cpu memory"})
+    _write(root / "kube", {"cpu.max": "150000 100000", "memory.max": "max"})
+    _write(
+        root / "kube" / "pod",
+        {
+            "cpu.max": "max 100000",
+            "memory.max": str(4 * GIB),
+            "memory.current": str(GIB),
+        },
+    )
+
+    cpus, memory, version = cgroup_limits(str(root), proc_cgroup("0::/kube/pod\n"))
+
+    assert (cpus, memory, version) == (1.5, 3 * GIB, "cgroup v2")
+
+
+def test_cgroup_v1_limits(tmp_path, proc_cgroup):
+    root = tmp_path / "fs"
+    _write(root / "cpu", {"cpu.cfs_quota_us": "200000", "cpu.cfs_period_us": "100000"})
+    _write(
+        root / "memory",
+        {"memory.limit_in_bytes": str(2 * GIB), "memory.usage_in_bytes": str(GIB)},
+    )
+    cgroup = proc_cgroup("4:memory:/\n3:cpu,cpuacct:/\n")
+
+    assert cgroup_limits(str(root), cgroup) == (2.0, GIB, "cgroup v1")
+
+    _write(root / "cpu", {"cpu.cfs_quota_us": "-1"})
+    _write(root / "memory", {"memory.limit_in_bytes": "9223372036854771712"})
+    assert cgroup_limits(str(root), cgroup) == (None, None, "cgroup v1")
+
+
+def test_no_cgroup(tmp_path, proc_cgroup):
+    assert cgroup_limits(str(tmp_path), proc_cgroup("")) == (None, None, "none")
+
+
+def test_detect_resources_narrows_host_by_cgroup(tmp_path, proc_cgroup, monkeypatch):
+    monkeypatch.setattr(
+        "app.capacity.psutil.virtual_memory",
+        MagicMock(return_value=MagicMock(available=8 * GIB)),
+    )
+    monkeypatch.setattr("app.capacity.os.sched_getaffinity", lambda _: {0, 1, 2, 3})
+    root = tmp_path / "fs"
+    _write(root, {"cgroup.controllers": "", "cpu.max": "100000 100000"})
+
+    resources = detect_resources(str(root), proc_cgroup("0::/\n"))
+
+    assert resources == HostResources(1.0, 8 * GIB, "cgroup v2", "host")
+
+
+def test_plan_is_bound_by_cpu():
+    resources = HostResources(8, 64 * GIB)
+    cost = BrowserCost(base_rss=200 * MIB, tab_rss=100 * MIB, cpu_per_tab=0.5)
+
+    plan = plan_capacity(resources, cost, headroom=0.25)
+
+    assert (plan.browsers, plan.tabs, plan.limited_by) == (12, 1, "cpu")
+    assert "8 CPUs (host)" in plan.reason
+
+
+def test_plan_adds_tabs_when_memory_bound():
+    resources = HostResources(16, 2 * GIB, memory_source="cgroup v2")
+    cost = BrowserCost(base_rss=400 * MIB, tab_rss=100 * MIB, cpu_per_tab=0.5)
+
+    plan = plan_capacity(resources, cost, headroom=0.0, max_tabs=3)
+
+    # 1 tab: 4 workers; 2 tabs: 3 x 2; 3 tabs: 2 x 3 does not beat 6.
+    assert (plan.browsers, plan.tabs, plan.limited_by) == (3, 2, "memory")
+
+
+def test_plan_respects_work_and_shared_browsers():
+    resources = HostResources(64, 256 * GIB)
+    cost = BrowserCost(base_rss=800 * MIB, tab_rss=200 * MIB, cpu_per_tab=0.5)
+
+    plan = plan_capacity(resources, cost, max_browsers=5)
+    assert (plan.browsers, plan.limited_by) == (5, "work")
+
+    tiny = HostResources(1, 900 * MIB)
+    alone = plan_capacity(tiny, cost, headroom=0.0, max_tabs=1)
+    shared = plan_capacity(tiny, cost, headroom=0.0, max_tabs=1, contexts_per_browser=4)
+    assert alone.browsers == 1
+    assert shared.browsers == 2
+
+
+def test_measure_cost():
+    start = TreeSample(100, 0, 0, 0, cpu_seconds=10.0)
+    end = TreeSample(150 * MIB, 600 * MIB, 400 * MIB, browsers=2, cpu_seconds=22.0)
+
+    cost = measure_cost(start, end, seconds=6.0, tabs=4)
+
+    assert cost == BrowserCost(300 * MIB, 100 * MIB, 0.5, 150 * MIB)
+
+
+def _process(cmdline, rss, cpu, children=()):
+    process = MagicMock()
+    process.cmdline.return_value = cmdline
+    process.memory_info.return_value.rss = rss
+    process.cpu_times.return_value = (cpu, 0.0, 0.0, 0.0)
+    process.children.return_value = list(children)
+    return process
+
+
+def test_sample_tree_splits_browsers_and_renderers(monkeypatch):
+    root = _process(
+        ["python"],
+        50,
+        1.0,
+        [
+            _process(["chrome", "--headless"], 100, 2.0),
+            _process(["chrome", "--type=gpu-process"], 30, 0.5),
+            _process(["chrome", "--type=renderer"], 70, 3.0),
+            _process(["chrome", "--type=renderer"], 80, 3.5),
+        ],
+    )
+
+    assert sample_tree(root) == TreeSample(50, 130, 150, 1, 10.0)
+
+
+@pytest.mark.asyncio
+async def test_calibrate_measures_after_first_page(monkeypatch):
+    report = ScrapeReport()
+    samples = [TreeSample(0, 0, 0, 0, 0.0), TreeSample(0, 200, 100, 1, 1.0)]
+    monkeypatch.setattr("app.capacity.sample_tree", lambda: samples.pop(0))
+
+    await report.record_saved()
+    cost = await calibrate(report, tabs=1, pages=0, poll=0.001)
+
+    assert cost is not None
+    assert cost.base_rss == 200
+    assert cost.tab_rss == 100
+
+
+@pytest.mark.asyncio
+async def test_calibrate_gives_up_when_run_ends():
+    cost = await calibrate(ScrapeReport(), tabs=1, done=lambda: True, poll=0.001)
+
+    assert cost is None
+
+
+def test_plan_falls_back_to_one_worker():
+    resources = HostResources(1, 8 * GIB)
+    cost = BrowserCost(base_rss=200 * MIB, tab_rss=150 * MIB, cpu_per_tab=0.5)
+
+    plan = plan_capacity(resources, cost, headroom=0.2)
+    assert (plan.browsers, plan.tabs, plan.limited_by) == (1, 1, "cpu")
+
+    plan = plan_capacity(HostResources(1, 100 * MIB), cost)
+    assert (plan.browsers, plan.tabs) == (1, 1)
+
+
+def test_plan_keeps_tabs_chosen_by_user():
+    resources = HostResources(16, 2 * GIB)
+    cost = BrowserCost(base_rss=400 * MIB, tab_rss=100 * MIB, cpu_per_tab=0.5)
+
+    plan = plan_capacity(resources, cost, headroom=0.0, tabs=3)
+
+    assert (plan.browsers, plan.tabs, plan.limited_by) == (2, 3, "memory")
@@ -0,0 +1,107 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from nodriver import cdp
+
+from app.capture import ResponseCapture, is_candidate
+from app.extraction import ExtractionPool
+
+
+def _response(request_id, type_, url="https://www.facebook.com/page/about"):
+    return SimpleNamespace(
+        request_id=request_id, type_=type_, response=SimpleNamespace(url=url)
+    )
+
+
+def _finished(request_id):
+    return SimpleNamespace(request_id=request_id)
+
+
+BODY = '{"about_app_sections": {"nodes": []}}'
+
+
+def test_is_candidate():
+    types = cdp.network.ResourceType
+    graphql = "https://www.facebook.com/api/graphql/"
+
+    assert is_candidate(_response("1", types.DOCUMENT))
+    assert is_candidate(_response("2", types.XHR, graphql))
+    assert is_candidate(_response("3", types.FETCH, graphql))
+    assert not is_candidate(_response("4", types.XHR))
+    assert not is_candidate(_response("5", types.SCRIPT, graphql))
+
+
+@pytest.mark.asyncio
+async def test_capture_resolves_payload_from_document():
+    tab = MagicMock()
+    tab.send = AsyncMock(return_value=(BODY, False))
+    capture = ResponseCapture(tab, ExtractionPool(0), timeout=0.5)
+    capture.enable()
+    assert tab.add_handler.call_count == 2
+
+    capture.start()
+    capture._on_response(_response("1", cdp.network.ResourceType.DOCUMENT))
+    capture._on_response(_response("2", cdp.network.ResourceType.IMAGE))
+    await capture._on_finished(_finished("2"))
+    await capture._on_finished(_finished("1"))
+
+    assert await capture.payload() == {}
+    assert capture.body == BODY
+    tab.send.assert_awaited_once()
+
+    capture.start()
+    assert capture.body is None
+
+
+@pytest.mark.asyncio
+async def test_capture_decodes_base64_bodies():
+    tab = MagicMock()
+    tab.send = AsyncMock(
+        return_value=("eyJhYm91dF9hcHBfc2VjdGlvbnMiOiB7Im5vZGVzIjogW119fQ==", True)
+    )
+    capture = ResponseCapture(tab, ExtractionPool(0))
+
+    capture.start()
+    capture._on_response(_response("1", cdp.network.ResourceType.DOCUMENT))
+    await capture._on_finished(_finished("1"))
+
+    assert await capture.payload(0.1) == {}
+
+
+@pytest.mark.asyncio
+async def test_capture_ignores_responses_of_previous_page():
+    tab = MagicMock()
+    gate = asyncio.Event()
+
+    async def send(_command):
+        await gate.wait()
+        return BODY, False
+
+    tab.send = send
+    capture = ResponseCapture(tab, ExtractionPool(0))
+
+    capture.start()
+    capture._on_response(_response("1", cdp.network.ResourceType.DOCUMENT))
+    pending = asyncio.create_task(capture._on_finished(_finished("1")))
+    await asyncio.sleep(0)
+
+    capture.start()
+    gate.set()
+    await pending
+
+    assert await capture.payload(0.05) is None
+
+
+@pytest.mark.asyncio
+async def test_capture_times_out_when_body_is_unavailable():
+    tab = MagicMock()
+    tab.send = AsyncMock(side_effect=RuntimeError("No resource with given identifier"))
+    capture = ResponseCapture(tab, ExtractionPool(0))
+
+    capture.start()
+    capture._on_response(_response("1", cdp.network.ResourceType.DOCUMENT))
+    await capture._on_finished(_finished("1"))
+
+    assert await capture.payload(0.05) is None
@@ -0,0 +1,175 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.change_detection import (
+    ChangeDetectingSink,
+    HashIndex,
+    field_diff,
+    normalize_payload,
+    payload_hash,
+)
+from app.records import PageRecord
+
+
+def _record(url, payload):
+    return PageRecord.from_payload(url, payload)
+
+
+def test_normalize_payload_ignores_key_order():
+    assert normalize_payload({"a": 1, "b": 2}) == normalize_payload({"b": 2, "a": 1})
+
+
+def test_payload_hash_detects_value_change():
+    assert payload_hash({"a": 1}) != payload_hash({"a": 2})
+
+
+def test_field_diff_sections():
+    diff = field_diff({"a": 1, "b": 2, "c": 3}, {"a": 1, "b": 5, "d": 4})
+
+    assert diff == {"added": {"d": 4}, "removed": ["c"], "changed": {"b": [2, 5]}}
+
+
+def test_field_diff_identical_is_empty():
+    assert field_diff({"a": 1}, {"a": 1}) == {}
+
+
+def test_hash_index_persists(tmp_path):
+    path = str(tmp_path / "hashes.sqlite")
+    index = HashIndex(path)
+    index.put("foo", "abc", {"a": 1})
+    index.close()
+
+    reopened = HashIndex(path)
+    assert reopened.get("foo") == ("abc", {"a": 1})
+    assert reopened.get("bar") is None
+    reopened.close()
+
+
+def test_pending_hashes_do_not_lock_shared_index(tmp_path):
+    path = str(tmp_path / "hashes.sqlite")
+    first = HashIndex(path)
+    second = HashIndex(path)
+    first.put("foo", "abc", {"a": 1})
+    assert first.get("foo") == ("abc", {"a": 1})
+
+    second.put("bar", "def", {"b": 2})
+    second.commit()
+    first.commit()
+
+    assert second.get("foo") == ("abc", {"a": 1})
+    first.close()
+    second.close()
+
+
+def _inner():
+    inner = MagicMock()
+    inner.write = AsyncMock()
+    inner.checkpoint = AsyncMock(return_value=True)
+    inner.close = AsyncMock()
+    return inner
+
+
+def _stored(path, key):
+    index = HashIndex(path)
+    try:
+        return index.get(key)
+    finally:
+        index.close()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_payload_skips_write(tmp_path):
+    inner = _inner()
+    sink = ChangeDetectingSink(inner, str(tmp_path / "h.sqlite"))
+
+    await sink.write(_record("https://facebook.com/foo", {"a": 1}))
+    await sink.write(_record("https://facebook.com/foo/about", {"a": 1}))
+    await sink.close()
+
+    inner.write.assert_awaited_once()
+    inner.close.assert_awaited_once()
+    assert (sink.changed, sink.unchanged) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_index_survives_runs(tmp_path):
+    index = str(tmp_path / "h.sqlite")
+
+    first = ChangeDetectingSink(_inner(), index)
+    await first.write(_record("https://facebook.com/foo", {"a": 1}))
+    await first.close()
+
+    inner = _inner()
+    second = ChangeDetectingSink(inner, index)
+    await second.write(_record("https://facebook.com/foo", {"a": 1}))
+    await second.close()
+
+    inner.write.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_changes_stream_records_diff(tmp_path):
+    changes = tmp_path / "changes.jsonl"
+    sink = ChangeDetectingSink(_inner(), str(tmp_path / "h.sqlite"), str(changes))
+
+    await sink.write(_record("https://facebook.com/foo", {"a": 1}))
+    await sink.write(_record("https://facebook.com/foo", {"a": 2}))
+    await sink.close()
+
+    records = [json.loads(line) for line in changes.read_text().splitlines()]
+
+    assert [r["status"] for r in records] == ["new", "changed"]
+    assert records[1]["page_key"] == "foo"
+    assert records[1]["diff"] == {"changed": {"a": [1, 2]}}
+
+
+@pytest.mark.asyncio
+async def test_hashes_committed_after_inner_checkpoint(tmp_path):
+    index = str(tmp_path / "h.sqlite")
+    inner = _inner()
+    sink = ChangeDetectingSink(inner, index, batch_size=2)
+
+    await sink.write(_record("https://facebook.com/foo", {"a": 1}))
+    assert _stored(index, "foo") is None
+
+    await sink.write(_record("https://facebook.com/bar", {"a": 1}))
+    inner.checkpoint.assert_awaited_once()
+    assert _stored(index, "foo") is not None
+    await sink.close()
+
+
+@pytest.mark.asyncio
+async def test_hashes_kept_pending_until_inner_persists(tmp_path):
+    index = str(tmp_path / "h.sqlite")
+    inner = _inner()
+    inner.checkpoint.return_value = False
+    inner.close.side_effect = OSError("disk full")
+    sink = ChangeDetectingSink(inner, index, batch_size=1)
+
+    await sink.write(_record("https://facebook.com/foo", {"a": 1}))
+    with pytest.raises(OSError):
+        await sink.close()
+
+    assert _stored(index, "foo") is None
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_keeps_hashes_written_meanwhile(tmp_path):
+    index = str(tmp_path / "h.sqlite")
+    inner = _inner()
+    sink = ChangeDetectingSink(inner, index)
+
+    async def _checkpoint():
+        await sink.write(_record("https://facebook.com/bar", {"a": 1}))
+        return True
+
+    await sink.write(_record("https://facebook.com/foo", {"a": 1}))
+    inner.checkpoint.side_effect = _checkpoint
+    assert await sink.checkpoint()
+
+    assert _stored(index, "foo") is not None
+    assert _stored(index, "bar") is None
+    assert sink._index.uncommitted == 1
+    await sink.close()
@@ -0,0 +1,175 @@
+import json
+
+import pytest
+
+from app.columnar import (
+    KNOWN_FIELDS,
+    ColumnarSink,
+    ColumnarWriter,
+    convert_directory,
+    record_row,
+    to_row,
+)
+from app.fanout import ShardedJsonSink
+from app.records import PageRecord
+from app.sinks import JsonFileSink
+
+
+def test_record_row_matches_to_row():
+    payload = {"phone": "1", "latitude": 45.46, "x": "y", "display_name": "Foo"}
+    url = "https://facebook.com/Foo/about"
+
+    assert record_row(PageRecord.from_payload(url, payload, scraped_at=1.5)) == (
+        to_row("foo", url, payload, 1.5)
+    )
+
+
+def test_to_row_types_known_fields_and_coordinates():
+    row = to_row(
+        "foo",
+        "https://facebook.com/foo",
+        {
+            "display_name": "Foo",
+            "phone": "+39 02 1234",
+            "latitude": "45.46",
+            "longitude": 9.19,
+        },
+        1.5,
+    )
+
+    assert row["page_key"] == "foo"
+    assert row["phone"] == "+39 02 1234"
+    assert row["latitude"] == 45.46
+    assert row["longitude"] == 9.19
+    assert row["scraped_at"] == 1500
+    assert row["email"] is None
+    assert row["extra"] == []
+
+
+def test_to_row_unknown_fields_go_to_extra():
+    row = to_row("foo", None, {"whatsapp": "123", "rating": 4.5}, 0)
+
+    assert row["extra"] == [("whatsapp", "123")]
+    assert row["rating"] == "4.5"
+
+
+def test_writer_requires_known_format(tmp_path):
+    with pytest.raises(ValueError, match="Unknown columnar format"):
+        ColumnarWriter(str(tmp_path / "x"), "csv")
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_writer_roundtrip_in_batches(tmp_path, fmt):
+    pa = pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"out.{fmt}")
+
+    writer = ColumnarWriter(path, fmt, batch_rows=2)
+    for i in range(5):
+        writer.append(to_row(f"p{i}", None, {"phone": str(i), "x": "y"}, i))
+    writer.close()
+
+    if fmt == "parquet":
+        from pyarrow import parquet
+
+        table = parquet.read_table(path)
+    else:
+        table = pa.ipc.open_file(path).read_all()
+
+    assert writer.rows_written == 5
+    assert table.num_rows == 5
+    assert table.column("phone").to_pylist() == ["0", "1", "2", "3", "4"]
+    assert table.column("extra").to_pylist()[0] == [("x", "y")]
+    assert table.schema.field("latitude").type == pa.float64()
+
+
+@pytest.mark.asyncio
+async def test_columnar_sink_live_writes(tmp_path):
+    pytest.importorskip("pyarrow")
+    from pyarrow import parquet
+
+    path = str(tmp_path / "live.parquet")
+    sink = ColumnarSink(path)
+
+    await sink.write(
+        PageRecord.from_payload(
+            "https://facebook.com/Foo/about",
+            {"latitude": "45.5", "phone": "1", "x": "y"},
+            "Foo",
+            scraped_at=0,
+        )
+    )
+    await sink.close()
+
+    table = parquet.read_table(path)
+    assert table.to_pylist()[0] | {"scraped_at": None} == {
+        "page_key": "foo",
+        "url": "https://facebook.com/Foo/about",
+        "display_name": "Foo",
+        "latitude": 45.5,
+        "longitude": None,
+        "scraped_at": None,
+        **dict.fromkeys(KNOWN_FIELDS),
+        "phone": "1",
+        "extra": [("x", "y")],
+    }
+
+
+def test_convert_directory_skips_bad_files(tmp_path):
+    pytest.importorskip("pyarrow")
+    from pyarrow import parquet
+
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "123_about.json").write_text(json.dumps({"phone": "1"}))
+    (data / "broken.json").write_text("{not json")
+
+    out = str(tmp_path / "out.parquet")
+    rows = convert_directory(str(data), out)
+
+    assert rows == 1
+    table = parquet.read_table(out)
+    assert table.column("page_key").to_pylist() == ["123"]
+
+
+@pytest.mark.asyncio
+async def test_convert_directory_keys_files_by_stored_url(tmp_path):
+    pytest.importorskip("pyarrow")
+    from pyarrow import parquet
+
+    data = tmp_path / "data"
+    data.mkdir()
+    url = "https://www.facebook.com/Foo/Bar/about"
+    sink = JsonFileSink(str(data))
+    await sink.write(PageRecord.from_payload(url, {"phone": "1"}, "Foo"))
+    await sink.close()
+
+    out = str(tmp_path / "out.parquet")
+    assert convert_directory(str(data), out) == 1
+
+    row = parquet.read_table(out).to_pylist()[0]
+    assert row["page_key"] == "foo/bar"
+    assert row["url"] == url
+    assert row["extra"] == []
+
+
+@pytest.mark.asyncio
+async def test_convert_directory_reads_sharded_layout(tmp_path):
+    pytest.importorskip("pyarrow")
+    from pyarrow import parquet
+
+    data = str(tmp_path / "data")
+    sink = ShardedJsonSink(data)
+    for key, scraped_at in (("b", 2.0), ("a", 1.0)):
+        await sink.write(
+            PageRecord.from_payload(
+                f"https://facebook.com/{key}", {"phone": key}, scraped_at=scraped_at
+            )
+        )
+    await sink.close()
+
+    out = str(tmp_path / "out.parquet")
+    assert convert_directory(data, out) == 2
+
+    table = parquet.read_table(out)
+    assert table.column("page_key").to_pylist() == ["a", "b"]
+    assert table.column("phone").to_pylist() == ["a", "b"]
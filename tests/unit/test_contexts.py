@@ -0,0 +1,145 @@
+from itertools import count
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.contexts import BrowserHost
+from app.launch import LaunchScheduler
+
+
+def _fake_browser(announce_targets=True, fail_on=None):
+    browser = MagicMock()
+    browser.targets = []
+    browser.sent = []
+    ids = count(1)
+    pending = []
+
+    async def send(command):
+        name = command.gi_code.co_name
+        browser.sent.append(name)
+        if name == fail_on:
+            raise RuntimeError(f"{name} failed")
+        if name == "create_browser_context":
+            return f"ctx{next(ids)}"
+        if name == "create_target":
+            target = MagicMock(type_="page", target_id=f"target{next(ids)}")
+            (browser.targets if announce_targets else pending).append(target)
+            return target.target_id
+        return None
+
+    async def update_targets():
+        browser.targets.extend(pending)
+        pending.clear()
+
+    browser.connection.send = send
+    browser.update_targets = AsyncMock(side_effect=update_targets)
+    return browser
+
+
+@pytest.fixture
+def started(monkeypatch):
+    browsers = []
+
+    async def start(_config):
+        browsers.append(_fake_browser())
+        return browsers[-1]
+
+    monkeypatch.setattr("app.contexts.start", start)
+    monkeypatch.setattr("app.contexts.build_browser_config", MagicMock())
+    return browsers
+
+
+def _use_browser(monkeypatch, browser):
+    async def start(_config):
+        return browser
+
+    monkeypatch.setattr("app.contexts.start", start)
+    monkeypatch.setattr("app.contexts.build_browser_config", MagicMock())
+
+
+@pytest.mark.asyncio
+async def test_workers_share_one_browser_with_separate_contexts(started):
+    host = BrowserHost(1, "host1")
+
+    first = await host.open_tab()
+    second = await host.open_tab()
+
+    assert len(started) == 1
+    assert first is not second
+    assert len(host) == 2
+    assert started[0].sent.count("create_browser_context") == 2
+
+    await host.close_tab(first)
+    started[0].stop.assert_not_called()
+
+    await host.close_tab(second)
+    started[0].stop.assert_called_once()
+    assert started[0].sent.count("dispose_browser_context") == 2
+    assert len(host) == 0
+
+
+@pytest.mark.asyncio
+async def test_browser_is_relaunched_after_last_context(started):
+    host = BrowserHost(1, "host1")
+
+    await host.close_tab(await host.open_tab())
+    await host.open_tab()
+
+    assert len(started) == 2
+
+
+@pytest.mark.asyncio
+async def test_launch_uses_host_slot(started):
+    launcher = LaunchScheduler(1)
+    host = BrowserHost(3, "host3", launcher=launcher)
+
+    await host.open_tab()
+    await host.open_tab()
+
+    assert launcher.summary()["launched"] == 1
+    assert list(launcher.startups) == [3]
+
+
+@pytest.mark.asyncio
+async def test_waits_for_target_to_be_announced(monkeypatch):
+    browser = _fake_browser(announce_targets=False)
+    _use_browser(monkeypatch, browser)
+
+    tab = await BrowserHost(1, "host1").open_tab()
+
+    assert tab.target_id == "target2"
+    browser.update_targets.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_failed_open_releases_the_browser(monkeypatch):
+    browser = _fake_browser(fail_on="create_target")
+    _use_browser(monkeypatch, browser)
+    host = BrowserHost(1, "host1")
+
+    with pytest.raises(RuntimeError, match="create_target failed"):
+        await host.open_tab()
+
+    assert browser.sent[-1] == "dispose_browser_context"
+    browser.stop.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_discarded_browser_is_relaunched(started, monkeypatch):
+    killed = []
+    monkeypatch.setattr("app.contexts.kill_browser", killed.append)
+    host = BrowserHost(1, "host1")
+    first = await host.open_tab()
+    second = await host.open_tab()
+
+    await host.discard(started[0])
+    await host.discard(started[0])
+    await host.close_tab(first)
+    third = await host.open_tab()
+    await host.close_tab(second)
+
+    assert killed == [started[0]]
+    assert len(started) == 2
+    started[1].stop.assert_not_called()
+    await host.close_tab(third)
+    started[1].stop.assert_called_once()
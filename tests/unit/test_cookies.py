@@ -5,7 +5,6 @@ from app.cookies import (
     wait_cookie_banner,
     click_element,
     find_cookie_button,
-    fast_accept_cookies,
 )
 
 
@@ -87,27 +86,3 @@ async def test_find_cookie_button_not_found():
 
     assert result is None
     assert tab.find.await_count == 2
-
-
-@pytest.mark.asyncio
-async def test_fast_accept_cookies_clicks_and_waits_when_found():
-    tab = MagicMock()
-    tab.evaluate = AsyncMock(return_value="Consenti solo i cookie essenziali")
-    tab.wait = AsyncMock()
-
-    await fast_accept_cookies(tab)
-
-    tab.evaluate.assert_awaited_once()
-    tab.wait.assert_awaited_once_with(0.5)
-
-
-@pytest.mark.asyncio
-async def test_fast_accept_cookies_noop_when_not_found():
-    tab = MagicMock()
-    tab.evaluate = AsyncMock(return_value=None)
-    tab.wait = AsyncMock()
-
-    await fast_accept_cookies(tab)
-
-    tab.evaluate.assert_awaited_once()
-    tab.wait.assert_not_awaited()
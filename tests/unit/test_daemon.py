@@ -0,0 +1,242 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.daemon import WarmPool, _parse_batch, start_http_server, watch_spool
+from app.orchestrator import RunConfig
+
+
+def _fake_worker(started, scraped):
+    async def browser_worker(
+        worker_id, source, report, _sink, _config, launcher, extractor, host, archive
+    ):
+        assert extractor is None
+        assert host is None
+        assert archive is None
+        assert launcher is not None
+        started.append(worker_id)
+        while (lease := await source.lease()) is not None:
+            await asyncio.sleep(0)
+            scraped.append((worker_id, lease.url))
+            await report.record_saved()
+            await source.ack(lease)
+
+    return browser_worker
+
+
+@pytest.fixture
+def fake_worker(monkeypatch):
+    started, scraped = [], []
+    monkeypatch.setattr("app.daemon.browser_worker", _fake_worker(started, scraped))
+    return started, scraped
+
+
+async def _settle(pool):
+    while pool.status()["pending"] or pool.status()["busy"]:
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.asyncio
+async def test_submit_scales_workers_up_to_pool_size(fake_worker):
+    started, scraped = fake_worker
+    pool = WarmPool(RunConfig(browsers=3), AsyncMock(), idle_timeout=1)
+
+    assert pool.submit([f"https://example.com/{i}" for i in range(10)]) == 10
+    await _settle(pool)
+
+    assert sorted(started) == [1, 2, 3]
+    assert len(scraped) == 10
+    assert pool.status() == {
+        "workers": 3,
+        "busy": 0,
+        "pending": 0,
+        "saved": 10,
+        "failed": 0,
+        "total": 10,
+    }
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_small_batch_reuses_warm_worker(fake_worker):
+    started, scraped = fake_worker
+    pool = WarmPool(RunConfig(browsers=3), AsyncMock(), idle_timeout=1)
+
+    pool.submit(["https://example.com/a"])
+    await _settle(pool)
+    pool.submit(["https://example.com/b"])
+    await _settle(pool)
+
+    assert started == [1]
+    assert [url for _, url in scraped] == [
+        "https://example.com/a",
+        "https://example.com/b",
+    ]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_workers_are_reaped_and_ids_reused(fake_worker):
+    started, _ = fake_worker
+    pool = WarmPool(RunConfig(browsers=2), AsyncMock(), idle_timeout=0.01)
+
+    pool.submit(["https://example.com/a", "https://example.com/b"])
+    await asyncio.sleep(0.05)
+    assert pool.status()["workers"] == 0
+
+    pool.submit(["https://example.com/c"])
+    await _settle(pool)
+    assert started == [1, 2, 1]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_close_closes_sink(fake_worker):
+    sink = AsyncMock()
+    pool = WarmPool(RunConfig(browsers=1), sink, idle_timeout=10)
+    pool.submit(["https://example.com/a"])
+    await _settle(pool)
+
+    await pool.close()
+
+    sink.close.assert_awaited_once()
+    assert pool.status()["workers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sink_checkpointed_after_each_batch(fake_worker):
+    sink = AsyncMock()
+    pool = WarmPool(RunConfig(browsers=2), sink, idle_timeout=10)
+
+    pool.submit(["https://example.com/a", "https://example.com/b"])
+    await _settle(pool)
+    await asyncio.sleep(0)
+
+    sink.checkpoint.assert_awaited_once()
+    sink.close.assert_not_awaited()
+
+    pool.submit(["https://example.com/c"])
+    await _settle(pool)
+    await asyncio.sleep(0)
+
+    assert sink.checkpoint.await_count == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_watch_spool_submits_and_moves_files(tmp_path, fake_worker):
+    _, scraped = fake_worker
+    (tmp_path / "batch.txt").write_text(
+        "https://example.com/a\n\nhttps://example.com/b\n"
+    )
+    (tmp_path / "batch.tmp").write_text("https://example.com/partial\n")
+    pool = WarmPool(RunConfig(browsers=1), AsyncMock(), idle_timeout=10)
+
+    watcher = asyncio.create_task(watch_spool(pool, str(tmp_path), interval=0.01))
+    await asyncio.sleep(0.02)
+    await _settle(pool)
+    watcher.cancel()
+
+    assert sorted(url for _, url in scraped) == [
+        "https://example.com/a",
+        "https://example.com/b",
+    ]
+    assert (tmp_path / "accepted" / "batch.txt").exists()
+    assert (tmp_path / "batch.tmp").exists()
+    await pool.close()
+
+
+async def _http(port, request):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(request)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+@pytest.mark.asyncio
+async def test_http_endpoint(fake_worker):
+    _, scraped = fake_worker
+    pool = WarmPool(RunConfig(browsers=1), AsyncMock(), idle_timeout=10)
+    server = await start_http_server(pool, port=0)
+    port = server.sockets[0].getsockname()[1]
+
+    body = json.dumps({"urls": ["https://example.com/a"]}).encode()
+    status, payload = await _http(
+        port,
+        b"POST /batches HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body),
+    )
+    assert (status, payload) == (202, {"accepted": 1})
+
+    await _settle(pool)
+    status, payload = await _http(port, b"GET /status HTTP/1.1\r\n\r\n")
+    assert status == 200
+    assert payload["saved"] == 1
+    assert scraped == [(1, "https://example.com/a")]
+
+    status, _ = await _http(port, b"GET /batches HTTP/1.1\r\n\r\n")
+    assert status == 405
+    status, _ = await _http(port, b"GET /nope HTTP/1.1\r\n\r\n")
+    assert status == 404
+
+    server.close()
+    await server.wait_closed()
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_crashed_worker_is_replaced_for_the_backlog(monkeypatch):
+    started, scraped = [], []
+    worker = _fake_worker(started, scraped)
+
+    async def crash_once(worker_id, *args, **kwargs):
+        if not started:
+            started.append(worker_id)
+            raise RuntimeError("browser failed to launch")
+        await worker(worker_id, *args, **kwargs)
+
+    monkeypatch.setattr("app.daemon.browser_worker", crash_once)
+    pool = WarmPool(
+        RunConfig(browsers=1), AsyncMock(), idle_timeout=10, restart_delay=0.01
+    )
+
+    pool.submit(["https://example.com/a"])
+    await _settle(pool)
+
+    assert started == [1, 1]
+    assert scraped == [(1, "https://example.com/a")]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_http_rejects_oversized_body(fake_worker, monkeypatch):
+    monkeypatch.setattr("app.daemon.MAX_BODY_BYTES", 10)
+    pool = WarmPool(RunConfig(browsers=1), AsyncMock(), idle_timeout=10)
+    server = await start_http_server(pool, port=0)
+    port = server.sockets[0].getsockname()[1]
+
+    status, payload = await _http(
+        port, b"POST /batches HTTP/1.1\r\nContent-Length: 11\r\n\r\n"
+    )
+
+    assert status == 413
+    assert "error" in payload
+    assert pool.status()["pending"] == 0
+    server.close()
+    await server.wait_closed()
+    await pool.close()
+
+
+def test_parse_batch_formats():
+    assert _parse_batch(b"https://a\n\n https://b \n") == ["https://a", "https://b"]
+    assert _parse_batch(b'["https://a"]') == ["https://a"]
+    assert _parse_batch(b'{"urls": ["https://a", " "]}') == ["https://a"]
+
+
+def test_parse_batch_rejects_unexpected_json():
+    with pytest.raises(ValueError):
+        _parse_batch(b'{"url": "https://a"}')
@@ -0,0 +1,143 @@
+import json
+
+import pytest
+
+from app.extraction import (
+    MAX_DEPTH,
+    ExtractionPool,
+    extract_about_from_body,
+    extract_fields,
+    find_about_sections,
+    iter_json_blobs,
+    wrap_json_blobs,
+)
+
+ABOUT = {
+    "nodes": [
+        {
+            "activeCollections": {
+                "nodes": [
+                    {
+                        "style_renderer": {
+                            "profile_field_sections": [
+                                {
+                                    "profile_fields": {
+                                        "nodes": [
+                                            {
+                                                "field_type": "address",
+                                                "title": {"text": "Via Roma 1"},
+                                                "map_pin_coordinates": {
+                                                    "latitude": 45.1,
+                                                    "longitude": 9.2,
+                                                },
+                                            },
+                                            {
+                                                "field_type": "phone",
+                                                "title": {"text": "+39 02 1"},
+                                            },
+                                            {"field_type": "email", "title": None},
+                                        ]
+                                    }
+                                }
+                            ]
+                        }
+                    },
+                    {"style_renderer": None},
+                ]
+            }
+        }
+    ]
+}
+
+EXPECTED = {
+    "address": "Via Roma 1",
+    "latitude": 45.1,
+    "longitude": 9.2,
+    "phone": "+39 02 1",
+}
+
+
+def _blob():
+    return {"require": [["ScheduledServerJS", {"data": {"about_app_sections": ABOUT}}]]}
+
+
+def test_extract_fields():
+    assert extract_fields(ABOUT) == EXPECTED
+
+
+def test_find_about_sections_skips_empty_candidates():
+    node = {"a": {"about_app_sections": None}, "b": [{"about_app_sections": ABOUT}]}
+
+    assert find_about_sections(node) is ABOUT
+    assert find_about_sections({"x": [1, "about_app_sections"]}) is None
+
+
+def _nested(depth):
+    node: dict = {"about_app_sections": ABOUT}
+    for _ in range(depth):
+        node = {"child": [node]}
+    return node
+
+
+def test_find_about_sections_handles_deep_documents():
+    assert find_about_sections(_nested(MAX_DEPTH // 2)) is ABOUT
+    assert find_about_sections(_nested(5000)) is None
+
+
+def test_find_about_sections_depth_limit():
+    assert find_about_sections(_nested(2), max_depth=4) is ABOUT
+    assert find_about_sections(_nested(2), max_depth=3) is None
+
+
+def test_extract_from_html_document():
+    html = (
+        "<html><head>"
+        '<script type="application/json">{"unrelated": true}</script>'
+        '<script type="application/json" data-sjs>not json about_app_sections</script>'
+        f'<script type="application/json" data-sjs>{json.dumps(_blob())}</script>'
+        "</head><body></body></html>"
+    )
+
+    assert extract_about_from_body(html) == EXPECTED
+
+
+def test_extract_from_streamed_graphql_response():
+    body = "for (;;);" + "\n".join(
+        [json.dumps({"data": {"other": 1}}), json.dumps({"data": _blob()})]
+    )
+
+    assert list(iter_json_blobs(body))[0] == {"data": _blob()}
+    assert extract_about_from_body(body) == EXPECTED
+
+
+def test_extract_without_marker_returns_none():
+    assert extract_about_from_body('{"data": {}}') is None
+    assert extract_about_from_body('{"about_app_sections": null}') is None
+
+
+@pytest.mark.asyncio
+async def test_inline_pool():
+    pool = ExtractionPool(0)
+
+    assert await pool.extract(json.dumps(_blob())) == EXPECTED
+    assert await pool.extract("<html></html>") is None
+    pool.close()
+
+
+@pytest.mark.asyncio
+async def test_process_pool():
+    pool = ExtractionPool(1)
+    try:
+        assert await pool.extract(json.dumps(_blob())) == EXPECTED
+    finally:
+        pool.close()
+
+
+def test_wrapped_blobs_round_trip():
+    blobs = ['{"a": "x\ny"}', json.dumps({"about_app_sections": ABOUT})]
+
+    body = wrap_json_blobs(blobs)
+
+    assert list(iter_json_blobs(body)) == [json.loads(blobs[1])]
+    assert extract_about_from_body(body) == extract_fields(ABOUT)
+    assert wrap_json_blobs([]) == ""
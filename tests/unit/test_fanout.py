@@ -0,0 +1,90 @@
+import json
+import os
+
+import pytest
+
+from app.fanout import (
+    MANIFEST_NAME,
+    Manifest,
+    ManifestEntry,
+    ShardedJsonSink,
+    shard_path,
+    write_atomic,
+)
+from app.records import PageRecord
+
+
+def test_shard_path_fans_out_by_digest():
+    path = shard_path("some.page/about")
+
+    first, second, name = path.split(os.sep)
+    digest = name.rsplit("-", 1)[1].removesuffix(".json")
+    assert (first, second) == (digest[:2], digest[2:4])
+    assert name.startswith("somepage_about-")
+    assert shard_path("some.page/about") == path
+    assert len(shard_path("x", levels=3).split(os.sep)) == 4
+
+
+def test_shard_path_never_collides_on_slug():
+    # Both keys reduce to the same slug, as safe_filename would.
+    assert shard_path("a.b") != shard_path("ab")
+    assert os.path.basename(shard_path("è")).startswith("page-")
+
+
+def test_write_atomic_replaces_without_leftovers(tmp_path):
+    target = tmp_path / "page.json"
+    target.write_bytes(b"old")
+
+    write_atomic(str(target), b"new")
+
+    assert target.read_bytes() == b"new"
+    assert os.listdir(tmp_path) == ["page.json"]
+
+
+def test_write_atomic_cleans_up_on_failure(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        write_atomic(str(tmp_path / "missing" / "page.json"), b"x")
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_manifest_upserts_by_key(tmp_path):
+    manifest = Manifest(str(tmp_path / MANIFEST_NAME), batch_size=2)
+    manifest.add(ManifestEntry("a", "aa/a.json", 1.0, 10))
+
+    assert manifest.get("a") is None
+
+    manifest.add(ManifestEntry("b", "bb/b.json", 2.0, 20))
+    manifest.add(ManifestEntry("a", "aa/a.json", 3.0, 30))
+    manifest.flush()
+
+    assert len(manifest) == 2
+    assert manifest.get("a") == ManifestEntry("a", "aa/a.json", 3.0, 30)
+    assert [e.page_key for e in manifest.entries(since=2.0)] == ["b", "a"]
+    manifest.close()
+
+
+@pytest.mark.asyncio
+async def test_sharded_sink_writes_and_indexes(tmp_path):
+    sink = ShardedJsonSink(str(tmp_path))
+    record = PageRecord.from_payload(
+        "https://facebook.com/foo/about", {"name": "è"}, "Foo", scraped_at=5.0
+    )
+
+    await sink.write(record)
+    await sink.close()
+
+    path = sink.path_for("foo")
+    with open(path, "rb") as f:
+        data = f.read()
+    assert json.loads(data) == {
+        "name": "è",
+        "display_name": "Foo",
+        "url": "https://facebook.com/foo/about",
+    }
+
+    manifest = Manifest(str(tmp_path / MANIFEST_NAME))
+    entry = manifest.get("foo")
+    manifest.close()
+    assert entry == ManifestEntry("foo", shard_path("foo"), 5.0, len(data))
+    assert os.path.join(str(tmp_path), entry.path) == path
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from app.launch import LAUNCH_PROFILES, LaunchScheduler, launch_flags
+
+
+async def _launch(scheduler, worker_id, state, delay=0.01):
+    async with scheduler.slot(worker_id):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(delay)
+        state["active"] -= 1
+
+
+@pytest.mark.asyncio
+async def test_slot_limits_concurrent_launches():
+    scheduler = LaunchScheduler(2)
+    state = {"active": 0, "peak": 0}
+
+    await asyncio.gather(*(_launch(scheduler, i, state) for i in range(1, 6)))
+
+    assert state["peak"] == 2
+    assert sorted(scheduler.startups) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_unlimited_scheduler_launches_all_at_once():
+    scheduler = LaunchScheduler(0)
+    state = {"active": 0, "peak": 0}
+
+    await asyncio.gather(*(_launch(scheduler, i, state) for i in range(1, 5)))
+
+    assert state["peak"] == 4
+    assert scheduler.concurrency is None
+
+
+@pytest.mark.asyncio
+async def test_queued_workers_record_wait_time():
+    scheduler = LaunchScheduler(1)
+    state = {"active": 0, "peak": 0}
+
+    await asyncio.gather(
+        _launch(scheduler, 1, state, 0.05), _launch(scheduler, 2, state, 0.0)
+    )
+
+    assert scheduler.waits[1] < 0.05 <= scheduler.waits[2]
+    assert scheduler.startups[1] >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_slot_is_released_when_launch_fails():
+    scheduler = LaunchScheduler(1)
+
+    with pytest.raises(RuntimeError):
+        async with scheduler.slot(1):
+            raise RuntimeError("browser failed to start")
+
+    await asyncio.wait_for(_launch(scheduler, 2, {"active": 0, "peak": 0}), 1)
+    assert set(scheduler.startups) == {1, 2}
+
+
+def test_summary():
+    scheduler = LaunchScheduler(2)
+    assert scheduler.summary() == {"launched": 0}
+
+    scheduler.waits.update({1: 0.0, 2: 1.5})
+    scheduler.startups.update({1: 2.0, 2: 3.0})
+
+    assert scheduler.summary() == {
+        "launched": 2,
+        "max_wait": 1.5,
+        "mean_startup": 2.5,
+        "max_startup": 3.0,
+    }
+
+
+@pytest.mark.parametrize("profile", sorted(LAUNCH_PROFILES))
+def test_launch_profiles_extend_default_and_keep_site_isolation_off(profile):
+    flags = launch_flags(profile)
+    disabled = [f for f in flags if f.startswith("--disable-features=")]
+
+    assert set(LAUNCH_PROFILES["default"]) <= set(flags)
+    assert len(flags) == len(set(flags))
+    # Chromium keeps only the last --disable-features switch.
+    assert len(disabled) <= 1
+    assert all("IsolateOrigins,site-per-process" in f for f in disabled)
+
+
+def test_launch_flags_returns_a_copy():
+    launch_flags("default").append("--bogus")
+
+    assert "--bogus" not in LAUNCH_PROFILES["default"]
+
+
+def test_launch_flags_rejects_unknown_profile():
+    with pytest.raises(ValueError, match="Unknown launch profile"):
+        launch_flags("turbo")
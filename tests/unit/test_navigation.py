@@ -0,0 +1,121 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from nodriver import cdp
+
+from app.navigation import PageMeter, navigate_eager, stop_loading
+
+
+def _metrics(task_duration):
+    return [
+        SimpleNamespace(name="Nodes", value=10.0),
+        SimpleNamespace(name="TaskDuration", value=task_duration),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_page_meter_measures_cpu_and_bytes():
+    tab = MagicMock()
+    tab.send = AsyncMock(side_effect=[None, _metrics(1.0), _metrics(1.25)])
+    meter = PageMeter(tab)
+
+    await meter.enable()
+    handler = tab.add_handler.call_args.args[1]
+    assert tab.add_handler.call_args.args[0] is cdp.network.LoadingFinished
+
+    await meter.start()
+    handler(SimpleNamespace(encoded_data_length=1000.0))
+    handler(SimpleNamespace(encoded_data_length=24.0))
+    cost = await meter.finish()
+
+    assert cost.cpu_seconds == pytest.approx(0.25)
+    assert cost.bytes_received == 1024
+
+
+@pytest.mark.asyncio
+async def test_page_meter_handles_renderer_swap():
+    tab = MagicMock()
+    tab.send = AsyncMock(side_effect=[_metrics(5.0), _metrics(0.5)])
+    meter = PageMeter(tab)
+
+    await meter.start()
+    cost = await meter.finish()
+
+    assert cost.cpu_seconds == 0.5
+    assert cost.bytes_received == 0
+
+
+@pytest.mark.asyncio
+async def test_page_meter_counts_cdp_messages_and_bytes():
+    async def connection_send(cdp_obj, _is_update=False):
+        # Mimics nodriver's Transaction: one request, one parsed response.
+        next(cdp_obj)
+        try:
+            cdp_obj.send(response)
+        except StopIteration as parsed:
+            return parsed.value
+        return None
+
+    response = {}
+    tab = MagicMock()
+    tab.send = connection_send
+    meter = PageMeter(tab)
+    meter._cpu_time = AsyncMock(return_value=0.0)
+
+    await meter.enable()
+    await meter.start()
+    response = {"frameId": "F1"}
+    frame_id, *_ = await tab.send(cdp.page.navigate("https://example.com"))
+    response = {}
+    await tab.send(cdp.page.stop_loading())
+    cost = await meter.finish()
+
+    assert frame_id == "F1"
+    assert cost.cdp_messages == 4
+    assert cost.cdp_bytes == sum(
+        len(json.dumps(m))
+        for m in (
+            {"method": "Page.navigate", "params": {"url": "https://example.com"}},
+            {"frameId": "F1"},
+            {"method": "Page.stopLoading"},
+            {},
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_navigate_eager_returns_once_blob_is_present():
+    tab = MagicMock()
+    tab.send = AsyncMock()
+    tab.evaluate = AsyncMock(
+        side_effect=[None, RuntimeError("context gone"), False, True]
+    )
+
+    await navigate_eager(tab, "https://facebook.com/page/about", poll=0)
+
+    assert tab.evaluate.await_count == 4
+    tab.send.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_navigate_eager_times_out():
+    tab = MagicMock()
+    tab.send = AsyncMock()
+    tab.evaluate = AsyncMock(return_value=False)
+
+    with pytest.raises(RuntimeError, match="about_app_sections"):
+        await navigate_eager(
+            tab, "https://facebook.com/page/about", timeout=0.05, poll=0.01
+        )
+
+
+@pytest.mark.asyncio
+async def test_stop_loading_sends_command():
+    tab = MagicMock()
+    tab.send = AsyncMock()
+
+    await stop_loading(tab)
+
+    tab.send.assert_awaited_once()
@@ -9,13 +9,18 @@ class FakeProcess:
         return 37.5
 
 
+import json
 import logging
+from unittest.mock import MagicMock
 
 import pytest
 
 from app.observability import (
+    JsonFormatter,
     Observability,
     ObservabilityConfig,
+    RateLimitFilter,
+    TextFormatter,
     get_logger,
     log_resources,
 )
@@ -77,8 +82,8 @@ def test_log_resources_emits_log(caplog):
 def test_setup_registers_default_observability(monkeypatch):
     # Evitiamo psutil reale
     monkeypatch.setattr(
-        "app.observability.psutil.Process",
-        lambda pid: FakeProcess(),
+        "app.observability._import_psutil",
+        lambda: MagicMock(Process=lambda pid: FakeProcess()),
     )
 
     obs = Observability.setup(enable_resource_logging=True)
@@ -91,8 +96,8 @@ def test_setup_registers_default_observability(monkeypatch):
 
 def test_legacy_log_resources_after_setup(monkeypatch, caplog):
     monkeypatch.setattr(
-        "app.observability.psutil.Process",
-        lambda pid: FakeProcess(),
+        "app.observability._import_psutil",
+        lambda: MagicMock(Process=lambda pid: FakeProcess()),
     )
 
     Observability.setup(enable_resource_logging=True)
@@ -111,3 +116,69 @@ def test_legacy_log_resources_without_setup_is_noop(caplog):
         log_resources("no-setup")
 
     assert caplog.text == ""
+
+
+def _record(lineno=10, level=logging.INFO, msg="Page %s done", args=("a",)):
+    return logging.LogRecord("app.test", level, "app/test.py", lineno, msg, args, None)
+
+
+def test_rate_limit_filter_drops_and_counts_per_call_site(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("app.observability.time.monotonic", lambda: now[0])
+    limiter = RateLimitFilter(rate=1.0, burst=2)
+
+    assert [limiter.filter(_record()) for _ in range(5)] == [
+        True,
+        True,
+        False,
+        False,
+        False,
+    ]
+    assert limiter.filter(_record(lineno=11))
+    assert limiter.filter(_record(level=logging.WARNING))
+
+    now[0] = 1.0
+    record = _record()
+    assert limiter.filter(record)
+    assert record.suppressed == 3
+    assert not limiter.filter(_record())
+
+
+def test_text_formatter_notes_suppressed_records():
+    record = _record()
+    record.suppressed = 4
+
+    assert TextFormatter("%(message)s").format(record) == (
+        "Page a done [4 similar suppressed]"
+    )
+    assert TextFormatter("%(message)s").format(_record()) == "Page a done"
+
+
+def test_json_formatter():
+    record = _record()
+    record.suppressed = 2
+
+    data = json.loads(JsonFormatter().format(record))
+
+    assert data["level"] == "INFO"
+    assert data["logger"] == "app.test"
+    assert data["message"] == "Page a done"
+    assert data["suppressed"] == 2
+    assert "time" in data
+
+
+def test_setup_writes_through_queue_listener(monkeypatch, capsys):
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    monkeypatch.setattr(root, "level", root.level)
+
+    obs = Observability.setup(
+        enable_resource_logging=False, log_format="json", log_rate=1000
+    )
+    assert obs._listener is not None
+    logging.getLogger("queued.module").info("hello %s", "world")
+    obs.close()
+
+    line = capsys.readouterr().err.strip()
+    assert json.loads(line)["message"] == "hello world"
+    assert obs._listener is None
@@ -0,0 +1,129 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.pipeline import PrefetchPipeline
+from app.work_queue import ListWorkSource
+
+
+def _navigator(delays=None, fail=()):
+    delays = delays or {}
+    state = {"active": 0, "peak": 0, "started": []}
+
+    async def navigate(lane, lease):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        state["started"].append((lane, lease.url))
+        try:
+            await asyncio.sleep(delays.get(lease.url, 0))
+            if lease.url in fail:
+                raise RuntimeError(f"{lease.url} failed")
+        finally:
+            state["active"] -= 1
+
+    return navigate, state
+
+
+async def _drain(pipeline, source, work=0.0):
+    seen = []
+    async for page in pipeline.pages(source):
+        seen.append(page)
+        await asyncio.sleep(work)
+    return seen
+
+
+def test_pipeline_needs_a_lane():
+    with pytest.raises(ValueError):
+        PrefetchPipeline([], AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_single_lane_is_sequential():
+    navigate, state = _navigator()
+    pipeline = PrefetchPipeline(["tab"], navigate)
+
+    pages = await _drain(pipeline, ListWorkSource(["a", "b", "c"]))
+
+    assert pipeline.depth == 0
+    assert [page.lease.url for page in pages] == ["a", "b", "c"]
+    assert state["peak"] == 1
+
+
+@pytest.mark.asyncio
+async def test_navigations_are_bounded_by_lanes():
+    navigate, state = _navigator({url: 0.01 for url in "abcdefgh"})
+    pipeline = PrefetchPipeline(["t1", "t2", "t3"], navigate)
+
+    pages = await _drain(pipeline, ListWorkSource(list("abcdefgh")), work=0.005)
+
+    assert sorted(page.lease.url for page in pages) == list("abcdefgh")
+    assert state["peak"] == 3
+    assert {lane for lane, _ in state["started"]} == {"t1", "t2", "t3"}
+
+
+@pytest.mark.asyncio
+async def test_lane_is_reused_only_after_its_page():
+    processing = set()
+
+    async def navigate(lane, _lease):
+        assert lane not in processing
+
+    pipeline = PrefetchPipeline(["t1", "t2"], navigate)
+
+    async for page in pipeline.pages(ListWorkSource(list("abcdef"))):
+        processing.add(page.lane)
+        await asyncio.sleep(0.001)
+        processing.discard(page.lane)
+        assert page.error is None
+
+
+@pytest.mark.asyncio
+async def test_ready_page_is_not_held_up_by_a_slow_one():
+    navigate, _ = _navigator({"slow": 0.05})
+    pipeline = PrefetchPipeline(["t1", "t2"], navigate)
+
+    pages = await _drain(pipeline, ListWorkSource(["slow", "fast"]))
+
+    assert [page.lease.url for page in pages] == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_navigation_error_is_handed_to_the_caller():
+    navigate, _ = _navigator(fail={"b"})
+    pipeline = PrefetchPipeline(["t1", "t2"], navigate)
+
+    pages = await _drain(pipeline, ListWorkSource(["a", "b", "c"]))
+
+    errors = {page.lease.url: page.error for page in pages}
+    assert errors["a"] is None and errors["c"] is None
+    assert str(errors["b"]) == "b failed"
+
+
+@pytest.mark.asyncio
+async def test_early_exit_cancels_pending_navigations():
+    navigate, state = _navigator({"b": 10, "c": 10})
+    pipeline = PrefetchPipeline(["t1", "t2", "t3"], navigate)
+
+    pages = pipeline.pages(ListWorkSource(["a", "b", "c"]))
+    first = await anext(pages)
+    await pages.aclose()
+
+    assert first.lease.url == "a"
+    assert state["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_overlap_is_reported():
+    report = AsyncMock()
+    navigate, _ = _navigator({"a": 0.02, "b": 0.02})
+    pipeline = PrefetchPipeline(["t1", "t2"], navigate, report)
+
+    # The second page loads while the first one is being processed.
+    await _drain(pipeline, ListWorkSource(["a", "b"]), work=0.05)
+
+    (first, waited_first), (second, waited_second) = [
+        c.args for c in report.record_prefetch.await_args_list
+    ]
+    assert waited_first == pytest.approx(first, abs=0.01)
+    assert second >= 0.02 and waited_second < 0.01
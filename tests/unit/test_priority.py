@@ -0,0 +1,138 @@
+import json
+import time
+
+import pytest
+
+from app.priority import (
+    PriorityWorkSource,
+    UrlRequest,
+    is_priority_file,
+    parse_deadline,
+    read_requests,
+)
+from app.reporting import ScrapeReport
+
+
+async def _drain(source):
+    order = []
+    while (lease := await source.lease()) is not None:
+        order.append(lease.url)
+        await source.ack(lease)
+    return order
+
+
+def test_parse_deadline():
+    assert parse_deadline("") is None
+    assert parse_deadline(None) is None
+    assert parse_deadline(1700000000) == 1700000000.0
+    assert parse_deadline("1700000000.5") == 1700000000.5
+    assert parse_deadline("2023-11-14T22:13:20") == 1700000000.0
+    assert parse_deadline("2023-11-14T23:13:20+01:00") == 1700000000.0
+
+    with pytest.raises(ValueError):
+        parse_deadline("tomorrow")
+
+
+def test_is_priority_file():
+    assert is_priority_file("urls.tsv")
+    assert is_priority_file("URLS.JSONL")
+    assert not is_priority_file("urls.txt")
+
+
+def test_read_requests_tsv(tmp_path):
+    path = tmp_path / "urls.tsv"
+    path.write_text(
+        "# url\tpriority\tdeadline\n"
+        "https://a\n"
+        "https://b\thigh\n"
+        "https://c\tlow\t1700000000\n"
+        "\n"
+    )
+
+    assert read_requests(str(path)) == [
+        UrlRequest("https://a"),
+        UrlRequest("https://b", "high"),
+        UrlRequest("https://c", "low", 1700000000.0),
+    ]
+
+
+def test_read_requests_jsonl(tmp_path):
+    path = tmp_path / "urls.jsonl"
+    path.write_text(
+        json.dumps({"url": "https://a", "priority": "high"})
+        + "\n"
+        + json.dumps({"url": "https://b", "deadline": "2023-11-14T22:13:20Z"})
+        + "\n"
+    )
+
+    assert read_requests(str(path)) == [
+        UrlRequest("https://a", "high"),
+        UrlRequest("https://b", "normal", 1700000000.0),
+    ]
+
+
+def test_read_requests_reports_line_number(tmp_path):
+    path = tmp_path / "urls.tsv"
+    path.write_text("https://a\nhttps://b\turgent\n")
+
+    with pytest.raises(ValueError, match=r"urls.tsv:2: .*'urgent'"):
+        read_requests(str(path))
+
+
+@pytest.mark.asyncio
+async def test_weighted_classes_do_not_starve():
+    requests = [UrlRequest(f"h{i}", "high") for i in range(8)]
+    requests += [UrlRequest(f"n{i}", "normal") for i in range(4)]
+    requests += [UrlRequest(f"l{i}", "low") for i in range(2)]
+
+    order = await _drain(PriorityWorkSource(requests))
+
+    # Weights 4:2:1 interleave the classes: every window of 7 leases
+    # serves each class in proportion instead of draining "high" first.
+    first = order[:7]
+    assert sum(url.startswith("h") for url in first) == 4
+    assert sum(url.startswith("n") for url in first) == 2
+    assert sum(url.startswith("l") for url in first) == 1
+    assert len(order) == 14
+
+
+@pytest.mark.asyncio
+async def test_earliest_deadline_first_within_class():
+    far = time.time() + 3600
+    requests = [
+        UrlRequest("none"),
+        UrlRequest("later", deadline=far + 10),
+        UrlRequest("sooner", deadline=far),
+    ]
+
+    assert await _drain(PriorityWorkSource(requests)) == ["sooner", "later", "none"]
+
+
+@pytest.mark.asyncio
+async def test_urgent_deadline_bypasses_class_weights():
+    requests = [UrlRequest(f"h{i}", "high") for i in range(3)]
+    requests.append(UrlRequest("urgent", "low", deadline=time.time() + 5))
+
+    order = await _drain(PriorityWorkSource(requests, urgency=60))
+
+    assert order[0] == "urgent"
+
+
+@pytest.mark.asyncio
+async def test_latency_is_recorded_per_class():
+    report = ScrapeReport()
+    source = PriorityWorkSource(
+        [UrlRequest("a", "high"), UrlRequest("b", "low", deadline=0)], report
+    )
+
+    first = await source.lease()
+    second = await source.lease()
+    await source.ack(first)
+    assert await source.nack(second, "boom") is False
+
+    stats = report.class_latency()
+    assert set(stats) == {"high", "low"}
+    assert stats["high"]["count"] == 1
+    assert stats["high"]["missed_deadlines"] == 0
+    assert stats["low"]["missed_deadlines"] == 1
+    assert report.summary() == {"saved": 0, "failed": 0, "total": 0}
@@ -0,0 +1,64 @@
+import json
+
+from app.profiling import (
+    HOTSPOTS_FILE,
+    PYTHON_STATS_FILE,
+    profile_run,
+    trace_hotspots,
+    write_hotspots,
+)
+
+
+def _busy_loop():
+    return sum(i * i for i in range(200000))
+
+
+def test_profile_run_writes_stats_and_hotspots(tmp_path):
+    directory = tmp_path / "profile"
+
+    with profile_run(str(directory), backend="cprofile"):
+        _busy_loop()
+
+    assert (directory / PYTHON_STATS_FILE).exists()
+    summary = json.loads((directory / HOTSPOTS_FILE).read_text())
+    functions = [entry["function"] for entry in summary["python"]]
+    assert any("_busy_loop" in f or "<genexpr>" in f for f in functions)
+    assert summary["browser"] == []
+    assert summary["traces"] == []
+
+
+def _write_trace(path, events):
+    path.write_text(json.dumps({"traceEvents": events}))
+
+
+def test_trace_hotspots_sums_complete_events(tmp_path):
+    _write_trace(
+        tmp_path / "trace-1-1.json",
+        [
+            {"name": "EvaluateScript", "ph": "X", "dur": 3000},
+            {"name": "Layout", "ph": "X", "dur": 500},
+            {"name": "Layout", "ph": "B"},
+        ],
+    )
+    _write_trace(
+        tmp_path / "trace-2-5.json",
+        [{"name": "Layout", "ph": "X", "dur": 1000}],
+    )
+
+    hotspots = trace_hotspots(
+        [str(tmp_path / "trace-1-1.json"), str(tmp_path / "trace-2-5.json")]
+    )
+
+    assert hotspots == [
+        {"name": "EvaluateScript", "count": 1, "total_ms": 3.0},
+        {"name": "Layout", "count": 2, "total_ms": 1.5},
+    ]
+
+
+def test_write_hotspots_lists_traces(tmp_path):
+    _write_trace(tmp_path / "trace-1-1.json", [])
+
+    summary = write_hotspots(str(tmp_path))
+
+    assert summary == {"python": [], "browser": [], "traces": ["trace-1-1.json"]}
+    assert json.loads((tmp_path / HOTSPOTS_FILE).read_text()) == summary
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from app import records
+from app.records import PageRecord, dumps, json_backend, loads
+
+URL = "https://www.facebook.com/Foo/about"
+
+
+@pytest.fixture
+def stdlib_json(monkeypatch):
+    monkeypatch.setattr(records, "_orjson", lambda: None)
+
+
+def test_from_json_types_reserved_fields():
+    record = PageRecord.from_json(
+        URL,
+        '{"phone": "1", "address": "Via Roma", "latitude": "45.5", "longitude": 9.2}',
+        "Foo",
+        scraped_at=10.0,
+    )
+
+    assert record.page_key == "foo"
+    assert record.display_name == "Foo"
+    assert (record.latitude, record.longitude) == (45.5, 9.2)
+    assert record.fields == {"phone": "1", "address": "Via Roma"}
+    assert record.scraped_at == 10.0
+
+
+@pytest.mark.parametrize("data", ["{bad json}", "[1, 2]", '"text"'])
+def test_from_json_rejects_non_objects(data):
+    with pytest.raises(ValueError):
+        PageRecord.from_json(URL, data)
+
+
+def test_title_takes_precedence_over_payload_display_name():
+    record = PageRecord.from_payload(URL, {"display_name": "Old"}, "New")
+
+    assert record.display_name == "New"
+    assert PageRecord.from_payload(URL, {"display_name": "Old"}).display_name == "Old"
+
+
+def test_to_payload_keeps_the_legacy_shape():
+    record = PageRecord.from_payload(URL, {"phone": "1", "latitude": 45.5})
+
+    assert record.to_payload() == {
+        "phone": "1",
+        "latitude": 45.5,
+        "display_name": None,
+    }
+
+
+def test_record_has_no_instance_dict():
+    record = PageRecord.from_payload(URL, {})
+
+    assert not hasattr(record, "__dict__")
+
+
+def test_stdlib_backend_roundtrip(stdlib_json):
+    record = PageRecord.from_payload(URL, {"name": "è"}, "Foo")
+
+    assert json_backend() == "json"
+    assert record.dumps() == '{"name":"è","display_name":"Foo"}'.encode("utf-8")
+    assert loads(record.dumps(indent=True)) == record.to_payload()
+    assert dumps({"a": 1}, indent=True) == json.dumps({"a": 1}, indent=2).encode()
+
+
+def test_orjson_backend_matches_stdlib(stdlib_json, monkeypatch):
+    orjson = pytest.importorskip("orjson")
+    payload = {"name": "è", "n": [1, 2.5, None]}
+    expected = dumps(payload, indent=True)
+
+    monkeypatch.setattr(records, "_orjson", lambda: orjson)
+
+    assert json_backend() == "orjson"
+    assert dumps(payload, indent=True) == expected
+    assert loads(dumps(payload)) == payload
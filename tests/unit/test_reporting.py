@@ -1,7 +1,15 @@
 import asyncio
+import json
+import random
 import pytest
 
-from app.reporting import ScrapeReport
+from app.reporting import (
+    LatencyHistogram,
+    ScrapeReport,
+    current_worker,
+    failure_class,
+    merge_summaries,
+)
 
 
 @pytest.mark.asyncio
@@ -105,3 +113,310 @@ async def test_log_summary_does_not_crash(caplog):
         report.log_summary()
 
     assert "Scraping completed" in caplog.text
+
+
+def test_merge_summaries_adds_counts():
+    merged = merge_summaries(
+        [
+            {"saved": 1, "failed": 2, "total": 3},
+            {"saved": 4, "failed": 0, "total": 4},
+        ]
+    )
+
+    assert merged == {"saved": 5, "failed": 2, "total": 7}
+
+
+@pytest.mark.asyncio
+async def test_write_summary_roundtrip(tmp_path):
+    report = ScrapeReport()
+    await report.record_saved()
+
+    path = tmp_path / "summary.json"
+    report.write_summary(str(path))
+
+    data = json.loads(path.read_text())
+    assert data.items() >= report.summary().items()
+    assert data["throughput"][0]["saved"] == 1
+    assert "failures" not in data
+    merged = merge_summaries([data])
+    assert merged.items() >= report.summary().items()
+    assert merged["throughput"] == data["throughput"]
+
+
+@pytest.mark.asyncio
+async def test_class_latency_statistics():
+    report = ScrapeReport()
+    for seconds in (1.0, 2.0, 3.0, 4.0):
+        await report.record_latency("high", seconds)
+    await report.record_latency("low", 10.0, missed_deadline=True)
+
+    stats = report.class_latency()
+    assert stats["high"] == {
+        "count": 4,
+        "mean": 2.5,
+        "p50": pytest.approx(2.0, rel=0.01),
+        "p95": 4.0,
+        "max": 4.0,
+        "missed_deadlines": 0,
+    }
+    assert stats == {
+        "high": stats["high"],
+        "low": {
+            "count": 1,
+            "mean": 10.0,
+            "p50": 10.0,
+            "p95": 10.0,
+            "max": 10.0,
+            "missed_deadlines": 1,
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_write_summary_includes_class_latency(tmp_path):
+    report = ScrapeReport()
+    await report.record_saved()
+    await report.record_latency("normal", 1.5)
+
+    path = tmp_path / "summary.json"
+    report.write_summary(str(path))
+
+    data = json.loads(path.read_text())
+    assert data["saved"] == 1
+    assert data["class_latency"]["normal"]["count"] == 1
+    assert merge_summaries([data])["class_latency"] == data["class_latency"]
+
+
+@pytest.mark.asyncio
+async def test_page_cost():
+    report = ScrapeReport()
+    assert report.page_cost() == {}
+
+    await report.record_page_cost(0.5, 1000, 6, 20000)
+    await report.record_page_cost(1.5, 3001, 5, 10001)
+
+    assert report.page_cost() == {
+        "pages": 2,
+        "cpu_seconds": 2.0,
+        "cpu_seconds_per_page": 1.0,
+        "bytes": 4001,
+        "bytes_per_page": 2000,
+        "cdp_messages": 11,
+        "cdp_messages_per_page": 5.5,
+        "cdp_bytes": 30001,
+        "cdp_bytes_per_page": 15000,
+    }
+    assert report.summary() == {"saved": 0, "failed": 0, "total": 0}
+
+
+@pytest.mark.asyncio
+async def test_extraction_time():
+    report = ScrapeReport()
+    assert report.extraction_time() == {}
+
+    for ms in (12.0, 3.5, 40.25, 8.0):
+        await report.record_extraction_time(ms)
+
+    assert report.extraction_time() == {
+        "count": 4,
+        "mean_ms": 15.9,
+        "p50_ms": 8.0,
+        "p95_ms": 40.2,
+        "max_ms": 40.2,
+    }
+
+
+def test_histogram_percentiles_within_precision():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(0, 1.5) for _ in range(10000)]
+    histogram = LatencyHistogram(precision=0.01)
+    for value in values:
+        histogram.record(value)
+
+    ordered = sorted(values)
+    for pct in (50, 90, 99):
+        exact = ordered[int(pct / 100 * len(ordered)) - 1]
+        assert histogram.percentile(pct) == pytest.approx(exact, rel=0.011)
+    assert histogram.percentile(100) == max(values)
+    assert histogram.stats()["mean"] == pytest.approx(
+        sum(values) / len(values), abs=1e-3
+    )
+    assert len(histogram.to_dict()["buckets"]) < 1500
+
+
+def test_histogram_merge_and_roundtrip():
+    first, second = LatencyHistogram(), LatencyHistogram()
+    for value in (0.5, 1.0, 2.0):
+        first.record(value)
+    for value in (4.0, 8.0, 0.0):
+        second.record(value)
+
+    first.merge(LatencyHistogram.from_dict(json.loads(json.dumps(second.to_dict()))))
+
+    assert first.count == 6
+    assert first.max == 8.0
+    assert first.percentile(50) == pytest.approx(1.0, rel=0.01)
+    with pytest.raises(ValueError):
+        first.merge(LatencyHistogram(precision=0.05))
+
+
+def test_failure_class():
+    assert failure_class(asyncio.TimeoutError()) == "timeout"
+    assert failure_class(ConnectionResetError()) == "connection"
+    assert failure_class(RuntimeError("about_app_sections not found")) == "not_found"
+    assert failure_class(KeyError("x")) == "KeyError"
+
+
+@pytest.mark.asyncio
+async def test_per_worker_and_failure_class_counters():
+    report = ScrapeReport()
+
+    async def worker(worker_id, outcomes):
+        current_worker.set(worker_id)
+        for ok in outcomes:
+            if ok:
+                await report.record_saved()
+            else:
+                await report.record_failed("timeout")
+            await report.record_page_time(2.0)
+
+    await asyncio.gather(worker(1, [True, True, False]), worker(2, [False]))
+    await report.record_failed()
+
+    assert report.summary() == {"saved": 2, "failed": 3, "total": 5}
+    assert report.failures() == {"timeout": 2, "error": 1}
+    assert report.workers() == {
+        1: {
+            "saved": 2,
+            "failed": 1,
+            "pages": 3,
+            "busy_seconds": 6.0,
+            "seconds_per_page": 2.0,
+        },
+        2: {
+            "saved": 0,
+            "failed": 1,
+            "pages": 1,
+            "busy_seconds": 2.0,
+            "seconds_per_page": 2.0,
+        },
+    }
+    assert report.page_latency()["p99"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_throughput_timeline(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.reporting.time.monotonic", lambda: now[0])
+    report = ScrapeReport()
+
+    await report.record_saved()
+    now[0] += 15
+    await report.record_failed()
+    now[0] += 110
+    await report.record_saved()
+    await report.record_saved()
+
+    assert report.throughput(interval=60) == [
+        {"start": 0, "saved": 1, "failed": 1, "pages_per_minute": 2.0},
+        {"start": 60, "saved": 0, "failed": 0, "pages_per_minute": 0.0},
+        {"start": 120, "saved": 2, "failed": 0, "pages_per_minute": 2.0},
+    ]
+    assert report.to_dict()["pages_per_minute"] == 1.9
+
+
+def test_merge_summaries_combines_failures_and_latency():
+    reports = []
+    for seconds in ((1.0, 2.0), (3.0, 4.0)):
+        report = ScrapeReport()
+        for value in seconds:
+            asyncio.run(report.record_page_time(value))
+        asyncio.run(report.record_failed("timeout"))
+        reports.append(json.loads(json.dumps(report.to_dict())))
+
+    merged = merge_summaries(reports)
+
+    assert merged["failed"] == 2
+    assert merged["failures"] == {"timeout": 2}
+    assert merged["page_latency"]["count"] == 4
+    assert merged["page_latency"]["max"] == 4.0
+    assert merged["page_latency"]["p50"] == pytest.approx(2.0, rel=0.01)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_overlap():
+    report = ScrapeReport()
+    assert report.prefetch() == {}
+
+    await report.record_prefetch(2.0, 2.0)
+    await report.record_prefetch(2.0, 0.5)
+    # Waiting longer than the navigation took hides nothing, not less.
+    await report.record_prefetch(1.0, 3.0)
+
+    assert report.prefetch() == {
+        "pages": 3,
+        "navigation_seconds": 5.0,
+        "waited_seconds": 3.5,
+        "hidden_seconds": 1.5,
+        "overlap_ratio": 0.3,
+    }
+    assert report.to_dict()["prefetch"]["pages"] == 3
+
+
+@pytest.mark.asyncio
+async def test_incidents():
+    report = ScrapeReport()
+    assert report.incidents() == {}
+    assert "incidents" not in report.to_dict()
+
+    await report.record_incident("page_stall", 2, 0)
+    await report.record_incident("browser_crash", 1, 1)
+    await report.record_incident("page_stall", 1, 0)
+
+    assert report.incidents() == {
+        "total": 3,
+        "kinds": {"page_stall": 2, "browser_crash": 1},
+        "requeued": 4,
+        "given_up": 1,
+    }
+    assert report.to_dict()["incidents"]["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_merge_summaries_keeps_every_section():
+    reports = []
+    for shard in ("0/2", "1/2"):
+        report = ScrapeReport()
+        token = current_worker.set(1)
+        await report.record_saved()
+        await report.record_page_time(1.0)
+        current_worker.reset(token)
+        await report.record_latency("high", 2.0, missed_deadline=True)
+        await report.record_page_cost(0.5, 1000, 4, 100)
+        await report.record_extraction_time(10.0)
+        await report.record_prefetch(2.0, 1.0)
+        await report.record_incident("page_stall", 1, 0)
+        reports.append({**json.loads(json.dumps(report.to_dict())), "shard": shard})
+
+    merged = merge_summaries(reports)
+
+    assert set(merged) >= set(reports[0]) - {"shard"}
+    assert list(merged["workers"]) == ["0/2:1", "1/2:1"]
+    assert merged["throughput"][0]["saved"] == 2
+    assert merged["class_latency"]["high"]["count"] == 2
+    assert merged["class_latency"]["high"]["missed_deadlines"] == 2
+    assert merged["page_cost"]["cdp_messages_per_page"] == 4.0
+    assert merged["page_cost"]["bytes"] == 2000
+    assert merged["extraction_time"]["count"] == 2
+    assert merged["prefetch"]["overlap_ratio"] == 0.5
+    assert merged["incidents"] == {
+        "total": 2,
+        "kinds": {"page_stall": 2},
+        "requeued": 2,
+        "given_up": 0,
+    }
+
+
+def test_merge_summaries_rejects_unknown_sections():
+    with pytest.raises(ValueError, match="gpu_time"):
+        merge_summaries([{"saved": 1, "failed": 0, "total": 1, "gpu_time": {}}])
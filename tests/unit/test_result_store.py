@@ -0,0 +1,112 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from app.records import PageRecord
+from app.result_store import SQLiteResultStore
+
+
+def _record(url, payload, scraped_at=None):
+    return PageRecord.from_payload(url, payload, scraped_at=scraped_at)
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = SQLiteResultStore(str(tmp_path / "results.sqlite"), batch_size=2)
+    yield s
+    s.shutdown()
+
+
+def test_add_buffers_until_batch_full(store, tmp_path):
+    store.add(_record("https://facebook.com/a", {"display_name": "A"}))
+
+    assert store.get("a") is None
+
+    store.add(_record("https://facebook.com/b", {"display_name": "B"}))
+
+    assert store.get("a") == {"display_name": "A"}
+    assert store.get("b") == {"display_name": "B"}
+
+
+def test_upsert_replaces_previous_row(store):
+    store.add(_record("https://facebook.com/a", {"phone": "1"}))
+    store.add(_record("https://facebook.com/A/about", {"phone": "2"}))
+    store.flush()
+
+    assert store.get("a") == {"phone": "2", "display_name": None}
+    rows = store._conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+    assert rows == (1,)
+
+
+def test_coordinates_are_typed_columns(store):
+    store.add(
+        _record(
+            "https://facebook.com/a",
+            {"latitude": 45.1, "longitude": "9.2", "display_name": "A"},
+        )
+    )
+    store.flush()
+
+    row = store._conn.execute(
+        "SELECT display_name, latitude, longitude FROM pages"
+    ).fetchone()
+    assert row == ("A", 45.1, 9.2)
+
+
+def test_iter_since_is_incremental(store):
+    store.add(_record("https://facebook.com/old", {"v": 1}, scraped_at=100.0))
+    store.add(_record("https://facebook.com/new", {"v": 2}, scraped_at=200.0))
+    store.flush()
+
+    assert [k for k, _, _ in store.iter_since(150.0)] == ["new"]
+    assert [k for k, _, _ in store.iter_since()] == ["old", "new"]
+
+
+def test_indexes_and_wal_mode(tmp_path):
+    path = str(tmp_path / "r.sqlite")
+    SQLiteResultStore(path).shutdown()
+
+    conn = sqlite3.connect(path)
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(pages)")}
+    mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+
+    assert "pages_scraped_at" in indexes
+    assert mode == "wal"
+
+
+@pytest.mark.asyncio
+async def test_async_write_and_close_flush(tmp_path):
+    path = str(tmp_path / "r.sqlite")
+    store = SQLiteResultStore(path)
+
+    await store.write(_record("https://facebook.com/a", {"k": "v"}))
+    await store.close()
+
+    reopened = SQLiteResultStore(path)
+    assert reopened.get("a") == {"k": "v", "display_name": None}
+    reopened.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_async_batches_commit_off_the_event_loop(store):
+    threads = []
+    upsert = store._upsert
+
+    def _upsert(rows):
+        threads.append(threading.get_ident())
+        upsert(rows)
+
+    store._upsert = _upsert
+    await asyncio.gather(
+        *(
+            store.write(_record(f"https://facebook.com/p{i}", {"v": i}))
+            for i in range(5)
+        )
+    )
+    await store.checkpoint()
+
+    assert threads and threading.get_ident() not in threads
+    assert sorted(k for k, _, _ in store.iter_since()) == [f"p{i}" for i in range(5)]
@@ -3,71 +3,108 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, mock_open, patch
 
 from app.scraper import (
-    extract_page_title,
-    extract_about_via_js,
+    PageProbe,
+    probe_page,
     scrape,
 )
 from app.reporting import ScrapeReport
 
 
-@pytest.mark.asyncio
-async def test_extract_page_title_valid():
-    tab = MagicMock()
-    tab.evaluate = AsyncMock(return_value="  My Page Title  ")
-
-    result = await extract_page_title(tab)
-
-    assert result == "My Page Title"
-    tab.evaluate.assert_awaited_once_with("document.title")
+def _probe(title, about, consent=None, blobs=()):
+    return AsyncMock(
+        return_value=PageProbe(
+            title=title,
+            ready_state="complete",
+            consent=consent,
+            about=about,
+            blobs=blobs,
+        )
+    )
 
 
 @pytest.mark.asyncio
-async def test_extract_page_title_empty_string():
+async def test_probe_page_reads_everything_in_one_evaluation():
     tab = MagicMock()
-    tab.evaluate = AsyncMock(return_value="   ")
-
-    result = await extract_page_title(tab)
-
-    assert result is None
+    tab.evaluate = AsyncMock(
+        return_value={
+            "title": "  My Page  ",
+            "readyState": "interactive",
+            "consent": "Rifiuta cookie facoltativi",
+            "about": '{"phone": "1"}',
+            "extractionMs": 4.5,
+        }
+    )
+
+    result = await probe_page(tab, dismiss_consent=True)
+
+    assert result == PageProbe(
+        title="My Page",
+        ready_state="interactive",
+        consent="Rifiuta cookie facoltativi",
+        about='{"phone": "1"}',
+        extraction_ms=4.5,
+    )
+    tab.evaluate.assert_awaited_once()
+    expression = tab.evaluate.call_args.args[0]
+    assert expression.endswith(
+        '(["Consenti solo i cookie essenziali", "Rifiuta cookie facoltativi"], '
+        "true, true, false)"
+    )
 
 
 @pytest.mark.asyncio
-async def test_extract_page_title_exception():
+async def test_probe_page_blank_title_and_skipped_extraction():
     tab = MagicMock()
-    tab.evaluate = AsyncMock(side_effect=Exception("JS error"))
+    tab.evaluate = AsyncMock(
+        return_value={"title": " ", "readyState": "loading", "consent": None}
+    )
 
-    result = await extract_page_title(tab)
+    result = await probe_page(tab, extract=False)
 
-    assert result is None
+    assert result.title is None
+    assert result.about is None
+    assert result.extraction_ms == 0.0
+    assert tab.evaluate.call_args.args[0].endswith(", false, false, false)")
 
 
 @pytest.mark.asyncio
-async def test_extract_about_via_js_success():
+async def test_probe_page_raises_on_evaluation_error():
     tab = MagicMock()
-    tab.evaluate = AsyncMock(return_value='{"name": "Test"}')
+    tab.evaluate = AsyncMock(return_value="ExceptionDetails(...)")
 
-    result = await extract_about_via_js(tab)
-
-    assert result == '{"name": "Test"}'
-    tab.evaluate.assert_awaited_once()
+    with pytest.raises(RuntimeError, match="Page probe failed"):
+        await probe_page(tab)
 
 
 @pytest.mark.asyncio
-async def test_extract_about_via_js_not_found():
+async def test_scrape_raises_when_about_not_found():
     tab = MagicMock()
-    tab.evaluate = AsyncMock(return_value=None)
+    tab.target.url = "https://facebook.com/test-page"
+    report = MagicMock(spec=ScrapeReport)
 
-    with pytest.raises(RuntimeError, match="about_app_sections not found"):
-        await extract_about_via_js(tab)
+    with (
+        patch("app.scraper.probe_page", _probe("My Page", None)),
+        pytest.raises(RuntimeError, match="about_app_sections not found"),
+    ):
+        await scrape(tab, report, AsyncMock(), settle=0)
 
 
 @pytest.mark.asyncio
-async def test_extract_about_via_js_invalid_type():
+async def test_scrape_dismisses_consent_in_probe():
     tab = MagicMock()
-    tab.evaluate = AsyncMock(return_value=123)
+    tab.target.url = "https://facebook.com/test-page"
+    probe = _probe("My Page", "{}", consent="Rifiuta cookie facoltativi")
+    report = MagicMock(spec=ScrapeReport)
+    report.record_saved = AsyncMock()
+
+    with (
+        patch("app.scraper.probe_page", probe),
+        patch("app.scraper.log_resources"),
+    ):
+        await scrape(tab, report, AsyncMock(), settle=0, dismiss_consent=True)
 
-    with pytest.raises(RuntimeError, match="Expected JSON string"):
-        await extract_about_via_js(tab)
+    probe.assert_awaited_once_with(tab, True, True, False)
+    report.record_saved.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -81,13 +118,9 @@ async def test_scrape_success(tmp_path):
     report.record_failed = AsyncMock()
 
     with (
-        patch("app.scraper.extract_page_title", AsyncMock(return_value="My Page")),
-        patch(
-            "app.scraper.extract_about_via_js",
-            AsyncMock(return_value='{"key": "value"}'),
-        ),
+        patch("app.scraper.probe_page", _probe("My Page", '{"key": "value"}')),
         patch("app.scraper.log_resources"),
-        patch("app.scraper.safe_filename", return_value="test-page"),
+        patch("app.sinks.safe_filename", return_value="test-page"),
         patch("builtins.open", mock_open()) as m_open,
     ):
         await scrape(tab, report)
@@ -95,11 +128,18 @@ async def test_scrape_success(tmp_path):
     report.record_saved.assert_awaited_once()
     report.record_failed.assert_not_awaited()
 
-    m_open.assert_called_once_with("data/test-page.json", "w", encoding="utf-8")
+    m_open.assert_called_once_with("data/test-page.json", "wb")
+    written = m_open().write.call_args.args[0]
+    assert json.loads(written) == {
+        "key": "value",
+        "display_name": "My Page",
+        "url": "https://facebook.com/test-page",
+    }
 
 
 @pytest.mark.asyncio
-async def test_scrape_invalid_json_payload():
+@pytest.mark.parametrize("about", ["NOT JSON", "[1, 2]"])
+async def test_scrape_invalid_json_payload(about):
     tab = MagicMock()
     tab.wait = AsyncMock()
     tab.target.url = "https://facebook.com/test-page"
@@ -109,11 +149,130 @@ async def test_scrape_invalid_json_payload():
     report.record_failed = AsyncMock()
 
     with (
-        patch("app.scraper.extract_page_title", AsyncMock(return_value="My Page")),
-        patch("app.scraper.extract_about_via_js", AsyncMock(return_value="NOT JSON")),
+        patch("app.scraper.probe_page", _probe("My Page", about)),
         patch("app.scraper.log_resources"),
     ):
         await scrape(tab, report)
 
-    report.record_failed.assert_awaited_once()
+    report.record_failed.assert_awaited_once_with("invalid_payload")
     report.record_saved.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_scrape_without_settle_skips_wait():
+    tab = MagicMock()
+    tab.wait = AsyncMock()
+    tab.target.url = "https://facebook.com/test-page"
+    sink = AsyncMock()
+
+    report = MagicMock(spec=ScrapeReport)
+    report.record_saved = AsyncMock()
+
+    with (
+        patch("app.scraper.probe_page", _probe("My Page", "{}")),
+        patch("app.scraper.log_resources"),
+    ):
+        await scrape(tab, report, sink, settle=0)
+
+    tab.wait.assert_not_awaited()
+    sink.write.assert_awaited_once()
+    record = sink.write.await_args.args[0]
+    assert record.url == "https://facebook.com/test-page"
+    assert record.to_payload() == {"display_name": "My Page"}
+
+
+@pytest.mark.asyncio
+async def test_scrape_uses_captured_payload():
+    tab = MagicMock()
+    tab.target.url = "https://facebook.com/test-page"
+    sink = AsyncMock()
+    capture = MagicMock()
+    capture.payload = AsyncMock(return_value={"phone": "+39 02 1"})
+    probe = _probe("My Page", None)
+
+    report = MagicMock(spec=ScrapeReport)
+    report.record_saved = AsyncMock()
+
+    with patch("app.scraper.probe_page", probe):
+        await scrape(tab, report, sink, settle=0, capture=capture)
+
+    probe.assert_awaited_once_with(tab, False, False, False)
+    report.record_extraction_time.assert_not_awaited()
+    record = sink.write.await_args.args[0]
+    assert record.page_key == "test-page"
+    assert record.to_payload() == {"phone": "+39 02 1", "display_name": "My Page"}
+
+
+@pytest.mark.asyncio
+async def test_scrape_falls_back_to_js_without_captured_payload():
+    tab = MagicMock()
+    tab.target.url = "https://facebook.com/test-page"
+    sink = AsyncMock()
+    capture = MagicMock()
+    capture.payload = AsyncMock(return_value=None)
+
+    report = MagicMock(spec=ScrapeReport)
+    report.record_saved = AsyncMock()
+
+    with (
+        patch("app.scraper.probe_page", _probe(None, '{"a": 1}')),
+        patch("app.scraper.log_resources"),
+    ):
+        await scrape(tab, report, sink, settle=0, capture=capture)
+
+    record = sink.write.await_args.args[0]
+    assert record.to_payload() == {"a": 1, "display_name": None}
+    report.record_extraction_time.assert_awaited_once_with(0.0)
+
+
+@pytest.mark.asyncio
+async def test_probe_page_collects_blobs():
+    tab = MagicMock()
+    tab.evaluate = AsyncMock(
+        return_value={"title": "T", "readyState": "complete", "blobs": ["{}"]}
+    )
+
+    result = await probe_page(tab, collect=True)
+
+    assert result.blobs == ("{}",)
+    assert tab.evaluate.call_args.args[0].endswith(", false, true, true)")
+
+
+@pytest.mark.asyncio
+async def test_scrape_archives_blobs_even_without_about():
+    tab = MagicMock()
+    tab.target.url = "https://facebook.com/test-page"
+    archive = AsyncMock()
+    probe = _probe("My Page", None, blobs=('{"about_app_sections": 1}',))
+
+    with patch("app.scraper.probe_page", probe):
+        with pytest.raises(RuntimeError):
+            await scrape(tab, AsyncMock(), AsyncMock(), settle=0, archive=archive)
+
+    probe.assert_awaited_once_with(tab, True, False, True)
+    archive.add.assert_awaited_once_with(
+        "https://facebook.com/test-page",
+        "My Page",
+        '<script type="application/json">{"about_app_sections": 1}</script>',
+    )
+
+
+@pytest.mark.asyncio
+async def test_scrape_archives_captured_body():
+    tab = MagicMock()
+    tab.target.url = "https://facebook.com/test-page"
+    capture = MagicMock()
+    capture.payload = AsyncMock(return_value={"phone": "1"})
+    capture.body = "<html>about_app_sections</html>"
+    archive = AsyncMock()
+    probe = _probe("My Page", None)
+
+    with patch("app.scraper.probe_page", probe):
+        await scrape(
+            tab, AsyncMock(), AsyncMock(), settle=0, capture=capture, archive=archive
+        )
+
+    probe.assert_awaited_once_with(tab, False, False, False)
+    archive.add.assert_awaited_once_with(
+        "https://facebook.com/test-page", "My Page", capture.body
+    )
@@ -0,0 +1,106 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.sharding import (
+    Shard,
+    parse_shard,
+    run_local_shards,
+    select_shard,
+    shard_of,
+)
+
+
+def test_parse_shard_valid():
+    assert parse_shard("2/4") == Shard(2, 4)
+
+
+@pytest.mark.parametrize("spec", ["4/4", "-1/4", "0/0", "1", "a/b", "1/2/3"])
+def test_parse_shard_invalid(spec):
+    with pytest.raises(ValueError):
+        parse_shard(spec)
+
+
+def test_shard_str_roundtrip():
+    assert parse_shard(str(Shard(1, 3))) == Shard(1, 3)
+
+
+def test_shard_of_is_stable():
+    # Must not depend on PYTHONHASHSEED: pin known values.
+    assert shard_of("266105353548024", 4) == 0
+    assert shard_of("foo", 16) == 11
+
+
+def test_select_shard_partitions_input():
+    urls = [f"https://www.facebook.com/page{i}" for i in range(200)]
+
+    parts = [select_shard(urls, Shard(i, 4)) for i in range(4)]
+
+    assert sorted(sum(parts, [])) == sorted(urls)
+    assert all(parts)
+
+
+def test_select_shard_same_page_same_shard():
+    urls = [
+        "https://www.facebook.com/Foo",
+        "https://m.facebook.com/foo/about/",
+    ]
+
+    parts = [select_shard(urls, Shard(i, 8)) for i in range(8)]
+
+    assert max(len(p) for p in parts) == 2
+
+
+def _fake_popen(exit_code, summary):
+    def factory(cmd):
+        report_file = cmd[cmd.index("--report-file") + 1]
+        with open(report_file, "w", encoding="utf-8") as f:
+            json.dump(summary, f)
+        child = MagicMock()
+        child.wait.return_value = child.returncode = exit_code
+        return child
+
+    return factory
+
+
+def test_run_local_shards_merges_reports():
+    summary = {"saved": 2, "failed": 1, "total": 3}
+
+    with patch("app.sharding.subprocess.Popen", side_effect=_fake_popen(0, summary)):
+        merged = run_local_shards("urls.txt", 3, 2)
+
+    assert merged == {"saved": 6, "failed": 3, "total": 9}
+    assert "failed_shards" not in merged
+
+
+def test_run_local_shards_uses_distinct_namespaces():
+    summary = {"saved": 0, "failed": 0, "total": 0}
+    factory = _fake_popen(0, summary)
+
+    with patch("app.sharding.subprocess.Popen", side_effect=factory) as popen:
+        run_local_shards("urls.txt", 2, 1)
+
+    namespaces = [
+        c.args[0][c.args[0].index("--profile-namespace") + 1]
+        for c in popen.call_args_list
+    ]
+    assert namespaces == ["shard0", "shard1"]
+
+
+def test_run_local_shards_reports_partial_merge_on_child_failure():
+    summary = {"saved": 2, "failed": 0, "total": 2}
+    children = [
+        _fake_popen(0, summary),
+        _fake_popen(1, summary),
+        _fake_popen(0, summary),
+    ]
+
+    with patch(
+        "app.sharding.subprocess.Popen",
+        side_effect=lambda cmd: children.pop(0)(cmd),
+    ):
+        merged = run_local_shards("urls.txt", 3, 1)
+
+    assert merged["saved"] == 4
+    assert merged["failed_shards"] == ["1/3"]
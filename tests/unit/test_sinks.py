@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from app.fanout import ShardedJsonSink
+from app.records import PageRecord
+from app.result_store import SQLiteResultStore
+from app.sinks import JsonFileSink, build_sink
+
+
+@pytest.mark.asyncio
+async def test_json_file_sink_writes_named_file(tmp_path):
+    sink = JsonFileSink(str(tmp_path))
+
+    await sink.write(
+        PageRecord.from_payload("https://facebook.com/foo/about", {"name": "è"}, "Foo")
+    )
+    await sink.close()
+
+    written = (tmp_path / "foo_about.json").read_text(encoding="utf-8")
+    assert json.loads(written) == {
+        "name": "è",
+        "display_name": "Foo",
+        "url": "https://facebook.com/foo/about",
+    }
+    assert "è" in written
+
+
+def test_build_sink_json(tmp_path):
+    sink = build_sink("json", data_dir=str(tmp_path))
+
+    assert isinstance(sink, JsonFileSink)
+    assert sink.directory == str(tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_build_sink_json_sharded(tmp_path):
+    sink = build_sink("json-sharded", data_dir=str(tmp_path))
+
+    assert isinstance(sink, ShardedJsonSink)
+    assert sink.directory == str(tmp_path)
+    await sink.close()
+
+
+def test_build_sink_sqlite_default_path(tmp_path):
+    sink = build_sink("sqlite", data_dir=str(tmp_path))
+
+    assert isinstance(sink, SQLiteResultStore)
+    assert sink.path == str(tmp_path / "results.sqlite")
+    sink.shutdown()
+
+
+def test_build_sink_unknown():
+    with pytest.raises(ValueError, match="Unknown sink"):
+        build_sink("csv")
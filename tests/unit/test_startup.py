@@ -0,0 +1,68 @@
+import json
+import subprocess
+import sys
+
+from app.startup import StartupProfile
+
+
+def test_cli_import_defers_browser_stack():
+    code = (
+        "import sys, app.main; "
+        "print(sorted(m for m in ('nodriver', 'psutil', 'app.orchestrator') "
+        "if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert out.strip() == "[]"
+
+
+def test_import_module_records_cold_import_once():
+    profile = StartupProfile(origin=0.0)
+    sys.modules.pop("colorsys", None)
+
+    module = profile.import_module("colorsys")
+    again = profile.import_module("colorsys")
+
+    assert module is again
+    assert list(profile.imports) == ["colorsys"]
+    info = profile.imports["colorsys"]
+    assert info["ms"] >= 0
+    assert info["modules"] >= 1
+    assert "colorsys" in info["packages"]
+
+
+def test_import_module_skips_already_loaded_modules():
+    profile = StartupProfile(origin=0.0)
+
+    profile.import_module("json")
+
+    assert not profile.imports
+
+
+def test_mark_keeps_first_occurrence(monkeypatch):
+    times = iter([1.5, 9.0])
+    monkeypatch.setattr("app.startup.time.perf_counter", lambda: next(times))
+    profile = StartupProfile(origin=1.0)
+
+    profile.mark("first navigation")
+    profile.mark("first navigation")
+
+    assert profile.milestones == {"first navigation": 500.0}
+
+
+def test_write_report(tmp_path):
+    profile = StartupProfile(origin=0.0)
+    profile.milestones["first browser started"] = 12.5
+    path = tmp_path / "startup.json"
+
+    profile.write(str(path))
+
+    assert json.loads(path.read_text()) == {
+        "imports_ms": {},
+        "milestones_ms": {"first browser started": 12.5},
+    }
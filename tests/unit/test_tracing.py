@@ -0,0 +1,64 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.tracing import PageTracer
+
+
+@pytest.mark.asyncio
+async def test_tracer_samples_pages_at_rate(tmp_path):
+    tab = MagicMock()
+    tab.send = AsyncMock()
+    tracer = PageTracer(tab, str(tmp_path), rate=0.5, worker_id=3)
+
+    traced = []
+    for _ in range(4):
+        await tracer.start()
+        traced.append(tracer._events is not None)
+        tracer._events = tracer._complete = None
+
+    assert traced == [False, True, False, True]
+    assert tab.send.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_tracer_writes_collected_events(tmp_path):
+    tab = MagicMock()
+    tracer = PageTracer(tab, str(tmp_path), rate=1, worker_id=3)
+
+    async def send(command):
+        if tracer._complete is not None and tab.send.await_count == 2:
+            tracer._on_data(SimpleNamespace(value=[{"name": "Layout"}]))
+            asyncio.get_running_loop().call_soon(
+                tracer._on_complete, SimpleNamespace(data_loss_occurred=False)
+            )
+
+    tab.send = AsyncMock(side_effect=send)
+    tracer.enable()
+    assert tab.add_handler.call_count == 2
+
+    await tracer.start()
+    path = await tracer.finish("https://facebook.com/page")
+
+    assert path == str(tmp_path / "trace-3-1.json")
+    data = json.loads((tmp_path / "trace-3-1.json").read_text())
+    assert data == {
+        "traceEvents": [{"name": "Layout"}],
+        "metadata": {"url": "https://facebook.com/page", "dataLoss": False},
+    }
+    assert await tracer.finish("https://facebook.com/page") is None
+
+
+@pytest.mark.asyncio
+async def test_tracer_skips_unsampled_pages(tmp_path):
+    tab = MagicMock()
+    tab.send = AsyncMock()
+    tracer = PageTracer(tab, str(tmp_path), rate=0)
+
+    await tracer.start()
+
+    assert await tracer.finish("https://facebook.com/page") is None
+    tab.send.assert_not_awaited()
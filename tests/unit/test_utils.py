@@ -1,25 +1,12 @@
 import pytest
 
 from app.utils import (
-    chunked,
     ensure_about,
-    is_json_string,
+    page_key,
     safe_filename,
 )
 
 
-def test_chunked_exact():
-    data = [1, 2, 3, 4]
-    chunks = list(chunked(data, 2))
-    assert chunks == [[1, 2], [3, 4]]
-
-
-def test_chunked_remainder():
-    data = [1, 2, 3]
-    chunks = list(chunked(data, 2))
-    assert chunks == [[1, 2], [3]]
-
-
 def test_safe_filename_normal_path():
     url = "https://facebook.com/foo/bar"
     assert safe_filename(url) == "foo_bar"
@@ -35,17 +22,6 @@ def test_safe_filename_strips_invalid_chars():
     assert safe_filename(url) == "foo_bar"
 
 
-def test_is_json_string_valid():
-    assert is_json_string('{"a": 1}')
-    assert is_json_string('["a", "b"]')
-
-
-def test_is_json_string_invalid():
-    assert not is_json_string("{bad json}")
-    assert not is_json_string(123)
-    assert not is_json_string(None)
-
-
 def test_ensure_about_adds_suffix():
     url = "https://facebook.com/page"
     assert ensure_about(url) == "https://facebook.com/page/about"
@@ -64,3 +40,17 @@ def test_ensure_about_trailing_slash():
 def test_ensure_about_path_with_trailing_slash():
     url = "https://facebook.com/page/"
     assert ensure_about(url) == "https://facebook.com/page/about"
+
+
+def test_page_key_ignores_about_and_case():
+    assert page_key("https://www.facebook.com/Foo/about/") == "foo"
+    assert page_key("https://m.facebook.com/foo") == "foo"
+
+
+def test_page_key_numeric_profile():
+    url = "https://www.facebook.com/profile.php?id=123"
+    assert page_key(url) == "123"
+
+
+def test_page_key_root():
+    assert page_key("https://www.facebook.com/") == "index"
@@ -0,0 +1,129 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.watchdog import TrackedSource, Watchdog, kill_browser
+from app.work_queue import ListWorkSource
+
+
+def _browser(stopped=False, send=None):
+    browser = MagicMock()
+    browser.stopped = stopped
+    browser.connection.send = send or AsyncMock(return_value=("1.3", "Chrome"))
+    return browser
+
+
+async def _hang():
+    await asyncio.sleep(3600)
+
+
+@pytest.mark.asyncio
+async def test_outstanding_leases_are_requeued_first():
+    source = TrackedSource(ListWorkSource(["a", "b", "c"]))
+    a, b = await source.lease(), await source.lease()
+    await source.ack(a)
+
+    assert source.requeue() == (1, [])
+    assert len(source) == 0
+
+    again = await source.lease()
+    assert again == b
+    assert (await source.lease()).url == "c"
+    assert source.completed == 1
+
+
+@pytest.mark.asyncio
+async def test_leases_are_given_up_after_max_requeues():
+    wrapped = MagicMock()
+    wrapped.lease = AsyncMock(side_effect=[MagicMock(url="a"), None])
+    wrapped.nack = AsyncMock(return_value=False)
+    source = TrackedSource(wrapped, max_requeues=1)
+
+    lease = await source.lease()
+    source.requeue()
+    assert await source.lease() is lease
+
+    requeued, exhausted = source.requeue()
+    assert (requeued, exhausted) == (0, [lease])
+    assert await source.nack(lease, "page_stall") is False
+    wrapped.nack.assert_awaited_once_with(lease, "page_stall")
+    assert await source.lease() is None
+
+
+@pytest.mark.asyncio
+async def test_oldest_lease_age(monkeypatch):
+    clock = MagicMock(side_effect=[100.0, 130.0])
+    monkeypatch.setattr("app.watchdog.time", MagicMock(monotonic=clock))
+    source = TrackedSource(ListWorkSource(["a"]))
+
+    assert source.oldest() == 0.0
+    await source.lease()
+    assert source.oldest() == 30.0
+
+
+@pytest.mark.asyncio
+async def test_check_detects_incidents():
+    source = TrackedSource(ListWorkSource([]))
+    watchdog = Watchdog(source, page_timeout=60, timeout=0.01)
+
+    assert await watchdog.check(_browser()) is None
+    assert await watchdog.check(_browser(stopped=True)) == "browser_crash"
+    lost = AsyncMock(side_effect=ConnectionError("gone"))
+    assert await watchdog.check(_browser(send=lost)) == "browser_crash"
+    hung = MagicMock(side_effect=lambda _: _hang())
+    assert await watchdog.check(_browser(send=hung)) == "browser_unresponsive"
+
+    source.oldest = MagicMock(return_value=61.0)
+    assert await watchdog.check(_browser()) == "page_stall"
+    watchdog.page_timeout = 0
+    assert await watchdog.check(_browser()) is None
+
+
+@pytest.mark.asyncio
+async def test_supervise_returns_when_work_completes():
+    watchdog = Watchdog(TrackedSource(ListWorkSource([])), interval=0.01)
+    kill = AsyncMock()
+
+    assert await watchdog.supervise(asyncio.sleep(0.03), _browser(), kill) is None
+    kill.assert_not_awaited()
+
+    with pytest.raises(RuntimeError):
+        await watchdog.supervise(
+            AsyncMock(side_effect=RuntimeError)(), _browser(), kill
+        )
+
+
+@pytest.mark.asyncio
+async def test_supervise_kills_browser_and_cancels_work():
+    watchdog = Watchdog(TrackedSource(ListWorkSource([])), interval=0.01)
+    browser = _browser()
+    kill = AsyncMock()
+    work = asyncio.ensure_future(_hang())
+
+    async def crash():
+        await asyncio.sleep(0.02)
+        browser.stopped = True
+
+    asyncio.ensure_future(crash())
+    assert await watchdog.supervise(work, browser, kill) == "browser_crash"
+    kill.assert_awaited_once()
+    assert work.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_disabled_watchdog_only_runs_the_work():
+    watchdog = Watchdog(TrackedSource(ListWorkSource([])), interval=0)
+    browser = _browser(stopped=True)
+
+    assert await watchdog.supervise(asyncio.sleep(0), browser, AsyncMock()) is None
+
+
+def test_kill_browser_sends_sigkill():
+    browser = MagicMock()
+    browser._process.returncode = None
+
+    kill_browser(browser)
+
+    browser._process.kill.assert_called_once()
+    browser.stop.assert_called_once()
@@ -0,0 +1,162 @@
+import pytest
+
+from app.work_queue import (
+    Lease,
+    ListWorkSource,
+    QueueWorkSource,
+    SQLiteWorkQueue,
+)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = SQLiteWorkQueue(str(tmp_path / "queue.sqlite"), visibility_timeout=60)
+    yield q
+    q.close()
+
+
+@pytest.mark.asyncio
+async def test_list_source_yields_in_order_then_none():
+    source = ListWorkSource(["a", "b"])
+
+    first = await source.lease()
+    second = await source.lease()
+
+    assert (first.url, second.url) == ("a", "b")
+    assert await source.lease() is None
+
+
+@pytest.mark.asyncio
+async def test_list_source_never_retries():
+    source = ListWorkSource(["a"])
+    lease = await source.lease()
+
+    assert await source.nack(lease, "boom") is False
+    assert await source.lease() is None
+
+
+def test_enqueue_many_deduplicates(queue):
+    assert queue.enqueue_many(["a", "b", "a"]) == 2
+    assert queue.enqueue_many(["b", "c"]) == 1
+    assert queue.counts() == {"pending": 3}
+
+
+def test_lease_hides_job_until_acked(queue):
+    queue.enqueue_many(["a"])
+
+    lease = queue.lease("w1")
+
+    assert lease.url == "a"
+    assert lease.attempts == 1
+    assert queue.lease("w2") is None
+
+    assert queue.ack(lease) is True
+    assert queue.counts() == {"done": 1}
+
+
+def test_expired_lease_is_redelivered(queue, monkeypatch):
+    queue.enqueue_many(["a"])
+    lease = queue.lease("crashed")
+
+    real_time = __import__("time").time
+    monkeypatch.setattr("app.work_queue.time.time", lambda: real_time() + 120)
+
+    again = queue.lease("w2")
+
+    assert again.url == "a"
+    assert again.attempts == 2
+    # The stale lease can no longer be acknowledged.
+    assert queue.ack(lease) is False
+    assert queue.ack(again) is True
+
+
+def test_nack_retries_until_max_attempts(tmp_path):
+    q = SQLiteWorkQueue(str(tmp_path / "q.sqlite"), max_attempts=2)
+    q.enqueue_many(["a"])
+
+    assert q.nack(q.lease(), "first") is True
+    assert q.nack(q.lease(), "second") is False
+    assert q.lease() is None
+    assert q.counts() == {"dead": 1}
+    q.close()
+
+
+def test_expired_lease_at_max_attempts_goes_dead(tmp_path, monkeypatch):
+    q = SQLiteWorkQueue(str(tmp_path / "q.sqlite"), max_attempts=1)
+    q.enqueue_many(["a"])
+    q.lease()
+
+    real_time = __import__("time").time
+    monkeypatch.setattr("app.work_queue.time.time", lambda: real_time() + 600)
+
+    assert q.lease() is None
+    assert q.counts() == {"dead": 1}
+    q.close()
+
+
+def test_two_connections_share_queue(tmp_path):
+    path = str(tmp_path / "q.sqlite")
+    producer = SQLiteWorkQueue(path)
+    consumer = SQLiteWorkQueue(path)
+
+    producer.enqueue_many(["a", "b"])
+
+    leased = {consumer.lease("c").url, producer.lease("p").url}
+
+    assert leased == {"a", "b"}
+    producer.close()
+    consumer.close()
+
+
+@pytest.mark.asyncio
+async def test_queue_work_source_roundtrip(queue):
+    queue.enqueue_many(["a"])
+    source = QueueWorkSource(queue, "worker")
+
+    lease = await source.lease()
+    assert isinstance(lease, Lease)
+    await source.ack(lease)
+
+    assert await source.lease() is None
+    assert queue.counts() == {"done": 1}
+
+
+def test_extend_restarts_visibility_timeout(queue, monkeypatch):
+    queue.enqueue_many(["a"])
+    lease = queue.lease("w1")
+
+    real_time = __import__("time").time
+    monkeypatch.setattr("app.work_queue.time.time", lambda: real_time() + 50)
+    assert queue.extend(lease) is True
+
+    monkeypatch.setattr("app.work_queue.time.time", lambda: real_time() + 100)
+    assert queue.lease("w2") is None
+    assert queue.ack(lease) is True
+
+
+def test_next_visible(tmp_path):
+    q = SQLiteWorkQueue(str(tmp_path / "q.sqlite"), retry_delay=30)
+    assert q.next_visible() is None
+
+    q.enqueue_many(["a"])
+    assert q.next_visible() == 0.0
+
+    q.nack(q.lease(), "boom")
+    assert 29 < q.next_visible() <= 30
+    assert q.lease() is None
+    q.close()
+
+
+@pytest.mark.asyncio
+async def test_queue_work_source_waits_for_leases_of_other_consumers(tmp_path):
+    q = SQLiteWorkQueue(str(tmp_path / "q.sqlite"), visibility_timeout=0.05)
+    q.enqueue_many(["a"])
+    q.lease("crashed")
+    source = QueueWorkSource(q, "survivor", poll_interval=0.01)
+
+    lease = await source.lease()
+
+    assert (lease.url, lease.attempts) == ("a", 2)
+    await source.ack(lease)
+    assert await source.lease() is None
+    q.close()